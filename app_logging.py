@@ -0,0 +1,176 @@
+"""
+Structured Application Logging
+Levelled, categorized logging with a background writer thread
+
+Categories are child loggers of 'pkview' (connection, event, avatar, scoring, ui).
+Records are queued as-is and only formatted on the writer thread, so a record
+below the configured level costs one level check and an enabled one costs no
+string formatting on the calling (ingestion) thread.
+"""
+
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import atexit
+import config
+import logging
+import os
+import queue
+import threading
+import time
+
+
+ROOT_LOGGER = 'pkview'
+CATEGORIES = ('connection', 'event', 'avatar', 'scoring', 'ui')
+
+_listener = None
+_ui_sinks = []
+_lock = threading.Lock()
+
+
+def get_logger(category):
+    """
+    Get the logger for a category
+
+    Args:
+        category: One of CATEGORIES
+
+    Returns:
+        logging.Logger: Category logger
+    """
+    return logging.getLogger(f'{ROOT_LOGGER}.{category}')
+
+
+class _LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the writer thread
+    The stock handler formats in prepare(), i.e. on the calling thread
+    """
+
+    def prepare(self, record):
+        # Exception info must be rendered now - traceback objects don't outlive the frame
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class UiLogForwarder(logging.Handler):
+    """
+    Forwards WARN-and-above records, plus sampled lower-level records,
+    to registered UI sinks. Runs on the writer thread.
+
+    Sampling per category (config.LOG_UI_SAMPLE_INTERVALS):
+        0     -> forward every record
+        float -> at most one record per that many seconds, with a skip counter
+        None  -> never forward below WARNING
+    """
+
+    def __init__(self, sample_intervals):
+        super().__init__(logging.INFO)
+        self.sample_intervals = sample_intervals
+        self._last_forwarded = {}  # category -> monotonic time
+        self._skipped = {}         # category -> records skipped since
+
+    def emit(self, record):
+        category = record.name.rpartition('.')[2]
+
+        # The UI log's own history must never loop back into it
+        if category == 'ui' or not _ui_sinks:
+            return
+
+        try:
+            if record.levelno < logging.WARNING:
+                interval = self.sample_intervals.get(category)
+                if interval is None:
+                    return
+
+                now = time.monotonic()
+                if interval and now - self._last_forwarded.get(category, 0.0) < interval:
+                    self._skipped[category] = self._skipped.get(category, 0) + 1
+                    return
+                self._last_forwarded[category] = now
+
+            message = record.getMessage()
+            skipped = self._skipped.pop(category, 0)
+            if skipped:
+                message = f"{message}  (+{skipped} more)"
+
+            for sink in list(_ui_sinks):
+                sink(message)
+        except Exception:
+            self.handleError(record)
+
+
+def start_logging():
+    """
+    Start the logging pipeline (idempotent)
+    Installs the queue handler on the 'pkview' logger and starts the writer thread
+    """
+    global _listener
+
+    with _lock:
+        if _listener is not None:
+            return
+
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(getattr(logging, config.APP_LOG_LEVEL, logging.INFO))
+        root.propagate = False
+
+        handlers = [UiLogForwarder(config.LOG_UI_SAMPLE_INTERVALS)]
+
+        try:
+            log_dir = os.path.dirname(config.LOG_FILE)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
+
+            file_handler = RotatingFileHandler(
+                config.LOG_FILE,
+                maxBytes=config.LOG_FILE_MAX_BYTES,
+                backupCount=config.LOG_FILE_BACKUP_COUNT,
+                encoding='utf-8'
+            )
+            file_handler.setFormatter(logging.Formatter(
+                '%(asctime)s %(levelname)-7s %(name)-18s %(message)s'
+            ))
+            handlers.append(file_handler)
+        except OSError as e:
+            print(f"[WARNING] Log file unavailable: {e}")
+
+        log_queue = queue.SimpleQueue()
+        root.addHandler(_LazyQueueHandler(log_queue))
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+
+        atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+
+    with _lock:
+        if _listener is None:
+            return
+
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def add_ui_sink(callback):
+    """
+    Register a callable that receives forwarded log lines
+    Called from the writer thread - pass a Qt signal's emit to hop threads
+
+    Args:
+        callback: Callable taking one str
+    """
+    if callback not in _ui_sinks:
+        _ui_sinks.append(callback)
+
+
+def remove_ui_sink(callback):
+    """Unregister a UI sink"""
+    if callback in _ui_sinks:
+        _ui_sinks.remove(callback)
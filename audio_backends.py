@@ -0,0 +1,187 @@
+"""
+Audio Backends
+Where the mixed sound goes: the sound card, nowhere, or a WAV file
+
+The AudioThread asks its backend how many frames it can take, mixes that
+much and hands the blocks over. QtAudioBackend plays them (QAudioSink);
+NullAudioBackend only counts triggers (no device, no mixing);
+WavRecordingBackend writes the mix to a WAV file plus a CSV of trigger
+times on the same timeline. The last two are paced by the wall clock, so
+load tests and headless runs behave like a live session.
+"""
+
+from PyQt6.QtMultimedia import QAudioSink, QMediaDevices
+import config
+import numpy as np
+import os
+import time
+import wave
+
+
+class AudioBackend:
+    """
+    Backend interface (all methods run on the audio thread)
+
+    renders: False if mixed samples are never used - the mixer then only
+    advances its voices.
+    """
+
+    name = ''
+    renders = True
+
+    def open(self, audio_format, period_frames):
+        """Start output (audio_format: QAudioFormat of the mix)"""
+        self.audio_format = audio_format
+        self.period_frames = period_frames
+
+    def frames_wanted(self):
+        """Frames the backend can take right now"""
+        return 0
+
+    def write(self, block):
+        """Take one mixed float32 block (frames, channels)"""
+
+    def consume(self, frames):
+        """Frames of one block were mixed (called for every block, rendered or not)"""
+
+    def queued_ms(self):
+        """Audio accepted but not heard yet (adds to trigger latency)"""
+        return 0.0
+
+    def due_frames(self):
+        """Frames due by the wall clock since open() (None: paced by the device)"""
+        return None
+
+    def on_trigger(self, category, started, frame):
+        """
+        A sound was triggered
+
+        Args:
+            category: Event type / sound name
+            started: True if it became a voice now (False: dropped or deferred)
+            frame: Mixer frame (audio clock) at the trigger
+        """
+
+    def close(self):
+        """Stop output"""
+
+
+class QtAudioBackend(AudioBackend):
+    """The default output device through one push-mode QAudioSink"""
+
+    name = 'qt'
+
+    def open(self, audio_format, period_frames):
+        super().open(audio_format, period_frames)
+        self.sink = QAudioSink(QMediaDevices.defaultAudioOutput(), audio_format)
+        self.sink.setBufferSize(audio_format.bytesForDuration(config.AUDIO_BUFFER_MS * 1000))
+        self.device = self.sink.start()
+        self._bytes_per_frame = audio_format.bytesPerFrame()
+
+    def frames_wanted(self):
+        return self.sink.bytesFree() // self._bytes_per_frame
+
+    def write(self, block):
+        self.device.write((block * 32767.0).astype(np.int16).tobytes())
+
+    def queued_ms(self):
+        queued_bytes = self.sink.bufferSize() - self.sink.bytesFree()
+        return self.audio_format.durationForBytes(queued_bytes) / 1000
+
+    def close(self):
+        self.sink.stop()
+
+
+class _PacedBackend(AudioBackend):
+    """Takes frames at the sample rate of the wall clock (no device to pace it)"""
+
+    def open(self, audio_format, period_frames):
+        super().open(audio_format, period_frames)
+        self._started = time.monotonic()
+        self._frames_taken = 0
+
+    def due_frames(self):
+        return int((time.monotonic() - self._started) * self.audio_format.sampleRate())
+
+    def frames_wanted(self):
+        return max(0, self.due_frames() - self._frames_taken)
+
+    def consume(self, frames):
+        self._frames_taken += frames
+
+
+class NullAudioBackend(_PacedBackend):
+    """Discards audio; counts triggers per category (benchmarks, no audio device)"""
+
+    name = 'null'
+    renders = False
+
+    def __init__(self):
+        self.triggers = {}  # category -> [triggered, started]
+
+    def on_trigger(self, category, started, frame):
+        counts = self.triggers.setdefault(category, [0, 0])
+        counts[0] += 1
+        if started:
+            counts[1] += 1
+
+
+class WavRecordingBackend(_PacedBackend):
+    """
+    Records the mix to a 16-bit WAV file and trigger times to <file>.triggers.csv
+
+    CSV columns: time_s (position in the WAV), category, started (1/0).
+    """
+
+    name = 'record'
+
+    def __init__(self, path=None):
+        self.path = path or config.AUDIO_RECORD_FILE
+
+    def open(self, audio_format, period_frames):
+        super().open(audio_format, period_frames)
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._wav = wave.open(self.path, 'wb')
+        self._wav.setnchannels(audio_format.channelCount())
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(audio_format.sampleRate())
+        self._triggers = open(self.path + '.triggers.csv', 'w', encoding='utf-8')
+        self._triggers.write('time_s,category,started\n')
+        print(f"[OK] Recording sound output to {self.path}")
+
+    def write(self, block):
+        self._wav.writeframes((block * 32767.0).astype(np.int16).tobytes())
+
+    def on_trigger(self, category, started, frame):
+        self._triggers.write(f"{frame / self.audio_format.sampleRate():.4f},{category},{int(started)}\n")
+
+    def close(self):
+        self._wav.close()
+        self._triggers.close()
+
+
+BACKENDS = {
+    'qt': QtAudioBackend,
+    'null': NullAudioBackend,
+    'record': WavRecordingBackend,
+}
+
+
+def create_backend(name=None):
+    """
+    Backend by name
+
+    Args:
+        name: 'qt', 'null' or 'record' (default config.AUDIO_BACKEND)
+
+    Returns:
+        AudioBackend: New backend (unknown names fall back to 'qt')
+    """
+    name = name or config.AUDIO_BACKEND
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        print(f"[WARNING] Unknown audio backend '{name}', using 'qt'")
+        backend_class = QtAudioBackend
+    return backend_class()
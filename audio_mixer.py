@@ -0,0 +1,297 @@
+"""
+Audio Mixer
+All sound effects mixed into one output stream with NumPy
+
+Each trigger becomes a voice reading from a decoded float32 buffer
+(SoundBank). mix() sums the voices block by block; at most max_voices play
+at once. A trigger that finds every voice busy steals the lowest-priority,
+oldest voice - unless every voice outranks it, then it is dropped. While a
+high-priority sound (win, warning) plays, lower ones are ducked.
+SoundScheduler decides when a trigger becomes a voice (drop, queue,
+coalesce, restart per event type), timed on the mixer's frame counter.
+Pure NumPy, no Qt - the audio thread drives it.
+"""
+
+from collections import deque
+import config
+import numpy as np
+
+
+class LatencyStats:
+    """Trigger-to-audio latency of the last AUDIO_LATENCY_SAMPLES plays"""
+
+    def __init__(self, capacity=None):
+        self._samples = deque(maxlen=capacity or config.AUDIO_LATENCY_SAMPLES)
+        self.count = 0  # All plays measured, not only the kept ones
+
+    def record(self, latency_ms):
+        self._samples.append(latency_ms)
+        self.count += 1
+
+    def summary(self):
+        """
+        Returns:
+            dict: {'count', 'mean_ms', 'p95_ms', 'max_ms'} (zeros before the first play)
+        """
+        ordered = sorted(list(self._samples))
+        if not ordered:
+            return {'count': 0, 'mean_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'count': self.count,
+            'mean_ms': sum(ordered) / len(ordered),
+            'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            'max_ms': ordered[-1],
+        }
+
+
+class Voice:
+    """One sound playing in the mixer"""
+
+    __slots__ = ('samples', 'position', 'category', 'priority', 'gain', 'sequence')
+
+    def __init__(self, samples, category, priority, gain, sequence):
+        self.samples = samples  # float32 (frames, channels), shared with the SoundBank
+        self.position = 0
+        self.category = category
+        self.priority = priority
+        self.gain = gain
+        self.sequence = sequence  # Start order (oldest is stolen first)
+
+
+class Mixer:
+    """
+    Fixed-size voice pool mixed into float32 blocks
+
+    Not thread-safe: play(), stop() and mix() must all be called from the
+    same (audio) thread.
+    """
+
+    def __init__(self, channels=None, max_voices=None, priorities=None, release_frames=None):
+        """
+        Args:
+            channels: Output channels (default config.AUDIO_CHANNELS)
+            max_voices: Voices playing at once (default config.AUDIO_VOICES)
+            priorities: {category: priority} (default config.AUDIO_PRIORITIES)
+            release_frames: Fade-out length of a stolen/stopped voice
+        """
+        self.channels = channels or config.AUDIO_CHANNELS
+        self.max_voices = max_voices or config.AUDIO_VOICES
+        self.priorities = priorities if priorities is not None else config.AUDIO_PRIORITIES
+        self.release_frames = release_frames or config.AUDIO_SAMPLE_RATE * config.AUDIO_RELEASE_MS // 1000
+        self.duck_priority = config.AUDIO_DUCK_PRIORITY
+        self.duck_gain = config.AUDIO_DUCK_GAIN
+        self.volume = 1.0
+        self.frame = 0  # Frames mixed so far - the audio clock
+
+        self.voices = []
+        self._releasing = []  # Voices fading out after being stolen/stopped
+        self._duck = 1.0      # Gain on low-priority voices at the end of the last block
+        self._sequence = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def priority(self, category):
+        return self.priorities.get(category, config.AUDIO_DEFAULT_PRIORITY)
+
+    def play(self, samples, category, gain=1.0):
+        """
+        Start a voice
+
+        Args:
+            samples: float32 array (frames, channels)
+            category: Event type / sound name (sets the priority)
+            gain: Linear gain for this voice
+
+        Returns:
+            Voice: The new voice, or None if every voice outranks it
+        """
+        priority = self.priority(category)
+        if len(self.voices) >= self.max_voices:
+            victim = min(self.voices, key=lambda voice: (voice.priority, voice.sequence))
+            if victim.priority > priority:
+                self.dropped += 1
+                return None
+            self._release(victim)
+            self.stolen += 1
+
+        self._sequence += 1
+        voice = Voice(samples, category, priority, gain, self._sequence)
+        self.voices.append(voice)
+        return voice
+
+    def stop(self, category=None):
+        """Fade out every voice (of one category, or all)"""
+        for voice in [voice for voice in self.voices
+                      if category is None or voice.category == category]:
+            self._release(voice)
+
+    def _release(self, voice):
+        self.voices.remove(voice)
+        self._releasing.append(voice)
+
+    def is_playing(self, category):
+        """True if a voice of this category is playing"""
+        for voice in self.voices:
+            if voice.category == category:
+                return True
+        return False
+
+    def counts(self):
+        """Playing voices per category"""
+        counts = {}
+        for voice in self.voices:
+            counts[voice.category] = counts.get(voice.category, 0) + 1
+        return counts
+
+    def mix(self, frames, render=True):
+        """
+        Render the next block
+
+        Args:
+            frames: Block length in frames
+            render: False to only advance the voices (nobody listens)
+
+        Returns:
+            np.ndarray: float32 (frames, channels) in [-1, 1] (None if not rendered)
+        """
+        if not render:
+            self._advance(frames)
+            return None
+
+        out = np.zeros((frames, self.channels), dtype=np.float32)
+
+        # Duck low-priority voices while a high-priority one plays (ramped, no clicks)
+        ducking = any(voice.priority >= self.duck_priority for voice in self.voices)
+        duck_target = self.duck_gain if ducking else 1.0
+        duck_ramp = None
+        if self._duck != 1.0 or duck_target != 1.0:
+            duck_ramp = np.linspace(self._duck, duck_target, frames, dtype=np.float32)[:, None]
+        self._duck = duck_target
+
+        finished = []
+        for voice in self.voices:
+            chunk = voice.samples[voice.position:voice.position + frames]
+            count = len(chunk)
+            if duck_ramp is not None and voice.priority < self.duck_priority:
+                out[:count] += chunk * (duck_ramp[:count] * voice.gain)
+            else:
+                out[:count] += chunk * voice.gain
+            voice.position += count
+            if voice.position >= len(voice.samples):
+                finished.append(voice)
+        for voice in finished:
+            self.voices.remove(voice)
+
+        # Stolen/stopped voices: one short fade-out, then gone
+        for voice in self._releasing:
+            count = min(frames, self.release_frames, len(voice.samples) - voice.position)
+            if count > 0:
+                chunk = voice.samples[voice.position:voice.position + count]
+                fade = np.linspace(voice.gain, 0.0, count, dtype=np.float32)[:, None]
+                out[:count] += chunk * fade
+        self._releasing = []
+
+        if self.volume != 1.0:
+            out *= self.volume
+        np.clip(out, -1.0, 1.0, out=out)
+        self.frame += frames
+        return out
+
+    def _advance(self, frames):
+        """Move every voice on by frames without summing anything"""
+        self._releasing = []
+        for voice in list(self.voices):
+            voice.position += frames
+            if voice.position >= len(voice.samples):
+                self.voices.remove(voice)
+        self.frame += frames
+
+
+class SoundScheduler:
+    """
+    Per-category trigger policy in front of the Mixer
+
+    - drop: ignore a trigger while the category is playing
+    - queue: play triggers one after another, at most max_queue waiting
+    - coalesce: at most one play per interval_ms; triggers in between merge
+      into one play at the end of the interval
+    - restart: fade out the playing sound and start again
+
+    A like storm under 'coalesce' becomes one like sound every interval_ms -
+    a steady rhythm at bounded cost. Categories without a policy mix freely
+    (each trigger is a voice). Runs on the audio thread with the mixer.
+    """
+
+    def __init__(self, mixer, sample_rate=None):
+        self.mixer = mixer
+        self.sample_rate = sample_rate or config.AUDIO_SAMPLE_RATE
+        self._policies = {}     # category -> (policy, max_queue, interval_frames)
+        self._queues = {}       # category -> deque of (samples, gain)
+        self._coalesced = {}    # category -> (samples, gain) waiting for the interval
+        self._next_allowed = {}  # category -> mixer frame of the next coalesced play
+
+    def set_policy(self, category, policy, max_queue=1, interval_ms=0):
+        """
+        Args:
+            category: Event type / sound name
+            policy: 'drop', 'queue', 'coalesce' or 'restart' (None: mix freely)
+            max_queue: Waiting triggers kept by 'queue'
+            interval_ms: Minimum spacing of plays for 'coalesce'
+        """
+        if policy is None:
+            self._policies.pop(category, None)
+        else:
+            self._policies[category] = (policy, max(1, max_queue),
+                                        int(interval_ms * self.sample_rate / 1000))
+        self._queues.pop(category, None)
+        self._coalesced.pop(category, None)
+
+    def trigger(self, samples, category, gain=1.0):
+        """
+        Handle a trigger
+
+        Returns:
+            bool: True if a voice started now (False: dropped or deferred)
+        """
+        mixer = self.mixer
+        policy, max_queue, interval_frames = self._policies.get(category, (None, 0, 0))
+
+        if policy == 'drop':
+            if mixer.is_playing(category):
+                return False
+        elif policy == 'queue':
+            waiting = self._queues.get(category)
+            if waiting or mixer.is_playing(category):
+                if waiting is None:
+                    waiting = self._queues[category] = deque()
+                if len(waiting) < max_queue:
+                    waiting.append((samples, gain))
+                return False
+        elif policy == 'coalesce':
+            if mixer.frame < self._next_allowed.get(category, 0):
+                self._coalesced[category] = (samples, gain)  # Latest trigger wins
+                return False
+            self._next_allowed[category] = mixer.frame + interval_frames
+        elif policy == 'restart':
+            mixer.stop(category)
+
+        return mixer.play(samples, category, gain) is not None
+
+    def tick(self):
+        """Start queued/coalesced plays that are due (before each mixed block)"""
+        mixer = self.mixer
+        for category, waiting in self._queues.items():
+            if waiting and not mixer.is_playing(category):
+                samples, gain = waiting.popleft()
+                mixer.play(samples, category, gain)
+        if self._coalesced:
+            for category in [category for category in self._coalesced
+                             if mixer.frame >= self._next_allowed.get(category, 0)]:
+                samples, gain = self._coalesced.pop(category)
+                self._next_allowed[category] = mixer.frame + self._policies[category][2]
+                mixer.play(samples, category, gain)
+
+    def clear(self):
+        """Forget everything waiting"""
+        self._queues.clear()
+        self._coalesced.clear()
@@ -0,0 +1,134 @@
+"""
+Audio Thread
+Runs the Mixer and feeds its blocks to an audio backend, away from the UI thread
+
+The UI thread only enqueues commands (play, stop, volume, policy); the
+audio thread drains them every few milliseconds, lets the scheduler start
+due plays, mixes whole blocks while the backend has room and publishes
+per-category voice counts for is_playing().
+"""
+
+from PyQt6.QtCore import Qt, QThread, QTimer
+from audio_backends import create_backend
+from audio_mixer import Mixer, SoundScheduler, LatencyStats
+from sound_bank import output_format
+import config
+import queue
+import time
+
+
+class AudioThread(QThread):
+    """Owns the mixer and the audio backend (sound card, null or WAV recording)"""
+
+    def __init__(self, backend=None, parent=None):
+        """
+        Args:
+            backend: AudioBackend (default: create_backend() - config.AUDIO_BACKEND)
+            parent: QObject parent
+        """
+        super().__init__(parent)
+        self.backend = backend or create_backend()
+        self.audio_format = output_format()
+        self.mixer = Mixer()
+        self.scheduler = SoundScheduler(self.mixer)
+        self.latency = LatencyStats()
+        self._commands = queue.SimpleQueue()
+        self._counts = {}  # category -> playing voices (replaced, never mutated)
+        self._period_frames = config.AUDIO_SAMPLE_RATE * config.AUDIO_PERIOD_MS // 1000
+        self._drift_reported = False
+
+    # --- UI thread ---
+
+    def play(self, sound, category):
+        """
+        Queue a sound (any thread)
+
+        Args:
+            sound: DecodedSound (played at its loudness-normalized gain)
+            category: Event type / sound name (sets the priority)
+        """
+        self._commands.put(('play', sound.samples, category, sound.gain, time.perf_counter()))
+
+    def stop_sounds(self, category=None):
+        """Fade out every sound (of one category, or all)"""
+        self._commands.put(('stop', category))
+
+    def set_volume(self, volume):
+        self._commands.put(('volume', volume))
+
+    def set_policy(self, category, policy, max_queue=1, interval_ms=0):
+        """Scheduling policy for a category (see SoundScheduler.set_policy)"""
+        self._commands.put(('policy', category, policy, max_queue, interval_ms))
+
+    def playing(self, category):
+        """Number of voices of a category playing as of the last block"""
+        return self._counts.get(category, 0)
+
+    def shutdown(self):
+        """Stop the output and the thread"""
+        self.quit()
+        self.wait(2000)
+
+    # --- audio thread ---
+
+    def run(self):
+        backend = self.backend
+        backend.open(self.audio_format, self._period_frames)
+
+        pump = QTimer()
+        pump.setTimerType(Qt.TimerType.PreciseTimer)
+        pump.timeout.connect(self._pump)
+        pump.start(max(1, config.AUDIO_PERIOD_MS // 2))
+
+        self.exec()
+
+        pump.stop()
+        backend.close()
+
+    def _pump(self):
+        backend = self.backend
+        self._drain_commands()
+        frames = backend.frames_wanted()
+        while frames >= self._period_frames:
+            self.scheduler.tick()
+            block = self.mixer.mix(self._period_frames, render=backend.renders)
+            if block is not None:
+                backend.write(block)
+            backend.consume(self._period_frames)
+            frames -= self._period_frames
+        self._counts = self.mixer.counts()
+        self._check_drift()
+
+    def _check_drift(self):
+        """Warn once if the mixer's clock ran ahead of a wall-clock-paced backend"""
+        due = self.backend.due_frames()
+        if due is None or self._drift_reported:
+            return
+        if self.mixer.frame - due > self._period_frames:
+            self._drift_reported = True
+            print(f"[WARNING] Audio clock ahead of wall time by "
+                  f"{(self.mixer.frame - due) * 1000 // config.AUDIO_SAMPLE_RATE} ms "
+                  f"({self.backend.name} backend)")
+
+    def _drain_commands(self):
+        while True:
+            try:
+                command = self._commands.get_nowait()
+            except queue.Empty:
+                return
+            if command[0] == 'play':
+                _, samples, category, gain, triggered_at = command
+                started = self.scheduler.trigger(samples, category, gain)
+                self.backend.on_trigger(category, started, self.mixer.frame)
+                if started:
+                    # Mixed into the next block, heard after what the backend already holds
+                    self.latency.record((time.perf_counter() - triggered_at) * 1000
+                                        + self.backend.queued_ms())
+            elif command[0] == 'stop':
+                if command[1] is None:
+                    self.scheduler.clear()
+                self.mixer.stop(command[1])
+            elif command[0] == 'volume':
+                self.mixer.volume = command[1]
+            elif command[0] == 'policy':
+                self.scheduler.set_policy(*command[1:])
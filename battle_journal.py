@@ -0,0 +1,213 @@
+"""
+Battle Journal - Crash-safe PK battle state
+Write-ahead log of point deltas plus periodic atomic snapshots
+
+Layout of the state directory:
+    snapshot.json        Last full state; names the WAL generation it covers up to
+    journal.<gen>.wal    Point deltas written after snapshot <gen> was taken
+
+Recovery = snapshot + replay of every WAL generation >= the snapshot's.
+All disk I/O (writes, fsync, snapshots) happens on a background writer thread.
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+import time
+
+
+# One WAL record: seconds left in the round, team index, points delta
+WAL_RECORD = struct.Struct('<dbq')
+
+SNAPSHOT_FILE = 'snapshot.json'
+
+
+class BattleJournal:
+    """
+    Persists PK battle state so a crash or reboot can resume the exact battle
+
+    The UI thread only packs a 17-byte record and puts it on a queue; the
+    writer thread appends records to the current WAL file and fsyncs them in
+    batches (at most every FSYNC_INTERVAL seconds). Snapshots start a new WAL
+    generation, are written atomically (temp file + fsync + rename), and then
+    older WAL files are deleted, so replay is bounded by the snapshot interval.
+    """
+
+    FSYNC_INTERVAL = 0.25  # seconds
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        # Continue after the newest generation on disk
+        generations = self._wal_generations()
+        self._generation = (max(generations) + 1) if generations else 1
+
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._writer_loop, args=(self._generation,),
+                                        name='BattleJournalWriter', daemon=True)
+        self._thread.start()
+
+    # ---- UI thread API -------------------------------------------------
+
+    def log_delta(self, team_index, points, seconds_left):
+        """
+        Append a point delta (non-blocking)
+
+        Args:
+            team_index: Team index (0 = Team A, 1 = Team B, ...)
+            points: Points added (may be negative)
+            seconds_left: Exact seconds left in the round when it happened
+        """
+        self._queue.put(WAL_RECORD.pack(seconds_left, team_index, points))
+
+    def snapshot(self, state):
+        """
+        Write a full state snapshot (non-blocking)
+
+        Args:
+            state: JSON-serializable dict from PKBattleSystem.get_persistent_state()
+        """
+        self._generation += 1
+        self._queue.put(('snapshot', self._generation, dict(state)))
+
+    def close(self, state=None):
+        """
+        Flush everything and stop the writer thread
+
+        Args:
+            state: Optional final snapshot to write first
+        """
+        if state is not None:
+            self.snapshot(state)
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    # ---- Recovery ------------------------------------------------------
+
+    def load(self):
+        """
+        Rebuild the last persisted state
+
+        Returns:
+            dict: State from the snapshot with WAL deltas applied, or None
+        """
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        state = None
+        if os.path.exists(snapshot_path):
+            try:
+                with open(snapshot_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] Battle snapshot unreadable: {e}")
+
+        first_generation = state.get('wal_generation', 0) if state else 0
+        generations = [g for g in self._wal_generations() if g >= first_generation]
+        if state is None and not generations:
+            return None
+
+        if state is None:
+            state = {'scores': [], 'points': [], 'seconds_left': None, 'round_over': False}
+
+        points = list(state.get('points', []))
+        seconds_left = state.get('seconds_left')
+        replayed = 0
+
+        for generation in sorted(generations):
+            with open(self._wal_path(generation), 'rb') as f:
+                data = f.read()
+
+            # A crash can leave a torn record at the tail - ignore it
+            usable = len(data) - len(data) % WAL_RECORD.size
+            for seconds_left, team_index, delta in WAL_RECORD.iter_unpack(memoryview(data)[:usable]):
+                if team_index >= len(points):
+                    points.extend([0] * (team_index + 1 - len(points)))
+                points[team_index] += delta
+            replayed += usable // WAL_RECORD.size
+
+        state['points'] = points
+        state['seconds_left'] = seconds_left
+        state['replayed_deltas'] = replayed
+        return state
+
+    # ---- Writer thread -------------------------------------------------
+
+    def _writer_loop(self, generation):
+        wal = open(self._wal_path(generation), 'ab')
+        dirty = False
+        last_sync = time.monotonic()
+
+        while True:
+            try:
+                item = self._queue.get(timeout=self.FSYNC_INTERVAL)
+            except queue.Empty:
+                item = ()
+
+            if item is None:
+                break
+
+            if isinstance(item, bytes):
+                wal.write(item)
+                dirty = True
+            elif item:
+                # Snapshot: seal the current WAL, then switch generations
+                _, generation, state = item
+                self._sync(wal)
+                wal.close()
+                wal = open(self._wal_path(generation), 'ab')
+                dirty = False
+                self._write_snapshot(generation, state)
+                last_sync = time.monotonic()
+
+            now = time.monotonic()
+            if dirty and now - last_sync >= self.FSYNC_INTERVAL:
+                self._sync(wal)
+                dirty = False
+                last_sync = now
+
+        self._sync(wal)
+        wal.close()
+
+    def _write_snapshot(self, generation, state):
+        """Atomically replace snapshot.json, then drop WAL files it covers"""
+        state['wal_generation'] = generation
+        state['saved_at'] = time.time()
+
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARNING] Battle snapshot failed: {e}")
+            return
+
+        for old in self._wal_generations():
+            if old < generation:
+                try:
+                    os.remove(self._wal_path(old))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _sync(wal):
+        wal.flush()
+        os.fsync(wal.fileno())
+
+    def _wal_path(self, generation):
+        return os.path.join(self.directory, f'journal.{generation}.wal')
+
+    def _wal_generations(self):
+        generations = []
+        for name in os.listdir(self.directory):
+            if name.startswith('journal.') and name.endswith('.wal'):
+                try:
+                    generations.append(int(name[len('journal.'):-len('.wal')]))
+                except ValueError:
+                    pass
+        return generations
@@ -0,0 +1,277 @@
+"""
+Battle Replay
+Deterministic fast-forward re-scoring of a recorded round
+
+Feeds a RoundRecording back through a fresh PKBattleSystem - with the rules
+that were live at the time, or with other settings and gift assignments -
+as fast as the CPU allows. No Qt timers run: the round clock of each event
+comes from the recording. The result holds every intermediate score and
+renders to a plain-text report that diffs cleanly between runs.
+
+Usage:
+    python battle_replay.py ROUND_ID [--settings point_settings.json]
+                                     [--gifts gift_assignment.json] [-o report.txt]
+"""
+
+from pk_battle_system import PKBattleSystem
+from round_recording import RoundRecording
+from scoring_rules import rules_from_settings
+from array import array
+import numpy as np
+import argparse
+import config
+import json
+import sqlite3
+import sys
+
+
+class ReplayResult:
+    """
+    Outcome of a replay
+
+    Attributes:
+        system: PKBattleSystem holding the replayed end-of-round state
+            (points, ledger, leaderboards)
+        recording: The replayed RoundRecording
+        custom_rules: True if the replay used other rules than the recorded ones
+        gift_assignments: Gift -> team overrides that were applied
+        teams: array of replayed team index per event
+        points: array of replayed points per event
+        cumulative: np.ndarray (events, teams) - points after every event
+        final_points: Replayed points per team
+        winner: Replayed winner name, or 'DRAW'
+    """
+
+    def __init__(self, system, recording, custom_rules, gift_assignments, teams, points):
+        self.system = system
+        self.recording = recording
+        self.custom_rules = custom_rules
+        self.gift_assignments = dict(gift_assignments or {})
+        self.teams = teams
+        self.points = points
+
+        team_count = len(recording.team_names)
+        events = len(points)
+        deltas = np.zeros((events, team_count), dtype=np.int64)
+        deltas[np.arange(events), np.frombuffer(teams, dtype=np.int8)] = np.frombuffer(points, dtype=np.int64)
+        self.cumulative = np.cumsum(deltas, axis=0)
+
+        self.final_points = self.cumulative[-1].tolist() if events else [0] * team_count
+        self.recorded_points = self._team_totals(recording.teams, recording.points, team_count)
+        self.winner = _winner(self.final_points, recording.team_names)
+        self.recorded_winner = _winner(self.recorded_points, recording.team_names)
+
+    @staticmethod
+    def _team_totals(teams, points, team_count):
+        return np.bincount(np.frombuffer(teams, dtype=np.int8),
+                           weights=np.frombuffer(points, dtype=np.int64),
+                           minlength=team_count).astype(np.int64).tolist()
+
+    def elapsed(self):
+        """Round seconds elapsed at each event (np.ndarray)"""
+        return self.recording.duration_seconds - np.frombuffer(self.recording.seconds_left, dtype=np.float64)
+
+    def changed_events(self):
+        """
+        Events whose team or points differ from the live round
+
+        Returns:
+            np.ndarray: Event indices
+        """
+        recorded_teams = np.frombuffer(self.recording.teams, dtype=np.int8)
+        recorded_points = np.frombuffer(self.recording.points, dtype=np.int64)
+        teams = np.frombuffer(self.teams, dtype=np.int8)
+        points = np.frombuffer(self.points, dtype=np.int64)
+        return np.flatnonzero((recorded_teams != teams) | (recorded_points != points))
+
+    def leaders(self):
+        """
+        Leading team after every event
+
+        Returns:
+            np.ndarray: Team index per event, -1 while the lead is tied
+        """
+        if not len(self.cumulative):
+            return np.zeros(0, dtype=np.int64)
+        best = self.cumulative.max(axis=1)
+        tied = (self.cumulative == best[:, None]).sum(axis=1) > 1
+        return np.where(tied, -1, self.cumulative.argmax(axis=1))
+
+
+def replay_round(recording, rules=None, gift_assignments=None):
+    """
+    Re-score a recorded round
+
+    Args:
+        recording: RoundRecording
+        rules: Rule set to score with (None: the rules that were live,
+            including mid-round changes)
+        gift_assignments: {gift_name: team name} overriding the team each
+            recorded gift went to
+
+    Returns:
+        ReplayResult: Replayed round
+    """
+    team_names = recording.team_names
+    system = PKBattleSystem(team_count=len(team_names))
+    system.recording = None
+    system.round_duration_seconds = recording.duration_seconds
+
+    changes = [(0, rules)] if rules is not None else list(recording.rule_changes)
+    if not changes:
+        changes = [(0, system.scoring_rules)]
+
+    # Gift name -> team index overrides (unknown teams are ignored)
+    overrides = {}
+    for gift_name, team in (gift_assignments or {}).items():
+        index = system.team_index(team)
+        if index is not None:
+            overrides[gift_name] = index
+
+    teams = array('b')
+    points = array('q')
+    contributions = []
+    change = 0
+
+    # Scoring only - the rules update streak/cap state as they go. Ledger,
+    # leaderboards and timeline are filled once at the end, in one batch.
+    for i, (offset, seconds_left, team, event_type, units, user_id, detail, _) in enumerate(recording.events_iter()):
+        while change < len(changes) and changes[change][0] <= i:
+            system.set_scoring_rules(changes[change][1])
+            change += 1
+
+        if event_type == 'gift' and detail in overrides:
+            team = overrides[detail]
+
+        awarded = system.evaluate_event(team, event_type, units, user_id, detail,
+                                        seconds_left=seconds_left, now=offset)
+        teams.append(team)
+        points.append(awarded)
+        if awarded:
+            contributions.append((team, awarded, user_id, event_type))
+
+    system.apply_contributions(contributions)
+    return ReplayResult(system, recording, rules is not None, gift_assignments, teams, points)
+
+
+def _winner(points, team_names):
+    best = max(points)
+    leaders = [i for i, value in enumerate(points) if value == best]
+    return team_names[leaders[0]] if len(leaders) == 1 else 'DRAW'
+
+
+def _clock(seconds):
+    seconds = max(0, int(seconds))
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def format_report(result):
+    """
+    Render a replay as plain text
+    Fixed ordering and formatting, so two reports diff line by line
+
+    Args:
+        result: ReplayResult
+
+    Returns:
+        str: Report
+    """
+    recording = result.recording
+    names = recording.team_names
+    elapsed = result.elapsed()
+
+    lines = [
+        "PK Replay Report",
+        "================",
+        f"Teams: {', '.join(names)}",
+        f"Round duration: {_clock(recording.duration_seconds)}",
+        f"Events: {len(recording)}",
+        f"Rules: {'custom' if result.custom_rules else f'recorded ({len(recording.rule_changes)} rule set(s))'}",
+    ]
+    for gift_name in sorted(result.gift_assignments):
+        lines.append(f"Gift reassigned: {gift_name} -> Team {result.gift_assignments[gift_name]}")
+    lines.append("Note: manual point adjustments are not part of the recording")
+
+    lines += ["", "Final points (recorded -> replayed):"]
+    for i, name in enumerate(names):
+        lines.append(f"  Team {name}: {result.recorded_points[i]:,} -> {result.final_points[i]:,}")
+    lines.append(f"Winner (recorded -> replayed): {result.recorded_winner} -> {result.winner}")
+
+    # Score at the end of every minute
+    lines += ["", "Score by minute (replayed):"]
+    minutes = int(recording.duration_seconds // 60)
+    for minute in range(1, minutes + 1):
+        count = int(np.searchsorted(elapsed, minute * 60, side='right')) if len(elapsed) else 0
+        totals = result.cumulative[count - 1].tolist() if count else [0] * len(names)
+        lines.append(f"  {_clock(minute * 60)}  " + "  ".join(
+            f"{name} {total:,}" for name, total in zip(names, totals)))
+
+    # Every change of the lead
+    lines += ["", "Lead changes (replayed):"]
+    leaders = result.leaders()
+    previous = -1
+    for i in np.flatnonzero(np.diff(leaders, prepend=-1) != 0):
+        leader = int(leaders[i])
+        if leader == previous:
+            continue
+        previous = leader
+        totals = " - ".join(f"{total:,}" for total in result.cumulative[i].tolist())
+        state = f"Team {names[leader]} leads" if leader >= 0 else "Tied"
+        lines.append(f"  {_clock(elapsed[i])}  {state}  {totals}")
+
+    # Events scored differently than live
+    changed = result.changed_events()
+    lines += ["", f"Changed events ({len(changed)}):"]
+    for i in changed.tolist():
+        _, _, recorded_team, event_type, units, user_id, detail, recorded_points = recording.event(i)
+        what = f"{event_type} {detail} x{units}" if detail else f"{event_type} x{units}"
+        lines.append(f"  #{i} {_clock(elapsed[i])} @{user_id or '-'} {what}: "
+                     f"Team {names[recorded_team]} +{recorded_points:,} -> "
+                     f"Team {names[result.teams[i]]} +{result.points[i]:,}")
+
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded PK round")
+    parser.add_argument('round_id', type=int)
+    parser.add_argument('--db', default=config.HISTORY_DB)
+    parser.add_argument('--settings', help="Point settings JSON to score with (default: recorded rules)")
+    parser.add_argument('--gifts', help="Gift assignment JSON ({gift_name: team}) to re-map gifts with")
+    parser.add_argument('-o', '--output', help="Write the report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Read the blob directly - opening a HistoryStore would start a new session
+    db = sqlite3.connect(args.db)
+    try:
+        row = db.execute('SELECT data FROM round_recordings WHERE round_id = ?',
+                         (args.round_id,)).fetchone()
+    finally:
+        db.close()
+    recording = RoundRecording.from_bytes(row[0]) if row else None
+    if recording is None:
+        print(f"[WARNING] Round {args.round_id} has no recording")
+        return 1
+
+    rules = None
+    if args.settings:
+        with open(args.settings, 'r') as f:
+            rules = rules_from_settings(json.load(f))
+
+    gift_assignments = None
+    if args.gifts:
+        with open(args.gifts, 'r') as f:
+            gift_assignments = json.load(f)
+
+    report = format_report(replay_round(recording, rules, gift_assignments))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f"[OK] Report written to {args.output}")
+    else:
+        sys.stdout.write(report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Bubble Styles
+Resolved look of every bubble kind, computed once per settings change
+
+A bubble's look comes from three layers: config.EVENT_CONFIGS per event
+type, the gift tier for gifts (gift_tiers), and the user's bubble settings
+(size, gift size, duration). StyleTable merges them up front into one
+immutable BubbleStyle per event type and per gift tier; creating a bubble is
+then a dict hit (or a bisect for gifts) and every bubble of the same kind
+shares the same style object.
+"""
+
+from collections import namedtuple
+from gift_tiers import GIFT_TIERS, TIER_ORDER, get_tier_index
+import config
+
+
+# Fully resolved bubble look (immutable, shared between bubbles)
+#   duration: lifetime in ms
+#   border_width / glow_intensity: None for the event type's default look
+#   tier_name / description: gift tiers only
+BubbleStyle = namedtuple(
+    'BubbleStyle',
+    ('event_type', 'size', 'color', 'duration', 'effect', 'emoji',
+     'border_width', 'glow_intensity', 'tier_name', 'description'),
+    defaults=(None, None, None, ''))
+
+
+class StyleTable:
+    """
+    (event type, gift tier) -> BubbleStyle
+
+    Rebuild it whenever bubble settings change; resolve() never merges
+    anything itself.
+    """
+
+    def __init__(self, bubble_settings=None):
+        """
+        Args:
+            bubble_settings: Optional overrides from the Bubble Settings tab:
+                'size' (non-gift bubbles), 'gift_size', 'duration' (ms, all bubbles)
+        """
+        settings = bubble_settings or {}
+        size = settings.get('size')
+        gift_size = settings.get('gift_size', size)
+        duration = settings.get('duration')
+
+        self._styles = {}
+        for event_type, event_config in config.EVENT_CONFIGS.items():
+            override = gift_size if event_type == 'gift' else size
+            self._styles[event_type] = BubbleStyle(
+                event_type=event_type,
+                size=override if override is not None else event_config['size'],
+                color=event_config['color'],
+                duration=duration if duration is not None else event_config.get('duration', 3000),
+                effect=event_config.get('effect', 'fade_in_out'),
+                emoji=event_config.get('emoji', ''),
+            )
+        self._default = self._styles['join']
+
+        # One style per tier, in TIER_ORDER (indexed by get_tier_index)
+        gift_emoji = config.EVENT_CONFIGS['gift'].get('emoji', '')
+        self._gift_styles = []
+        for tier_name in TIER_ORDER:
+            tier = GIFT_TIERS[tier_name]
+            self._gift_styles.append(BubbleStyle(
+                event_type='gift',
+                size=gift_size if gift_size is not None else tier['size'],
+                color=tier['color'],
+                duration=duration if duration is not None else tier['duration'],
+                effect=tier['effect'],
+                emoji=gift_emoji,
+                border_width=tier['border_width'],
+                glow_intensity=tier['glow_intensity'],
+                tier_name=tier['name'],
+                description=tier['description'],
+            ))
+
+    def resolve(self, event_type, gift_value=None):
+        """
+        Get the style for a bubble
+
+        Args:
+            event_type: 'gift', 'like', 'comment', ... (unknown types look like 'join')
+            gift_value: Coin value of one gift (gifts only; None: plain gift style)
+
+        Returns:
+            BubbleStyle: Shared style object
+        """
+        if event_type == 'gift' and gift_value is not None:
+            return self._gift_styles[get_tier_index(gift_value)]
+        return self._styles.get(event_type, self._default)
+
+    def gift_sizes(self):
+        """Distinct gift bubble sizes (pixels) across the tiers"""
+        return sorted({style.size for style in self._gift_styles})
+
+
+# Styles with no user overrides (bubbles created without a table)
+DEFAULT_STYLES = StyleTable()
@@ -4,12 +4,14 @@ Displays animated bubble with user avatar, name, and event info
 """
 
 from PyQt6.QtWidgets import QWidget, QLabel, QGraphicsOpacityEffect
-from PyQt6.QtCore import (Qt, QRect, QTimer, QUrl, QPointF, QPropertyAnimation, 
-                         QSequentialAnimationGroup, QEasingCurve)
+from PyQt6.QtCore import (Qt, QRect, QUrl, QPointF, QPropertyAnimation, 
+                         QSequentialAnimationGroup, QEasingCurve, pyqtSignal)
 from PyQt6.QtGui import (QPainter, QPixmap, QPainterPath, QColor,
                         QFont, QLinearGradient, QRadialGradient, QPen)
 from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
 import config
+from bubble_styles import DEFAULT_STYLES
+from clock import REAL_CLOCK
 from effects import EFFECT_REGISTRY
 import random
 
@@ -19,11 +21,22 @@ class BubbleWidget(QWidget):
     Animated bubble widget that displays user info and event details
     """
 
-    def __init__(self, parent=None, event_data=None, network_manager=None):
+    # Lifetime animation ended - the bubble is being deleted
+    lifetime_finished = pyqtSignal(object)  # bubble
+
+    def __init__(self, parent=None, event_data=None, network_manager=None, clock=None,
+                 style=None, gift_icon=None):
         super().__init__(parent)
 
         self.event_data = event_data or {}
+        # BubbleStyle from a StyleTable (default: resolved from event_data)
+        self.bubble_style = style
+        # Movement timer and lifetime animation run on this clock
+        self.clock = clock or REAL_CLOCK
+        self.is_finished = False  # Set once the bubble is being deleted
         self.avatar_pixmap = None
+        # Pre-scaled gift artwork from GiftIconCache (None: draw the emoji)
+        self.gift_icon = gift_icon
         # Use shared manager if provided, else create new (fallback)
         self.network_manager = network_manager if network_manager else QNetworkAccessManager()
 
@@ -32,38 +45,12 @@ class BubbleWidget(QWidget):
 
     def _setup_ui(self):
         """Setup the bubble UI"""
-        # Get event configuration
-        event_type = self.event_data.get('type', 'join')
-        event_config = config.EVENT_CONFIGS.get(event_type, config.EVENT_CONFIGS['join'])
-
-        # Check for gift tier overrides (takes precedence over default config)
-        if 'tier_size' in self.event_data:
-            # Use tier settings for gifts
-            size = self.event_data['tier_size']
-            color = self.event_data['tier_color']
-            effect = self.event_data['tier_effect']
-            duration = self.event_data['tier_duration']
-            self.tier_border_width = self.event_data.get('tier_border_width', 3)
-            self.tier_glow_intensity = self.event_data.get('tier_glow_intensity', 40)
-        else:
-            # Use default config
-            size = event_config['size']
-            color = event_config['color']
-            effect = event_config.get('effect', 'fade_in_out')
-            duration = event_config.get('duration', 3000)
-            self.tier_border_width = None
-            self.tier_glow_intensity = None
-            
-        # OVERRIDE: Custom settings from UI (applies to all events)
-        if 'custom_size' in self.event_data:
-            size = self.event_data['custom_size']
-            
-            # Special handling for gifts with custom size
-            if self.event_data.get('type') == 'gift' and 'custom_gift_size' in self.event_data:
-                size = self.event_data['custom_gift_size']
-                 
-        if 'custom_duration' in self.event_data:
-            duration = self.event_data['custom_duration']
+        # Resolved look - shared with every bubble of the same kind
+        if self.bubble_style is None:
+            self.bubble_style = DEFAULT_STYLES.resolve(self.event_data.get('type', 'join'),
+                                                       self.event_data.get('gift_value'))
+        style = self.bubble_style
+        size = style.size
 
         # Set size and position
         parent_width = self.parent().width() if self.parent() else config.WINDOW_WIDTH
@@ -79,10 +66,13 @@ class BubbleWidget(QWidget):
         self.setGeometry(x, y, size, size)
 
         # Store configuration
-        self.bubble_color = QColor(color)
-        self.emoji = event_config.get('emoji', '')
-        self.effect_name = effect
-        self.duration = duration
+        self.bubble_color = QColor(style.color)
+        self.emoji = style.emoji
+        self.effect_name = style.effect
+        self.duration = style.duration
+        self.expires_at = self.clock.monotonic() + self.duration / 1000  # End of lifetime
+        self.tier_border_width = style.border_width
+        self.tier_glow_intensity = style.glow_intensity
         self.rotation_angle = 0  # Default rotation
 
         # Enable custom painting
@@ -371,8 +361,17 @@ class BubbleWidget(QWidget):
                         Qt.AlignmentFlag.AlignCenter, username)
 
     def _draw_emoji(self, painter):
-        """Draw emoji icon"""
-        if self.emoji:
+        """Draw emoji icon (or the gift's artwork as a badge on the avatar)"""
+        if self.gift_icon is not None:
+            # Bottom-right of the avatar, overlapping its edge
+            icon_w = self.gift_icon.width()
+            icon_h = self.gift_icon.height()
+            avatar_size = int(self.width() * 0.55)
+            avatar_bottom = int(self.height() * 0.12) + avatar_size
+            x = (self.width() + avatar_size) // 2 - icon_w * 3 // 4
+            y = avatar_bottom - icon_h * 3 // 4
+            painter.drawPixmap(x, y, self.gift_icon)
+        elif self.emoji:
             is_gift = self.event_data.get('type') == 'gift'
 
             # Larger emoji for gifts
@@ -396,7 +395,8 @@ class BubbleWidget(QWidget):
         info_text = ''
         if event_type == 'gift':
             gift_name = self.event_data.get('gift_name', 'Gift')
-            info_text = f"{gift_name}"
+            gift_count = self.event_data.get('gift_count', 1)
+            info_text = f"{gift_name} x{gift_count}" if gift_count > 1 else gift_name
         elif event_type == 'comment':
             comment = self.event_data.get('comment', '')
             if len(comment) > 20:
@@ -420,8 +420,7 @@ class BubbleWidget(QWidget):
         self.vy = random.choice([-1, 1]) * random.uniform(1.5, 3.5)
         
         # Start movement timer (approx 60 FPS)
-        self.movement_timer = QTimer(self)
-        self.movement_timer.timeout.connect(self._update_movement)
+        self.movement_timer = self.clock.timer(self._update_movement, parent=self)
         self.movement_timer.start(16)
         
         # Opacity animation (Fade In -> Hold -> Fade Out)
@@ -455,11 +454,58 @@ class BubbleWidget(QWidget):
         anim_group.addAnimation(hold)
         anim_group.addAnimation(fade_out)
         
-        anim_group.finished.connect(self.deleteLater)
-        anim_group.start()
+        anim_group.finished.connect(self._on_animation_finished)
+        self.clock.start_animation(anim_group)
         
         # Keep reference to prevent garbage collection
         self._anim_group = anim_group
+        self._fade_in_anim = fade_in
+        self._hold_anim = hold
+        self._hold_ms = hold_duration
+
+    def extend_lifetime(self):
+        """
+        Restart the full lifetime from now (a gift streak got another update)
+
+        Returns:
+            bool: False if the bubble is already fading out or gone - show a new one instead
+        """
+        if self.is_finished:
+            return False
+        group = getattr(self, '_anim_group', None)
+        if group is not None:
+            try:
+                # Lengthen the hold phase so the fade-out starts a full hold from now
+                fade_in_ms = self._fade_in_anim.duration()
+                elapsed = group.currentTime()
+                if elapsed >= fade_in_ms + self._hold_anim.duration():
+                    return False
+                self._hold_anim.setDuration(max(self._hold_anim.duration(),
+                                                elapsed - fade_in_ms + self._hold_ms))
+            except RuntimeError:
+                # Animations already deleted along with the bubble
+                self.is_finished = True
+                return False
+
+        self.expires_at = self.clock.monotonic() + self.duration / 1000
+        return True
+
+    def set_gift_icon(self, pixmap):
+        """Show the gift's artwork once GiftIconCache has it"""
+        self.gift_icon = pixmap
+        self.update()
+
+    def set_gift_count(self, count):
+        """Show a new streak count ("Rose x37")"""
+        self.event_data['gift_count'] = count
+        self.update()
+
+    def _on_animation_finished(self):
+        """Lifetime is over - stop moving and delete"""
+        self.is_finished = True
+        self.movement_timer.stop()
+        self.lifetime_finished.emit(self)
+        self.deleteLater()
 
     def _update_movement(self):
         """Update bubble position for bouncing effect"""
@@ -501,4 +547,4 @@ class BubbleWidget(QWidget):
         """Override show event to auto-start animation"""
         super().showEvent(event)
         # Start animation after a brief delay to ensure rendering
-        QTimer.singleShot(50, self.start_animation)
+        self.clock.call_later(50, self.start_animation)
@@ -0,0 +1,214 @@
+"""
+Clock
+Time source and timer factory for the battle engine, bubbles and effects
+
+Everything that reads the time or schedules work goes through a clock, so
+the same code runs against wall time (RealClock - Qt timers and animations)
+or against simulated time (VirtualClock - advanced explicitly, as fast as
+the CPU allows). A 60-minute round under a VirtualClock takes a fraction of
+a second and is fully deterministic.
+"""
+
+from PyQt6.QtCore import Qt, QTimer
+import heapq
+import itertools
+import time
+
+
+class RealClock:
+    """Wall-clock time, QTimer timers and Qt-driven animations"""
+
+    def monotonic(self):
+        """Seconds on a clock that never jumps (for deadlines and durations)"""
+        return time.monotonic()
+
+    def time(self):
+        """Unix time (for timestamps that are stored or shown)"""
+        return time.time()
+
+    def call_later(self, delay_ms, callback):
+        """
+        Run callback once after delay_ms milliseconds
+
+        Args:
+            delay_ms: Delay in milliseconds
+            callback: Callable with no arguments
+        """
+        QTimer.singleShot(int(delay_ms), callback)
+
+    def timer(self, callback, parent=None, precise=False):
+        """
+        Create a stopped repeating timer
+
+        Args:
+            callback: Called on every timeout
+            parent: QObject owning the timer
+            precise: Request millisecond accuracy
+
+        Returns:
+            QTimer: Timer (start(interval_ms), stop(), isActive())
+        """
+        timer = QTimer(parent)
+        if precise:
+            timer.setTimerType(Qt.TimerType.PreciseTimer)
+        timer.timeout.connect(callback)
+        return timer
+
+    def start_animation(self, animation):
+        """Start a QAbstractAnimation on Qt's animation timer"""
+        animation.start()
+
+
+class VirtualTimer:
+    """Repeating timer on a VirtualClock (same interface as the QTimer subset used)"""
+
+    def __init__(self, clock, callback):
+        self._clock = clock
+        self._callback = callback
+        self._interval_ms = 0
+        self._generation = 0
+        self._active = False
+
+    def start(self, interval_ms=None):
+        if interval_ms is not None:
+            self._interval_ms = max(0, int(interval_ms))
+        # A restart invalidates the pending timeout
+        self._generation += 1
+        self._active = True
+        self._schedule()
+
+    def stop(self):
+        self._generation += 1
+        self._active = False
+
+    def isActive(self):
+        return self._active
+
+    def interval(self):
+        return self._interval_ms
+
+    def _schedule(self):
+        generation = self._generation
+        self._clock._schedule(max(1, self._interval_ms), lambda: self._fire(generation))
+
+    def _fire(self, generation):
+        if not self._active or generation != self._generation:
+            return
+        self._schedule()
+        self._callback()
+
+
+class VirtualClock:
+    """
+    Simulated time, advanced only by advance()/step_frames()
+
+    Time is kept in whole milliseconds, so advancing in any step size lands
+    on exactly the same timer firings. Due callbacks run in time order (ties
+    in scheduling order) with the clock set to their due time. Animations are
+    started paused and moved with setCurrentTime(), which still emits their
+    finished signal at the end. Deferred deletes (deleteLater) need the Qt
+    event loop - process events between steps if widgets are involved.
+    """
+
+    def __init__(self, start=0.0, epoch=1_700_000_000.0):
+        """
+        Args:
+            start: Initial monotonic() value in seconds
+            epoch: Unix time at monotonic() == 0
+        """
+        self._now_ms = int(round(start * 1000))
+        self.epoch = epoch
+        self._queue = []  # heap of (due_ms, sequence, callback)
+        self._sequence = itertools.count()
+        self._animations = []  # [(animation, started_ms)]
+
+    def monotonic(self):
+        return self._now_ms / 1000.0
+
+    def time(self):
+        return self.epoch + self._now_ms / 1000.0
+
+    def call_later(self, delay_ms, callback):
+        self._schedule(max(0, int(delay_ms)), callback)
+
+    def timer(self, callback, parent=None, precise=False):
+        timer = VirtualTimer(self, callback)
+        if parent is not None:
+            # Like a QTimer child, it dies with its parent
+            parent.destroyed.connect(timer.stop)
+        return timer
+
+    def start_animation(self, animation):
+        animation.start()
+        animation.pause()
+        self._animations.append((animation, self._now_ms))
+
+    def _schedule(self, delay_ms, callback):
+        heapq.heappush(self._queue, (self._now_ms + delay_ms, next(self._sequence), callback))
+
+    def pending(self):
+        """Number of scheduled callbacks (including stopped timers' stale entries)"""
+        return len(self._queue)
+
+    def advance(self, seconds):
+        """
+        Move time forward, running everything that falls due on the way
+
+        Args:
+            seconds: Simulated seconds to advance (rounded to whole ms)
+
+        Returns:
+            int: Number of callbacks run
+        """
+        return self._advance_to(self._now_ms + max(0, int(round(seconds * 1000))))
+
+    def step_frames(self, frames, frame_ms):
+        """
+        Advance frame by frame (benchmark harness)
+        Frame boundaries are rounded from the start, so 16.67 ms frames don't drift
+
+        Args:
+            frames: Number of frames
+            frame_ms: Frame length in milliseconds
+
+        Returns:
+            int: Number of callbacks run
+        """
+        start = self._now_ms
+        fired = 0
+        for frame in range(1, frames + 1):
+            fired += self._advance_to(start + int(round(frame * frame_ms)))
+        return fired
+
+    def _advance_to(self, target):
+        fired = 0
+        while self._queue and self._queue[0][0] <= target:
+            due, _, callback = heapq.heappop(self._queue)
+            self._set_now(due)
+            callback()
+            fired += 1
+        self._set_now(target)
+        return fired
+
+    def _set_now(self, now_ms):
+        if now_ms > self._now_ms:
+            self._now_ms = now_ms
+            if self._animations:
+                self._step_animations()
+
+    def _step_animations(self):
+        running = []
+        for animation, started_ms in self._animations:
+            try:
+                total = animation.totalDuration()
+                elapsed = self._now_ms - started_ms
+                animation.setCurrentTime(elapsed if total < 0 else min(elapsed, total))
+                if animation.state() != animation.State.Stopped:
+                    running.append((animation, started_ms))
+            except RuntimeError:
+                pass  # Underlying Qt object already deleted
+        self._animations = running
+
+
+# Default clock for everything that isn't handed one explicitly
+REAL_CLOCK = RealClock()
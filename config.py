@@ -36,6 +36,111 @@ BUBBLE_MAX_SIZE = 200
 BUBBLE_DURATION = 3000  # milliseconds
 BUBBLE_FADE_DURATION = 500  # milliseconds
 
+# Team Settings (PK battles support 2-8 teams)
+TEAM_COUNT = 2
+TEAM_NAMES = ('A', 'B', 'C', 'D', 'E', 'F', 'G', 'H')
+TEAM_COLORS = ('#FF6B6B', '#4ECDC4', '#FFD93D', '#6BCB77',
+               '#A66CFF', '#FF9F45', '#4D96FF', '#F473B9')
+
+# Display Frame Settings
+# Score labels and the progress bar refresh at most once per frame
+FRAME_INTERVAL_MS = 16  # ~60 FPS
+LEADERBOARD_REFRESH_MS = 1000  # Top supporters list refresh
+
+# Points Timeline (points-per-second history, see points_timeline.py)
+# Fixed-size ring buffers: slots x teams x 8 bytes each
+TIMELINE_SECOND_SLOTS = 3 * 3600  # 1 s resolution - covers the longest round (180 min)
+TIMELINE_10S_SLOTS = 6 * 360      # 10 s resolution - last 6 hours
+TIMELINE_MINUTE_SLOTS = 24 * 60   # 1 min resolution - last 24 hours
+
+# Crash-safe battle state (snapshot + write-ahead log of point deltas)
+BATTLE_STATE_DIR = 'battle_state'
+
+# Session/round history (SQLite, see history_store.py)
+HISTORY_DB = 'pk_history.db'
+HISTORY_PAGE_SIZE = 50  # Rounds loaded per page in the History tab
+
+# Gift Catalog (gift_id -> name, diamonds, image; filled from live gift events)
+GIFT_CATALOG_FILE = 'gift_catalog.json'
+GIFT_CATALOG_SAVE_DELAY_MS = 5000  # New gifts are written in one batch after this
+GIFT_STREAK_TIMEOUT_SECONDS = 5.0  # A combo with no update for this long is over
+GIFT_STREAK_FORGET_SECONDS = 300.0  # Last count of a quiet combo is kept this long (late updates)
+
+# Gift Icons (gift artwork cached per gift_id, see gift_icons.py)
+GIFT_ICON_DIR = 'gift_icons'
+GIFT_ICON_SCALE = 0.3          # Icon edge as a fraction of the bubble size
+GIFT_ICON_SOURCE_SIZE = 256    # Edge of the PNG kept on disk (largest icon drawn)
+GIFT_ICON_DECODE_THREADS = 2   # Worker threads decoding/scaling icons
+
+# Audio (sound effects decoded once to PCM, see sound_bank.py)
+AUDIO_SAMPLE_RATE = 48000
+AUDIO_CHANNELS = 2
+AUDIO_BUFFER_MS = 30          # Output buffer - lower is snappier, too low crackles
+AUDIO_PERIOD_MS = 10          # Mixer block length
+AUDIO_BACKEND = 'qt'          # 'qt' (sound card), 'null' (count triggers only), 'record' (WAV file)
+AUDIO_RECORD_FILE = 'logs/audio_recording.wav'  # 'record' backend output (+ .triggers.csv)
+SOUND_MIN_FILE_BYTES = 100    # Smaller files are empty placeholders, not audio
+SOUND_RELOAD_DELAY_MS = 300   # Changed sound files are re-decoded once writes settle
+AUDIO_LATENCY_SAMPLES = 256   # Trigger-to-audio measurements kept for stats
+
+# Loudness normalization (see sound_loudness.py)
+SOUND_LOUDNESS_FILE = 'sound_loudness.json'  # Measurements by file SHA-1
+SOUND_LOUDNESS_SAVE_DELAY_MS = 2000
+SOUND_TARGET_LOUDNESS_DB = -16.0  # Gated RMS every sound is brought to
+SOUND_PEAK_CEILING_DB = -1.0      # Gain never pushes a peak above this
+SOUND_MAX_GAIN_DB = 12.0
+SOUND_MIN_GAIN_DB = -24.0
+
+# Mixer (see audio_mixer.py)
+AUDIO_VOICES = 8              # Sounds playing at once
+AUDIO_RELEASE_MS = 5          # Fade-out of a stolen/stopped voice
+# Higher wins when all voices are busy (event types and built-in sound names)
+AUDIO_PRIORITIES = {
+    'final_win': 100,
+    'team_a_win': 90,
+    'team_b_win': 90,
+    'round_end_warning': 80,
+    'gift': 60,
+    'follow': 40,
+    'share': 30,
+    'comment': 30,
+    'join': 20,
+    'like': 10,
+}
+AUDIO_DEFAULT_PRIORITY = 20
+# What a trigger does while its event type is still playing (see audio_mixer.SoundScheduler)
+SOUND_POLICIES = ('drop', 'queue', 'coalesce', 'restart')
+SOUND_POLICY_DEFAULTS = {
+    'like': {'policy': 'coalesce', 'max_queue': 1, 'interval_ms': 250},
+    'gift': {'policy': 'queue', 'max_queue': 3, 'interval_ms': 0},
+    'team_a_win': {'policy': 'restart', 'max_queue': 1, 'interval_ms': 0},
+    'team_b_win': {'policy': 'restart', 'max_queue': 1, 'interval_ms': 0},
+    'round_end': {'policy': 'restart', 'max_queue': 1, 'interval_ms': 0},
+}
+SOUND_POLICY_FALLBACK = {'policy': 'drop', 'max_queue': 1, 'interval_ms': 0}
+AUDIO_DUCK_PRIORITY = 80      # While a sound at/above this plays, the rest are ducked
+AUDIO_DUCK_GAIN = 0.35
+
+# Event Log Settings
+LOG_PANEL_CAPACITY = 1000  # Lines kept in the on-screen log
+LOG_SAMPLE_INTERVALS = {
+    'like': 1.0,  # Show at most one like line per second (with a counter)
+}
+
+# Application Log (background writer, see app_logging.py)
+APP_LOG_LEVEL = 'INFO'  # DEBUG also records every like and avatar lookup
+LOG_FILE = 'logs/event_log.txt'  # Full history (all categories)
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024  # Rotate at 5 MB
+LOG_FILE_BACKUP_COUNT = 5
+# Which records below WARNING reach the on-screen log, per category:
+# 0 = all, N = at most one per N seconds, None = never
+LOG_UI_SAMPLE_INTERVALS = {
+    'connection': 0,
+    'event': 1.0,
+    'avatar': None,
+    'scoring': None,
+}
+
 # Event Type Configurations
 EVENT_CONFIGS = {
     'join': {
@@ -0,0 +1,197 @@
+"""
+Contribution Ledger
+Append-only record of who gave which team how many points, and why
+Column storage in typed arrays keeps a long round memory-bounded
+"""
+
+from array import array
+import time
+
+
+# Contribution sources (stored as their index)
+SOURCES = ('gift', 'like', 'comment', 'share', 'follow', 'adjust')
+SOURCE_INDEX = {name: i for i, name in enumerate(SOURCES)}
+
+# Default teams (stored as their index)
+TEAMS = ('A', 'B')
+
+
+class ContributionLedger:
+    """
+    Append-only ledger of (timestamp, user_id, team, source, points)
+
+    Rows live in parallel typed arrays (about 22 bytes per row) and user ids
+    are interned to small ints. Contributions from the same user to the same
+    team from the same source are merged into that stream's open row until it
+    is COALESCE_WINDOW seconds old - interleaved with other users or not - so
+    a like storm grows the ledger by at most one row per (user, team, source)
+    per second.
+
+    Per-user and per-team totals are maintained incrementally - recording a
+    contribution is O(1) amortized. Corrections are appended as 'adjust' rows,
+    never by rewriting history.
+    """
+
+    COALESCE_WINDOW = 1.0  # seconds
+
+    def __init__(self, teams=TEAMS):
+        self.team_names = tuple(teams)
+        self.team_index = {name: i for i, name in enumerate(self.team_names)}
+        self.clear()
+
+    def clear(self):
+        """Drop all rows and totals (start of a new round)"""
+        # Row columns
+        self.timestamps = array('d')
+        self.user_indices = array('i')
+        self.teams = array('b')
+        self.sources = array('b')
+        self.points = array('q')
+
+        # (user index, team index, source index) -> row still open for merging
+        self._open_rows = {}
+
+        # Interned user ids
+        self.users = []         # index -> user_id
+        self._user_index = {}   # user_id -> index
+
+        # Incremental aggregates
+        self.team_totals = array('q', [0] * len(self.team_names))
+        self.user_team_totals = [array('q') for _ in self.team_names]  # [team][user index]
+
+    def __len__(self):
+        return len(self.points)
+
+    def _intern_user(self, user_id):
+        """Return the index for user_id, registering it if new"""
+        index = self._user_index.get(user_id)
+        if index is None:
+            index = len(self.users)
+            self.users.append(user_id)
+            self._user_index[user_id] = index
+            for totals in self.user_team_totals:
+                totals.append(0)
+        return index
+
+    def record(self, user_id, team, source, points, timestamp=None):
+        """
+        Append a contribution
+
+        Args:
+            user_id: TikTok unique id ('' if unknown)
+            team: Team name ('A', 'B', ...)
+            source: One of SOURCES
+            points: Points awarded (negative for corrections)
+            timestamp: Unix time (default: now)
+        """
+        team_idx = self.team_index[team]
+        source_idx = SOURCE_INDEX[source]
+        user_idx = self._intern_user(user_id or '')
+        if timestamp is None:
+            timestamp = time.time()
+
+        # Merge into this stream's open row while it is younger than the window
+        key = (user_idx, team_idx, source_idx)
+        row = self._open_rows.get(key)
+        if row is not None and timestamp - self.timestamps[row] < self.COALESCE_WINDOW:
+            self.points[row] += points
+        else:
+            self._open_rows[key] = len(self.points)
+            self.timestamps.append(timestamp)
+            self.user_indices.append(user_idx)
+            self.teams.append(team_idx)
+            self.sources.append(source_idx)
+            self.points.append(points)
+
+        self.team_totals[team_idx] += points
+        self.user_team_totals[team_idx][user_idx] += points
+
+    def adjust(self, user_id, team, points, timestamp=None):
+        """
+        Append a correction row
+
+        Args:
+            user_id: User the correction applies to ('' for team-level)
+            team: Team name ('A', 'B', ...)
+            points: Points to add (negative to remove)
+            timestamp: Unix time (default: now)
+        """
+        self.record(user_id, team, 'adjust', points, timestamp)
+
+    def user_total(self, user_id, team=None):
+        """
+        Get a user's points
+
+        Args:
+            user_id: TikTok unique id
+            team: Team name, or None for all teams
+
+        Returns:
+            int: Points contributed
+        """
+        index = self._user_index.get(user_id)
+        if index is None:
+            return 0
+        if team is not None:
+            return self.user_team_totals[self.team_index[team]][index]
+        return sum(totals[index] for totals in self.user_team_totals)
+
+    def top_users(self, team=None, limit=10):
+        """
+        Get the biggest contributors
+
+        Args:
+            team: Team name, or None for all teams
+            limit: Max entries
+
+        Returns:
+            list: [(user_id, points), ...] highest first
+        """
+        if team is not None:
+            totals = self.user_team_totals[self.team_index[team]]
+        else:
+            totals = [sum(column) for column in zip(*self.user_team_totals)]
+
+        ranked = sorted(range(len(totals)), key=totals.__getitem__, reverse=True)
+        return [(self.users[i], totals[i]) for i in ranked[:limit] if totals[i] > 0]
+
+    def rows(self):
+        """
+        Iterate ledger rows in order
+
+        Yields:
+            tuple: (timestamp, user_id, team, source, points)
+        """
+        for i in range(len(self.points)):
+            yield (self.timestamps[i],
+                   self.users[self.user_indices[i]],
+                   self.team_names[self.teams[i]],
+                   SOURCES[self.sources[i]],
+                   self.points[i])
+
+    def copy(self):
+        """
+        Independent copy of the ledger (the columns are copied as raw memory)
+        Lets another thread read a finished round while this one is cleared
+
+        Returns:
+            ContributionLedger: Copy
+        """
+        other = ContributionLedger(self.team_names)
+        other.timestamps = self.timestamps[:]
+        other.user_indices = self.user_indices[:]
+        other.teams = self.teams[:]
+        other.sources = self.sources[:]
+        other.points = self.points[:]
+        other.users = list(self.users)
+        other._user_index = dict(self._user_index)
+        other._open_rows = dict(self._open_rows)
+        other.team_totals = self.team_totals[:]
+        other.user_team_totals = [totals[:] for totals in self.user_team_totals]
+        return other
+
+    def memory_bytes(self):
+        """Approximate memory used by the row columns and aggregates"""
+        columns = (self.timestamps, self.user_indices, self.teams, self.sources,
+                   self.points, self.team_totals, *self.user_team_totals)
+        return sum(column.buffer_info()[1] * column.itemsize for column in columns)
@@ -5,18 +5,29 @@ Contains modular animation effects that can be applied to bubbles
 
 from PyQt6.QtCore import (QPropertyAnimation, QEasingCurve, QPoint,
                           QRect, QSequentialAnimationGroup,
-                          QParallelAnimationGroup, QTimer, pyqtProperty)
+                          QParallelAnimationGroup, pyqtProperty)
 from PyQt6.QtGui import QColor, QPainter, QRadialGradient, QPen, QBrush
 from PyQt6.QtWidgets import QGraphicsOpacityEffect
+from clock import REAL_CLOCK
 import random
 import math
 
 
+def _clock_for(widget, clock):
+    """Clock that starts a widget's animations: the given one, else the widget's own"""
+    return clock or getattr(widget, 'clock', None) or REAL_CLOCK
+
+
 class BubbleEffects:
-    """Collection of animation effects for bubbles"""
+    """
+    Collection of animation effects for bubbles
+
+    Every effect takes an optional clock (default: widget.clock, a
+    BubbleWidget's injected clock, else the real clock).
+    """
 
     @staticmethod
-    def fade_in_out(widget, duration=2000):
+    def fade_in_out(widget, duration=2000, clock=None):
         """Simple fade in and fade out effect"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -48,12 +59,12 @@ class BubbleEffects:
         anim_group.addAnimation(fade_out)
 
         anim_group.finished.connect(widget.deleteLater)
-        anim_group.start()
+        _clock_for(widget, clock).start_animation(anim_group)
 
         return anim_group
 
     @staticmethod
-    def sparkle_zoom(widget, duration=4000):
+    def sparkle_zoom(widget, duration=4000, clock=None):
         """Zoom in with sparkle effect - DRAMATIC for gifts!"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -108,12 +119,12 @@ class BubbleEffects:
         BubbleEffects._add_sparkles(widget, duration)
 
         anim_group.finished.connect(widget.deleteLater)
-        anim_group.start()
+        _clock_for(widget, clock).start_animation(anim_group)
 
         return anim_group
 
     @staticmethod
-    def slide_bounce(widget, duration=3000):
+    def slide_bounce(widget, duration=3000, clock=None):
         """Slide from side with bounce effect - perfect for comments"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -171,12 +182,12 @@ class BubbleEffects:
         anim_group.addAnimation(fade_out)
 
         anim_group.finished.connect(widget.deleteLater)
-        anim_group.start()
+        _clock_for(widget, clock).start_animation(anim_group)
 
         return anim_group
 
     @staticmethod
-    def float_away(widget, duration=2500):
+    def float_away(widget, duration=2500, clock=None):
         """Float upward and fade away - perfect for shares"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -209,12 +220,12 @@ class BubbleEffects:
         anim_group.addAnimation(fade_anim)
 
         anim_group.finished.connect(widget.deleteLater)
-        anim_group.start()
+        _clock_for(widget, clock).start_animation(anim_group)
 
         return anim_group
 
     @staticmethod
-    def heart_pulse(widget, duration=3500):
+    def heart_pulse(widget, duration=3500, clock=None):
         """Pulsing heart effect - perfect for follows"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -261,12 +272,12 @@ class BubbleEffects:
         anim_group.addAnimation(fade_out)
 
         anim_group.finished.connect(widget.deleteLater)
-        anim_group.start()
+        _clock_for(widget, clock).start_animation(anim_group)
 
         return anim_group
 
     @staticmethod
-    def quick_pop(widget, duration=1500):
+    def quick_pop(widget, duration=1500, clock=None):
         """Quick pop in and out - perfect for likes"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -303,12 +314,12 @@ class BubbleEffects:
         anim_group.addAnimation(opacity_anim)
 
         anim_group.finished.connect(widget.deleteLater)
-        anim_group.start()
+        _clock_for(widget, clock).start_animation(anim_group)
 
         return anim_group
 
     @staticmethod
-    def firework_explosion(widget, duration=2000):
+    def firework_explosion(widget, duration=2000, clock=None):
         """Firework explosion effect"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -323,12 +334,12 @@ class BubbleEffects:
         fade_anim.setEndValue(0)
 
         fade_anim.finished.connect(widget.deleteLater)
-        fade_anim.start()
+        _clock_for(widget, clock).start_animation(fade_anim)
 
         return fade_anim
 
     @staticmethod
-    def rainbow_rotate(widget, duration=3000):
+    def rainbow_rotate(widget, duration=3000, clock=None):
         """Rainbow gradient with rotation"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -359,12 +370,12 @@ class BubbleEffects:
         fade_seq.addAnimation(fade_out)
 
         fade_seq.finished.connect(widget.deleteLater)
-        fade_seq.start()
+        _clock_for(widget, clock).start_animation(fade_seq)
 
         return fade_seq
 
     @staticmethod
-    def shake_vibrate(widget, duration=2000):
+    def shake_vibrate(widget, duration=2000, clock=None):
         """Shake and vibrate effect"""
         original_pos = widget.pos()
         shake_intensity = 10
@@ -402,12 +413,12 @@ class BubbleEffects:
         anim_group.addAnimation(fade_out)
 
         anim_group.finished.connect(widget.deleteLater)
-        anim_group.start()
+        _clock_for(widget, clock).start_animation(anim_group)
 
         return anim_group
 
     @staticmethod
-    def spiral_in(widget, duration=2500):
+    def spiral_in(widget, duration=2500, clock=None):
         """Spiral in from corner"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -465,7 +476,7 @@ class BubbleEffects:
         parallel.addAnimation(fade_seq)
 
         parallel.finished.connect(widget.deleteLater)
-        parallel.start()
+        _clock_for(widget, clock).start_animation(parallel)
 
         return parallel
 
@@ -485,7 +496,7 @@ class BubbleEffects:
 
 
     @staticmethod
-    def bounce_in(widget, duration=2500):
+    def bounce_in(widget, duration=2500, clock=None):
         """Bounce in from top with physics"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -522,12 +533,12 @@ class BubbleEffects:
         anim_group.addAnimation(fade_anim)
 
         anim_group.finished.connect(widget.deleteLater)
-        anim_group.start()
+        _clock_for(widget, clock).start_animation(anim_group)
 
         return anim_group
 
     @staticmethod
-    def rotate_zoom(widget, duration=3000):
+    def rotate_zoom(widget, duration=3000, clock=None):
         """Rotate while zooming in"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -566,12 +577,12 @@ class BubbleEffects:
         anim_group.addAnimation(opacity_anim)
 
         anim_group.finished.connect(widget.deleteLater)
-        anim_group.start()
+        _clock_for(widget, clock).start_animation(anim_group)
 
         return anim_group
 
     @staticmethod
-    def wave_slide(widget, duration=3000):
+    def wave_slide(widget, duration=3000, clock=None):
         """Slide in with wave motion"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -651,13 +662,13 @@ class BubbleEffects:
         parallel.addAnimation(fade_seq)
 
         parallel.finished.connect(widget.deleteLater)
-        parallel.start()
+        _clock_for(widget, clock).start_animation(parallel)
 
         return parallel
 
 
     @staticmethod
-    def bounce_cascade(widget, duration=3000):
+    def bounce_cascade(widget, duration=3000, clock=None):
         """Professional bounce cascade effect - PREMIUM!"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -735,12 +746,12 @@ class BubbleEffects:
         parallel.addAnimation(opacity_anim)
 
         parallel.finished.connect(widget.deleteLater)
-        parallel.start()
+        _clock_for(widget, clock).start_animation(parallel)
 
         return parallel
 
     @staticmethod
-    def explosion_particles(widget, duration=5000):
+    def explosion_particles(widget, duration=5000, clock=None):
         """Particle explosion effect - PREMIUM!"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -823,12 +834,12 @@ class BubbleEffects:
         parallel.addAnimation(opacity_anim)
 
         parallel.finished.connect(widget.deleteLater)
-        parallel.start()
+        _clock_for(widget, clock).start_animation(parallel)
 
         return parallel
 
     @staticmethod
-    def screen_takeover(widget, duration=8000):
+    def screen_takeover(widget, duration=8000, clock=None):
         """MEGA effect - takes over screen! PREMIUM!"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -916,12 +927,12 @@ class BubbleEffects:
         parallel.addAnimation(opacity_anim)
 
         parallel.finished.connect(widget.deleteLater)
-        parallel.start()
+        _clock_for(widget, clock).start_animation(parallel)
 
         return parallel
 
     @staticmethod
-    def neon_glow(widget, duration=3500):
+    def neon_glow(widget, duration=3500, clock=None):
         """Neon glow pulse effect - PREMIUM!"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -935,12 +946,12 @@ class BubbleEffects:
         fade_in.setKeyValueAt(1, 0)
 
         fade_in.finished.connect(widget.deleteLater)
-        fade_in.start()
+        _clock_for(widget, clock).start_animation(fade_in)
 
         return fade_in
 
     @staticmethod
-    def matrix_rain(widget, duration=4000):
+    def matrix_rain(widget, duration=4000, clock=None):
         """Matrix-style digital rain effect - PREMIUM!"""
         opacity_effect = QGraphicsOpacityEffect(widget)
         widget.setGraphicsEffect(opacity_effect)
@@ -1006,7 +1017,7 @@ class BubbleEffects:
         parallel.addAnimation(opacity_anim)
 
         parallel.finished.connect(widget.deleteLater)
-        parallel.start()
+        _clock_for(widget, clock).start_animation(parallel)
 
         return parallel
 
@@ -5,11 +5,20 @@ Allows configuring sounds for all TikTok events with on/off toggle
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QCheckBox, QGroupBox, QFileDialog,
-                             QScrollArea, QFrame)
+                             QScrollArea, QFrame, QComboBox, QSpinBox)
 from PyQt6.QtCore import pyqtSignal
+import config
 import json
 import os
 
+# What happens when the sound triggers again while it is still playing
+POLICY_LABELS = {
+    'drop': 'Lewati',     # Ignore the new trigger
+    'queue': 'Antri',     # Play after the current one (max N waiting)
+    'coalesce': 'Gabung', # At most one play per N ms
+    'restart': 'Ulang',   # Stop the current one, play again
+}
+
 
 class EventSoundWidget(QWidget):
     """
@@ -37,8 +46,14 @@ class EventSoundWidget(QWidget):
             'gift': {'enabled': False, 'file': 'sounds/gift.mp3', 'label': '🎁 Gift'},
         }
 
+        # Scheduling policy per event (see audio_mixer.SoundScheduler)
+        for event_type, settings in self.sound_settings.items():
+            settings.update(config.SOUND_POLICY_DEFAULTS.get(event_type, config.SOUND_POLICY_FALLBACK))
+
         self.checkboxes = {}
         self.file_labels = {}
+        self.policy_combos = {}
+        self.policy_spins = {}
 
         self._setup_ui()
         self._load_settings()
@@ -53,7 +68,9 @@ class EventSoundWidget(QWidget):
         layout.addWidget(title)
 
         # Info
-        info = QLabel("Atur suara untuk setiap event TikTok.\nOn/Off toggle dan pilih file MP3 kustom.")
+        info = QLabel("Atur suara untuk setiap event TikTok.\nOn/Off toggle dan pilih file MP3 kustom.\n"
+                      "Mode: apa yang terjadi jika event datang lagi saat suaranya masih diputar "
+                      "(Lewati / Antri maks N / Gabung 1x per N ms / Ulang).")
         info.setStyleSheet("color: #aaa; font-size: 11px;")
         info.setWordWrap(True)
         layout.addWidget(info)
@@ -178,8 +195,66 @@ class EventSoundWidget(QWidget):
         """)
         layout.addWidget(browse_btn, 1)
 
+        # Scheduling policy + its parameter (queue depth or coalesce interval)
+        policy_combo = QComboBox()
+        for policy in config.SOUND_POLICIES:
+            policy_combo.addItem(POLICY_LABELS[policy], policy)
+        policy_combo.setStyleSheet("font-size: 10px;")
+        self.policy_combos[event_type] = policy_combo
+        layout.addWidget(policy_combo, 1)
+
+        policy_spin = QSpinBox()
+        policy_spin.setStyleSheet("font-size: 10px;")
+        self.policy_spins[event_type] = policy_spin
+        layout.addWidget(policy_spin, 1)
+
+        self._show_policy(event_type)
+        policy_combo.currentIndexChanged.connect(lambda _, et=event_type: self._on_policy_changed(et))
+        policy_spin.valueChanged.connect(lambda value, et=event_type: self._on_policy_value_changed(et, value))
+
         return row
 
+    def _show_policy(self, event_type):
+        """Show an event's policy in its combo box and spin box"""
+        settings = self.sound_settings[event_type]
+        combo = self.policy_combos[event_type]
+        spin = self.policy_spins[event_type]
+        combo.blockSignals(True)
+        spin.blockSignals(True)
+        combo.setCurrentIndex(max(0, combo.findData(settings['policy'])))
+        if settings['policy'] == 'queue':
+            spin.setRange(1, 20)
+            spin.setSuffix(" antri")
+            spin.setValue(settings['max_queue'])
+            spin.setEnabled(True)
+        elif settings['policy'] == 'coalesce':
+            spin.setRange(20, 5000)
+            spin.setSingleStep(50)
+            spin.setSuffix(" ms")
+            spin.setValue(settings['interval_ms'])
+            spin.setEnabled(True)
+        else:
+            spin.setSuffix("")
+            spin.setEnabled(False)
+        combo.blockSignals(False)
+        spin.blockSignals(False)
+
+    def _on_policy_changed(self, event_type):
+        """Handle policy selection"""
+        settings = self.sound_settings[event_type]
+        settings['policy'] = self.policy_combos[event_type].currentData()
+        if settings['policy'] == 'coalesce' and not settings['interval_ms']:
+            settings['interval_ms'] = 250
+        self._show_policy(event_type)
+
+    def _on_policy_value_changed(self, event_type, value):
+        """Handle queue depth / coalesce interval change"""
+        settings = self.sound_settings[event_type]
+        if settings['policy'] == 'queue':
+            settings['max_queue'] = value
+        elif settings['policy'] == 'coalesce':
+            settings['interval_ms'] = value
+
     def _on_enabled_changed(self, event_type, checked):
         """Handle enable/disable toggle"""
         self.sound_settings[event_type]['enabled'] = checked
@@ -229,6 +304,10 @@ class EventSoundWidget(QWidget):
                     if event_type in self.sound_settings:
                         self.sound_settings[event_type]['enabled'] = settings.get('enabled', False)
                         self.sound_settings[event_type]['file'] = settings.get('file', self.sound_settings[event_type]['file'])
+                        if settings.get('policy') in POLICY_LABELS:
+                            self.sound_settings[event_type]['policy'] = settings['policy']
+                            self.sound_settings[event_type]['max_queue'] = int(settings.get('max_queue', 1))
+                            self.sound_settings[event_type]['interval_ms'] = int(settings.get('interval_ms', 0))
 
                 # Update UI
                 for event_type in self.sound_settings.keys():
@@ -237,6 +316,8 @@ class EventSoundWidget(QWidget):
                     if event_type in self.file_labels:
                         file_name = os.path.basename(self.sound_settings[event_type]['file'])
                         self.file_labels[event_type].setText(file_name)
+                    if event_type in self.policy_combos:
+                        self._show_policy(event_type)
 
                 print(f"[OK] Loaded event sound settings")
                 enabled_count = sum(1 for s in self.sound_settings.values() if s['enabled'])
@@ -1,30 +1,267 @@
 """
 Gift Assignment Widget
-Allows user to assign TikTok gifts to Team A or Team B
+Allows user to assign TikTok gifts to teams
+
+The gift list is a model/view table - only the rows on screen are ever
+painted - and search goes through a prefix/substring index instead of
+walking every row, so the tab stays instant with thousands of gifts.
 """
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QPushButton, QScrollArea, QLineEdit, QRadioButton,
-                             QButtonGroup, QGroupBox)
-from PyQt6.QtCore import Qt, pyqtSignal
+                             QPushButton, QLineEdit, QTableView, QComboBox,
+                             QAbstractItemView, QHeaderView, QStyledItemDelegate)
+from PyQt6.QtCore import Qt, pyqtSignal, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor
+from bisect import bisect_left
+from scoring_rules import DEFAULT_SETTINGS
+import config
 import json
 import os
 
 
+class GiftSearchIndex:
+    """
+    Case-insensitive gift name search
+
+    Prefix queries bisect a sorted name list; substring queries intersect
+    the posting sets of the query's n-grams (n <= 3) and then verify the
+    few candidates left. Results come back in row order.
+    """
+
+    GRAM = 3
+
+    def __init__(self, names):
+        self._names = [name.lower() for name in names]
+        self._sorted = sorted((name, row) for row, name in enumerate(self._names))
+        self._sorted_names = [name for name, _ in self._sorted]
+
+        # n-gram -> rows containing it, for n = 1..GRAM
+        self._grams = {}
+        for row, name in enumerate(self._names):
+            for n in range(1, self.GRAM + 1):
+                for i in range(len(name) - n + 1):
+                    self._grams.setdefault(name[i:i + n], set()).add(row)
+
+    def prefix(self, text):
+        """Rows whose name starts with text (sorted by row)"""
+        text = text.lower()
+        start = bisect_left(self._sorted_names, text)
+        rows = []
+        for name, row in self._sorted[start:]:
+            if not name.startswith(text):
+                break
+            rows.append(row)
+        rows.sort()
+        return rows
+
+    def search(self, text):
+        """
+        Rows whose name contains text
+
+        Args:
+            text: Query ('' matches everything)
+
+        Returns:
+            list: Row numbers - prefix matches first, then other matches,
+                each in row order
+        """
+        text = text.lower().strip()
+        if not text:
+            return list(range(len(self._names)))
+
+        n = min(self.GRAM, len(text))
+        postings = []
+        for i in range(len(text) - n + 1):
+            rows = self._grams.get(text[i:i + n])
+            if rows is None:
+                return []
+            postings.append(rows)
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+
+        prefix = self.prefix(text)
+        candidates.difference_update(prefix)
+        names = self._names
+        return prefix + [row for row in sorted(candidates) if text in names[row]]
+
+
+class GiftAssignmentModel(QAbstractTableModel):
+    """
+    Gifts and their team assignment
+
+    Holds every gift; only the rows passing the current search are exposed
+    to the view (set_visible_rows). Edits go straight into the shared
+    assignments dict.
+    """
+
+    COLUMNS = ("Gift", "Coins", "Poin", "Team")
+    TEAM_COLUMN = 3
+
+    def __init__(self, assignments, teams, points_per_coin, parent=None):
+        super().__init__(parent)
+        self.assignments = assignments  # {gift_name: team} (shared with the widget)
+        self.teams = tuple(teams)
+        self.points_per_coin = points_per_coin
+        self.gifts = []
+        self._rows = []  # Visible gift indices
+
+    def set_gifts(self, gifts):
+        """Replace the gift list (dicts with 'name' and 'coins'), all rows visible"""
+        self.beginResetModel()
+        self.gifts = gifts
+        self._rows = list(range(len(gifts)))
+        self.endResetModel()
+
+    def set_visible_rows(self, rows):
+        """Show only these gift indices (search result)"""
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def set_points_per_coin(self, points_per_coin):
+        """Repaint the points column for a new gift point value"""
+        self.points_per_coin = points_per_coin
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 2), self.index(len(self._rows) - 1, 2))
+
+    def visible_gifts(self):
+        """Names of the gifts currently shown"""
+        return [self.gifts[i]['name'] for i in self._rows]
+
+    def gift_name(self, row):
+        return self.gifts[self._rows[row]]['name']
+
+    def team_for(self, gift_name):
+        return self.assignments.get(gift_name, self.teams[0])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() == self.TEAM_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        gift = self.gifts[self._rows[index.row()]]
+        column = index.column()
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column == 0:
+                return gift['name']
+            if column == 1:
+                return f"{gift['coins']:,}"
+            if column == 2:
+                return f"{gift['coins'] * self.points_per_coin:,}"
+            if column == self.TEAM_COLUMN:
+                team = self.team_for(gift['name'])
+                return team if role == Qt.ItemDataRole.EditRole else f"Team {team}"
+        elif role == Qt.ItemDataRole.ForegroundRole:
+            if column == 1:
+                return QColor('#FFD700')
+            if column == 2:
+                return QColor('#4CAF50')
+            if column == self.TEAM_COLUMN:
+                team = self.team_for(gift['name'])
+                if team in self.teams:
+                    return QColor(config.TEAM_COLORS[self.teams.index(team)])
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if (role != Qt.ItemDataRole.EditRole or not index.isValid()
+                or index.column() != self.TEAM_COLUMN or value not in self.teams):
+            return False
+        self.assignments[self.gift_name(index.row())] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def assign(self, gift_names, team):
+        """
+        Bulk assign - one pass over the assignments, one repaint
+
+        Args:
+            gift_names: Gifts to assign
+            team: Team name
+        """
+        for name in gift_names:
+            self.assignments[name] = team
+        self.refresh_teams()
+
+    def assign_round_robin(self, gift_names):
+        """Spread gifts over all teams in turn (Split)"""
+        for i, name in enumerate(gift_names):
+            self.assignments[name] = self.teams[i % len(self.teams)]
+        self.refresh_teams()
+
+    def refresh_teams(self):
+        """Repaint the team column after the assignments dict changed"""
+        if self._rows:
+            self.dataChanged.emit(self.index(0, self.TEAM_COLUMN),
+                                  self.index(len(self._rows) - 1, self.TEAM_COLUMN))
+
+
+class TeamDelegate(QStyledItemDelegate):
+    """Team column editor: a combo box of team names"""
+
+    def __init__(self, teams, parent=None):
+        super().__init__(parent)
+        self.teams = tuple(teams)
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.addItems(self.teams)
+        # Commit as soon as a team is picked
+        editor.activated.connect(lambda _: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        team = index.data(Qt.ItemDataRole.EditRole)
+        if team in self.teams:
+            editor.setCurrentIndex(self.teams.index(team))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
+
 class GiftAssignmentWidget(QWidget):
     """
     UI for assigning gifts to teams
     """
 
-    assignment_changed = pyqtSignal(dict)  # gift_name -> team ('A' or 'B')
+    assignment_changed = pyqtSignal(dict)  # gift_name -> team ('A', 'B', ...)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, catalog=None, points_per_coin=None):
         super().__init__(parent)
 
-        # Gift assignments: {gift_name: 'A' or 'B'}
+        # GiftCatalog - lists gifts learned from live streams too (optional)
+        self.catalog = catalog
+        self._catalog_version = None  # Catalog version the list was built from
+
+        # Points per coin shown in the table (the live gift point value)
+        self.points_per_coin = (points_per_coin if points_per_coin is not None
+                                else DEFAULT_SETTINGS['gift'])
+
+        # Gift assignments: {gift_name: team}
         self.assignments = {}
+        self.teams = tuple(config.TEAM_NAMES[:config.TEAM_COUNT])
 
-        # Load all TikTok gifts from gift_tiers
+        # Load all TikTok gifts (catalog or gift_tiers)
         self._load_gifts()
 
         # Setup UI
@@ -34,33 +271,40 @@ class GiftAssignmentWidget(QWidget):
         self._load_assignments()
 
     def _load_gifts(self):
-        """Load all TikTok gifts from gift_tiers"""
-        from gift_tiers import TIKTOK_GIFT_VALUES
+        """Load all TikTok gifts from the gift catalog (or gift_tiers without one)"""
+        if self.catalog is not None:
+            self._catalog_version = self.catalog.version
+            self.all_gifts = self.catalog.gifts()
+        else:
+            from gift_tiers import TIKTOK_GIFT_VALUES
 
-        self.all_gifts = []
-        for gift_name, coin_value in TIKTOK_GIFT_VALUES.items():
-            self.all_gifts.append({
-                'name': gift_name,
-                'coins': coin_value
-            })
+            self.all_gifts = [{'name': gift_name, 'coins': coin_value}
+                              for gift_name, coin_value in TIKTOK_GIFT_VALUES.items()]
 
-        # Sort by coin value
-        self.all_gifts.sort(key=lambda x: x['coins'])
+            # Sort by coin value
+            self.all_gifts.sort(key=lambda x: x['coins'])
+
+        self.search_index = GiftSearchIndex([gift['name'] for gift in self.all_gifts])
+
+        # Every gift counts for the first team until assigned elsewhere
+        for gift in self.all_gifts:
+            self.assignments.setdefault(gift['name'], self.teams[0])
 
     def _setup_ui(self):
         """Setup the assignment UI"""
         layout = QVBoxLayout(self)
 
         # Title
-        title = QLabel(f"🎁 Gift Assignment ({len(self.all_gifts)} Gifts)")
-        title.setStyleSheet("font-size: 16px; font-weight: bold; color: white;")
-        layout.addWidget(title)
+        self.title_label = QLabel()
+        self.title_label.setStyleSheet("font-size: 16px; font-weight: bold; color: white;")
+        layout.addWidget(self.title_label)
 
         # Info
-        info = QLabel("Assign each gift to Team A or Team B. Gifts add points based on coin value × 5.")
-        info.setStyleSheet("color: #aaa; font-size: 11px;")
-        info.setWordWrap(True)
-        layout.addWidget(info)
+        self.info_label = QLabel()
+        self.info_label.setStyleSheet("color: #aaa; font-size: 11px;")
+        self.info_label.setWordWrap(True)
+        layout.addWidget(self.info_label)
+        self._update_info()
 
         # Search box
         search_layout = QHBoxLayout()
@@ -73,36 +317,23 @@ class GiftAssignmentWidget(QWidget):
         search_layout.addWidget(self.search_input)
         layout.addLayout(search_layout)
 
-        # Quick assign buttons
+        # Bulk assign buttons
         quick_layout = QHBoxLayout()
-
-        assign_all_a_btn = QPushButton("Assign All → Team A")
-        assign_all_a_btn.clicked.connect(lambda: self._assign_all('A'))
-        assign_all_a_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #FF6B6B;
-                color: white;
-                padding: 5px;
-                border-radius: 3px;
-            }
-            QPushButton:hover { background-color: #FF5252; }
-        """)
-        quick_layout.addWidget(assign_all_a_btn)
-
-        assign_all_b_btn = QPushButton("Assign All → Team B")
-        assign_all_b_btn.clicked.connect(lambda: self._assign_all('B'))
-        assign_all_b_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4ECDC4;
-                color: white;
-                padding: 5px;
-                border-radius: 3px;
-            }
-            QPushButton:hover { background-color: #3DBDB3; }
-        """)
-        quick_layout.addWidget(assign_all_b_btn)
-
-        split_btn = QPushButton("Split 50-50")
+        for i, team in enumerate(self.teams):
+            color = config.TEAM_COLORS[i]
+            assign_btn = QPushButton(f"→ Team {team}")
+            assign_btn.clicked.connect(lambda _, t=team: self._assign_all(t))
+            assign_btn.setStyleSheet(f"""
+                QPushButton {{
+                    background-color: {color};
+                    color: white;
+                    padding: 5px;
+                    border-radius: 3px;
+                }}
+            """)
+            quick_layout.addWidget(assign_btn)
+
+        split_btn = QPushButton("Split Rata")
         split_btn.clicked.connect(self._split_fifty_fifty)
         split_btn.setStyleSheet("""
             QPushButton {
@@ -117,25 +348,30 @@ class GiftAssignmentWidget(QWidget):
 
         layout.addLayout(quick_layout)
 
-        # Scrollable gift list
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setMinimumHeight(400)
-
-        scroll_widget = QWidget()
-        self.gift_list_layout = QVBoxLayout(scroll_widget)
-        self.gift_list_layout.setSpacing(5)
-
-        # Create gift rows
-        self.gift_widgets = []
-        for gift in self.all_gifts:
-            gift_widget = self._create_gift_row(gift)
-            self.gift_widgets.append(gift_widget)
-            self.gift_list_layout.addWidget(gift_widget)
-
-        self.gift_list_layout.addStretch()
-        scroll.setWidget(scroll_widget)
-        layout.addWidget(scroll)
+        # Gift table (only visible rows are painted)
+        self.model = GiftAssignmentModel(self.assignments, self.teams, self.points_per_coin, parent=self)
+        self.model.set_gifts(self.all_gifts)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegateForColumn(GiftAssignmentModel.TEAM_COLUMN,
+                                            TeamDelegate(self.teams, self.table))
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked
+                                   | QAbstractItemView.EditTrigger.SelectedClicked)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        # Fixed widths - ResizeToContents would measure every row
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column, width in ((1, 100), (2, 100), (3, 90)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Fixed)
+            self.table.setColumnWidth(column, width)
+        self.table.setMinimumHeight(400)
+        layout.addWidget(self.table)
+
+        self._update_title()
 
         # Save button
         save_btn = QPushButton("💾 Save Gift Assignment")
@@ -153,114 +389,63 @@ class GiftAssignmentWidget(QWidget):
         """)
         layout.addWidget(save_btn)
 
-    def _create_gift_row(self, gift):
-        """
-        Create a single gift assignment row
+    def _update_title(self):
+        shown = self.model.rowCount()
+        total = len(self.all_gifts)
+        count = f"{total} Gifts" if shown == total else f"{shown}/{total} Gifts"
+        self.title_label.setText(f"🎁 Gift Assignment ({count})")
 
-        Args:
-            gift: Gift dict with 'name' and 'coins'
+    def _update_info(self):
+        self.info_label.setText(f"Assign each gift to a team (double-click the Team column). "
+                                f"Gifts add points based on coin value × {self.points_per_coin}. "
+                                f"Bulk buttons apply to the selected rows, or to every listed gift "
+                                f"if none are selected.")
 
-        Returns:
-            QWidget: Gift row widget
+    def set_points_per_coin(self, points_per_coin):
         """
-        widget = QWidget()
-        widget.gift_data = gift  # Store for filtering
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(5, 5, 5, 5)
-
-        # Gift name
-        name_label = QLabel(gift['name'])
-        name_label.setMinimumWidth(150)
-        name_label.setStyleSheet("color: white; font-weight: bold;")
-        layout.addWidget(name_label)
-
-        # Coin value
-        coins_label = QLabel(f"{gift['coins']:,} coins")
-        coins_label.setMinimumWidth(100)
-        coins_label.setStyleSheet("color: #FFD700;")
-        layout.addWidget(coins_label)
-
-        # Points (coins × 5)
-        points = gift['coins'] * 5
-        points_label = QLabel(f"= {points:,} pts")
-        points_label.setMinimumWidth(100)
-        points_label.setStyleSheet("color: #4CAF50;")
-        layout.addWidget(points_label)
-
-        layout.addStretch()
-
-        # Team selection radio buttons
-        button_group = QButtonGroup(widget)
-
-        radio_a = QRadioButton("Team A")
-        radio_a.setStyleSheet("color: #FF6B6B;")
-        radio_a.toggled.connect(lambda checked: self._on_assignment_changed(gift['name'], 'A', checked))
-        button_group.addButton(radio_a)
-        layout.addWidget(radio_a)
-
-        radio_b = QRadioButton("Team B")
-        radio_b.setStyleSheet("color: #4ECDC4;")
-        radio_b.toggled.connect(lambda checked: self._on_assignment_changed(gift['name'], 'B', checked))
-        button_group.addButton(radio_b)
-        layout.addWidget(radio_b)
-
-        # Store references
-        widget.radio_a = radio_a
-        widget.radio_b = radio_b
-        widget.button_group = button_group
-
-        # Set default to Team A
-        radio_a.setChecked(True)
-
-        # Styling
-        widget.setStyleSheet("""
-            QWidget {
-                background-color: #2b2b2b;
-                border-radius: 5px;
-            }
-            QWidget:hover {
-                background-color: #333333;
-            }
-        """)
+        Show points for a new gift point value (point settings changed)
 
-        return widget
-
-    def _on_assignment_changed(self, gift_name, team, checked):
-        """Handle assignment change"""
-        if checked:
-            self.assignments[gift_name] = team
+        Args:
+            points_per_coin: Points per coin of a gift
+        """
+        if points_per_coin == self.points_per_coin:
+            return
+        self.points_per_coin = points_per_coin
+        self.model.set_points_per_coin(points_per_coin)
+        self._update_info()
+
+    def reload_gifts(self):
+        """Pick up gifts added to or changed in the catalog since the list was built"""
+        if self.catalog is None or self.catalog.version == self._catalog_version:
+            return
+        self._load_gifts()
+        self.model.set_gifts(self.all_gifts)
+        self._filter_gifts(self.search_input.text())
 
     def _filter_gifts(self, search_text):
-        """Filter gift list by search text"""
-        search_text = search_text.lower()
+        """Filter gift list by search text (indexed - no per-row work)"""
+        self.model.set_visible_rows(self.search_index.search(search_text))
+        self._update_title()
 
-        for widget in self.gift_widgets:
-            gift_name = widget.gift_data['name'].lower()
-            if search_text in gift_name:
-                widget.show()
-            else:
-                widget.hide()
+    def _target_gifts(self):
+        """Selected gifts, or every listed gift when nothing is selected"""
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        if rows:
+            return [self.model.gift_name(row) for row in rows]
+        return self.model.visible_gifts()
 
     def _assign_all(self, team):
         """
-        Assign all gifts to a team
+        Assign the selected (or all listed) gifts to a team
 
         Args:
-            team: 'A' or 'B'
+            team: Team name ('A', 'B', ...)
         """
-        for widget in self.gift_widgets:
-            if team == 'A':
-                widget.radio_a.setChecked(True)
-            else:
-                widget.radio_b.setChecked(True)
+        self.model.assign(self._target_gifts(), team)
 
     def _split_fifty_fifty(self):
-        """Split gifts 50-50 between teams"""
-        for i, widget in enumerate(self.gift_widgets):
-            if i % 2 == 0:
-                widget.radio_a.setChecked(True)
-            else:
-                widget.radio_b.setChecked(True)
+        """Split the selected (or all listed) gifts evenly between teams"""
+        self.model.assign_round_robin(self._target_gifts())
 
     def _save_assignments(self):
         """Save assignments to file"""
@@ -286,17 +471,9 @@ class GiftAssignmentWidget(QWidget):
                 with open(filepath, 'r') as f:
                     saved_assignments = json.load(f)
 
-                # Apply saved assignments
-                for widget in self.gift_widgets:
-                    gift_name = widget.gift_data['name']
-                    if gift_name in saved_assignments:
-                        team = saved_assignments[gift_name]
-                        if team == 'A':
-                            widget.radio_a.setChecked(True)
-                        else:
-                            widget.radio_b.setChecked(True)
-
-                self.assignments = saved_assignments
+                # Update in place - the model shares this dict
+                self.assignments.update(saved_assignments)
+                self.model.refresh_teams()
                 print(f"[OK] Loaded {len(saved_assignments)} gift assignments")
 
                 # Note: Do NOT emit here - main window will manually trigger after signal connected
@@ -313,6 +490,6 @@ class GiftAssignmentWidget(QWidget):
             gift_name: Name of the gift
 
         Returns:
-            str: 'A' or 'B', defaults to 'A' if not found
+            str: Team name, defaults to 'A' if not found
         """
         return self.assignments.get(gift_name, 'A')
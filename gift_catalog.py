@@ -0,0 +1,165 @@
+"""
+Gift Catalog
+Every TikTok gift seen on a live stream, keyed by gift_id
+
+Gift events carry the gift's diamond (coin) value, name and image, so the
+catalog fills itself while streaming and is saved to disk - gifts seen in
+earlier sessions are known from the first event. The hard-coded
+TIKTOK_GIFT_VALUES table is only a fallback for gifts that never arrived
+with an id (e.g. the Test tab's simulated gifts).
+"""
+
+from gift_tiers import TIKTOK_GIFT_VALUES
+import config
+import json
+import os
+
+
+class GiftInfo:
+    """One catalog entry"""
+
+    __slots__ = ('gift_id', 'name', 'diamonds', 'image_url')
+
+    def __init__(self, gift_id, name, diamonds, image_url=''):
+        self.gift_id = gift_id
+        self.name = name
+        self.diamonds = diamonds
+        self.image_url = image_url
+
+    def to_dict(self):
+        return {'id': self.gift_id, 'name': self.name,
+                'diamonds': self.diamonds, 'image_url': self.image_url}
+
+
+class GiftCatalog:
+    """
+    gift_id -> GiftInfo, persisted as JSON
+
+    Lookups by id and by name are single dict hits. observe() is called for
+    every gift event; it only allocates when a gift is new or its data
+    changed, and marks the catalog dirty so the caller can save() later.
+    version counts those changes, so views can tell when to reload.
+    """
+
+    FALLBACK_COINS = 1  # Unknown gift without an id or a known name
+
+    def __init__(self, path=None):
+        self.path = path or config.GIFT_CATALOG_FILE
+        self._by_id = {}    # gift_id -> GiftInfo
+        self._by_name = {}  # name -> GiftInfo (latest id seen with that name)
+        self.dirty = False
+        self.version = 0  # Bumped on every change to the gift list
+        self.load()
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def load(self):
+        """Load the catalog file (missing or corrupt file: start empty)"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for entry in data.get('gifts', []):
+                info = GiftInfo(int(entry['id']), entry['name'],
+                                int(entry['diamonds']), entry.get('image_url', ''))
+                self._by_id[info.gift_id] = info
+                self._by_name[info.name] = info
+            self.version += 1
+            print(f"[OK] Loaded {len(self._by_id)} gifts from catalog")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[WARNING] Gift catalog not loaded: {e}")
+
+    def save(self):
+        """Write the catalog if it changed (atomically - temp file + rename)"""
+        if not self.dirty:
+            return
+        data = {
+            'version': 1,
+            'gifts': [info.to_dict() for info in sorted(self._by_id.values(),
+                                                        key=lambda info: (info.diamonds, info.name))],
+        }
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"[WARNING] Gift catalog not saved: {e}")
+
+    def observe(self, gift_id, name, diamonds, image_url=''):
+        """
+        Record a gift seen in a GiftEvent
+
+        Args:
+            gift_id: TikTok gift id (0/None if the event had none)
+            name: Gift name
+            diamonds: Diamond value per gift (0/None if the event had none)
+            image_url: Gift image URL
+
+        Returns:
+            GiftInfo: The catalog entry, or None if the event had no id or value
+        """
+        if not gift_id or not diamonds:
+            return None
+
+        info = self._by_id.get(gift_id)
+        if info is None:
+            info = GiftInfo(gift_id, name, diamonds, image_url or '')
+            self._by_id[gift_id] = info
+            self._by_name[name] = info
+            self.dirty = True
+            self.version += 1
+        elif (info.name != name or info.diamonds != diamonds
+                or (image_url and info.image_url != image_url)):
+            if self._by_name.get(info.name) is info:
+                del self._by_name[info.name]
+            info.name = name
+            info.diamonds = diamonds
+            if image_url:
+                info.image_url = image_url
+            self._by_name[name] = info
+            self.dirty = True
+            self.version += 1
+        return info
+
+    def get(self, gift_id):
+        """Get a gift by id (None if never seen)"""
+        return self._by_id.get(gift_id)
+
+    def get_by_name(self, name):
+        """Get a gift by name (None if never seen)"""
+        return self._by_name.get(name)
+
+    def coins(self, gift_id=None, name=''):
+        """
+        Coin value of one gift
+
+        Args:
+            gift_id: TikTok gift id (preferred)
+            name: Gift name (fallback)
+
+        Returns:
+            int: Coins - catalog by id, catalog by name, built-in table, else 1
+        """
+        info = self._by_id.get(gift_id) or self._by_name.get(name)
+        if info is not None:
+            return info.diamonds
+        return TIKTOK_GIFT_VALUES.get(name, self.FALLBACK_COINS)
+
+    def gifts(self):
+        """
+        All known gifts - the catalog plus built-in names it hasn't seen
+
+        Returns:
+            list: [{'name', 'coins', 'id', 'image_url'}, ...] sorted by coins
+        """
+        gifts = [{'name': info.name, 'coins': info.diamonds, 'id': info.gift_id,
+                  'image_url': info.image_url} for info in self._by_name.values()]
+        for name, coins in TIKTOK_GIFT_VALUES.items():
+            if name not in self._by_name:
+                gifts.append({'name': name, 'coins': coins, 'id': None, 'image_url': ''})
+        gifts.sort(key=lambda gift: (gift['coins'], gift['name']))
+        return gifts
@@ -0,0 +1,225 @@
+"""
+Gift Icons
+Gift artwork downloaded once, decoded off the UI thread, cached by gift_id
+
+A gift's image is fetched the first time the gift is seen, normalized to a
+small PNG in config.GIFT_ICON_DIR and decoded + scaled on a worker thread
+to every icon size the bubble styles use. Later bubbles of the same gift get
+a ready QPixmap from memory - no network, no decoding, no scaling while
+painting. Gifts already in the catalog are decoded from disk at startup.
+"""
+
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QUrl, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtNetwork import QNetworkRequest, QNetworkReply
+from gift_tiers import GIFT_TIERS
+import config
+import os
+
+
+def icon_size(bubble_size):
+    """Icon edge in pixels for a bubble of bubble_size pixels"""
+    return max(16, int(bubble_size * config.GIFT_ICON_SCALE))
+
+
+class _DecodeSignals(QObject):
+    """Carries a finished decode back to the UI thread"""
+    done = pyqtSignal(int, object)  # gift_id, {size: QImage} (empty on failure)
+
+
+class _DecodeJob(QRunnable):
+    """
+    Decode one gift image and scale it to every requested size (worker thread)
+
+    QImage is safe to use off the UI thread; QPixmaps are made by the cache
+    once the images are back.
+    """
+
+    def __init__(self, gift_id, sizes, path, data=None):
+        """
+        Args:
+            gift_id: Gift id
+            sizes: Icon edges in pixels
+            path: Disk cache file (read if data is None, else written)
+            data: Freshly downloaded image bytes
+        """
+        super().__init__()
+        self.gift_id = gift_id
+        self.sizes = sizes
+        self.path = path
+        self.data = data
+        self.signals = _DecodeSignals()
+
+    def run(self):
+        images = {}
+        try:
+            if self.data is None:
+                image = QImage(self.path)
+            else:
+                image = QImage.fromData(self.data)
+                if not image.isNull():
+                    image = self._scaled(image, config.GIFT_ICON_SOURCE_SIZE)
+                    temp_path = self.path + '.tmp'
+                    if image.save(temp_path, 'PNG'):
+                        os.replace(temp_path, self.path)
+
+            if not image.isNull():
+                image = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+                for size in self.sizes:
+                    images[size] = self._scaled(image, size)
+        except OSError as e:
+            print(f"[WARNING] Gift icon {self.gift_id} not cached: {e}")
+        self.signals.done.emit(self.gift_id, images)
+
+    @staticmethod
+    def _scaled(image, size):
+        if image.width() == size and image.height() == size:
+            return image
+        return image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                            Qt.TransformationMode.SmoothTransformation)
+
+
+class GiftIconCache(QObject):
+    """
+    (gift_id, icon size) -> QPixmap, backed by one PNG per gift on disk
+
+    pixmap() is a dict hit and never blocks; a gift that isn't ready yet
+    returns None and icon_ready(gift_id) fires once it is.
+    """
+
+    icon_ready = pyqtSignal(int)  # gift_id
+
+    def __init__(self, network_manager, cache_dir=None, parent=None):
+        """
+        Args:
+            network_manager: Shared QNetworkAccessManager (UI thread)
+            cache_dir: Disk cache directory (default config.GIFT_ICON_DIR)
+            parent: QObject parent
+        """
+        super().__init__(parent)
+        self.network_manager = network_manager
+        self.cache_dir = cache_dir or config.GIFT_ICON_DIR
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(config.GIFT_ICON_DECODE_THREADS)
+
+        # Icon sizes for the gift tiers until set_bubble_sizes() says otherwise
+        self._sizes = tuple(sorted({icon_size(tier['size']) for tier in GIFT_TIERS.values()}))
+        self._pixmaps = {}   # (gift_id, size) -> QPixmap
+        self._urls = {}      # gift_id -> image URL (every gift asked for)
+        self._pending = set()  # gift_ids being downloaded or decoded
+        self._failed = set()   # gift_ids whose image couldn't be fetched this session
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError as e:
+            print(f"[WARNING] Gift icon folder not created: {e}")
+
+    def _path(self, gift_id):
+        return os.path.join(self.cache_dir, f"{gift_id}.png")
+
+    def set_bubble_sizes(self, bubble_sizes):
+        """
+        Render icons for these gift bubble sizes (call when bubble settings change)
+
+        Args:
+            bubble_sizes: Gift bubble edges in pixels (one per tier or a single override)
+        """
+        sizes = tuple(sorted({icon_size(size) for size in bubble_sizes}))
+        if sizes == self._sizes:
+            return
+        self._sizes = sizes
+        loaded = {gift_id for gift_id, _ in self._pixmaps}
+        self._pixmaps.clear()
+        for gift_id in loaded:
+            self.request(gift_id, self._urls.get(gift_id, ''))
+
+    def pixmap(self, gift_id, bubble_size):
+        """
+        Ready icon for a gift bubble
+
+        Args:
+            gift_id: Gift id
+            bubble_size: Bubble edge in pixels
+
+        Returns:
+            QPixmap: The icon, or None if it isn't cached (yet)
+        """
+        return self._pixmaps.get((gift_id, icon_size(bubble_size)))
+
+    def request(self, gift_id, image_url):
+        """
+        Make sure a gift's icon is (or will be) in memory
+
+        Cheap to call on every gift event: a cached, pending or failed gift
+        returns immediately.
+
+        Args:
+            gift_id: Gift id (0/None: nothing to do)
+            image_url: Gift image URL (used only if the disk cache misses)
+        """
+        if not gift_id:
+            return
+        if image_url:
+            self._urls[gift_id] = image_url
+        if (gift_id in self._pending or gift_id in self._failed
+                or (gift_id, self._sizes[0]) in self._pixmaps):
+            return
+
+        path = self._path(gift_id)
+        if os.path.exists(path):
+            self._pending.add(gift_id)
+            self._start_decode(_DecodeJob(gift_id, self._sizes, path))
+        elif image_url and image_url.startswith('http'):
+            self._pending.add(gift_id)
+            self._download(gift_id, image_url)
+
+    def warmup(self, catalog):
+        """
+        Preload icons for every catalog gift (disk hits decode, misses download)
+
+        Args:
+            catalog: GiftCatalog
+        """
+        count = 0
+        for gift in catalog.gifts():
+            if gift['id']:
+                self.request(gift['id'], gift['image_url'])
+                count += 1
+        if count:
+            print(f"[OK] Preloading {count} gift icons")
+
+    def _download(self, gift_id, image_url):
+        request = QNetworkRequest(QUrl(image_url))
+        request.setTransferTimeout(10000)
+        # Same headers as avatars - TikTok's CDN refuses bare requests
+        request.setRawHeader(b"User-Agent", b"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        request.setRawHeader(b"Referer", b"https://www.tiktok.com/")
+        reply = self.network_manager.get(request)
+        reply.finished.connect(lambda: self._on_downloaded(gift_id, reply))
+
+    def _on_downloaded(self, gift_id, reply):
+        if reply.error() == QNetworkReply.NetworkError.NoError:
+            data = bytes(reply.readAll())
+            self._start_decode(_DecodeJob(gift_id, self._sizes, self._path(gift_id), data))
+        else:
+            print(f"[WARNING] Gift icon {gift_id} download failed: {reply.errorString()}")
+            self._pending.discard(gift_id)
+            self._failed.add(gift_id)
+        reply.deleteLater()
+
+    def _start_decode(self, job):
+        job.signals.done.connect(self._on_decoded)
+        self._pool.start(job)
+
+    def _on_decoded(self, gift_id, images):
+        self._pending.discard(gift_id)
+        if not images:
+            self._failed.add(gift_id)
+            return
+        if set(images) != set(self._sizes):
+            # Sizes changed while decoding - render again from disk
+            self.request(gift_id, self._urls.get(gift_id, ''))
+            return
+        for size, image in images.items():
+            self._pixmaps[(gift_id, size)] = QPixmap.fromImage(image)
+        self.icon_ready.emit(gift_id)
@@ -0,0 +1,141 @@
+"""
+Gift Streaks
+Turns TikTok's repeated combo GiftEvents into one streak per (user, gift)
+
+While a combo is running TikTok re-sends the gift event with a growing
+repeat_count (1, 2, ... 37) and a final one when the streak ends. Each
+event carries the running total, not an increment - scoring every event at
+face value counts a 37-Rose combo as 1 + 2 + ... + 37 Roses. The tracker
+keeps the last count per streak so only the increment is scored, and the
+UI updates one bubble for the whole streak.
+"""
+
+import config
+
+
+class GiftStreak:
+    """A running (or just finished) combo of one gift from one user"""
+
+    __slots__ = ('user_id', 'gift_key', 'gift_name', 'count', 'started_at',
+                 'last_at', 'ended', 'bubble')
+
+    def __init__(self, user_id, gift_key, gift_name, now):
+        self.user_id = user_id
+        self.gift_key = gift_key
+        self.gift_name = gift_name
+        self.count = 0
+        self.started_at = now
+        self.last_at = now
+        self.ended = False
+        self.bubble = None  # Bubble showing this streak (owned by the UI)
+
+
+class GiftStreakTracker:
+    """
+    Active streaks keyed by (user_id, gift_key)
+
+    gift_key is the gift id (the name when there is none). A streak ends with
+    TikTok's streak-end event, or after STREAK_TIMEOUT_SECONDS without an
+    update in case the end event was lost. A streak that timed out keeps its
+    last count for STREAK_FORGET_SECONDS: TikTok delays events, and a late
+    update whose count is still growing belongs to the same combo - only its
+    increment is scored. A count that did not grow starts a new combo.
+    """
+
+    def __init__(self, timeout_seconds=None, forget_seconds=None):
+        self.timeout_seconds = (timeout_seconds if timeout_seconds is not None
+                                else config.GIFT_STREAK_TIMEOUT_SECONDS)
+        self.forget_seconds = (forget_seconds if forget_seconds is not None
+                               else config.GIFT_STREAK_FORGET_SECONDS)
+        self._streaks = {}  # (user_id, gift_key) -> GiftStreak (running or timed out)
+
+    def __len__(self):
+        return len(self._streaks)
+
+    def update(self, user_id, gift_key, gift_name, repeat_count, streak_end, now):
+        """
+        Apply one gift event
+
+        Args:
+            user_id: Sender's TikTok unique id
+            gift_key: Gift id (or name)
+            gift_name: Gift name
+            repeat_count: Running count carried by the event
+            streak_end: True if this event ends the streak (or the gift
+                can't be comboed)
+            now: Monotonic time
+
+        Returns:
+            tuple: (GiftStreak, added) - added is the number of gifts this
+                event adds on top of what was already counted
+        """
+        key = (user_id, gift_key)
+        repeat_count = max(1, repeat_count or 1)
+
+        streak = self._streaks.get(key)
+        if streak is not None:
+            timed_out = streak.ended or now - streak.last_at > self.timeout_seconds
+            # Count went backwards, or a quiet streak's count didn't grow
+            # (a late end event repeats the last count - same combo)
+            if (repeat_count < streak.count
+                    or (timed_out and repeat_count == streak.count and not streak_end)):
+                streak.ended = True
+                del self._streaks[key]
+                streak = None
+
+        if streak is None:
+            streak = GiftStreak(user_id, gift_key, gift_name, now)
+            self._streaks[key] = streak
+
+        streak.ended = False  # Running again if it had timed out
+        added = repeat_count - streak.count
+        streak.count = repeat_count
+        streak.last_at = now
+
+        if streak_end:
+            streak.ended = True
+            del self._streaks[key]
+        return streak, added
+
+    def expire(self, now):
+        """
+        End streaks that went quiet (their end event never came)
+
+        Their last count is kept until forget_seconds, so a late update only
+        scores its increment.
+
+        Args:
+            now: Monotonic time
+
+        Returns:
+            list: GiftStreaks that just ended
+        """
+        ended = []
+        forgotten = []
+        for key, streak in self._streaks.items():
+            quiet = now - streak.last_at
+            if quiet > self.forget_seconds:
+                forgotten.append(key)
+            if quiet > self.timeout_seconds and not streak.ended:
+                streak.ended = True
+                ended.append(streak)
+        for key in forgotten:
+            del self._streaks[key]
+        return ended
+
+    def release_bubble(self, bubble):
+        """
+        Detach a bubble that is being deleted from its streak
+
+        The streak keeps counting; its next update shows a new bubble.
+
+        Args:
+            bubble: The finished bubble
+        """
+        for streak in self._streaks.values():
+            if streak.bubble is bubble:
+                streak.bubble = None
+
+    def clear(self):
+        """Forget every running streak"""
+        self._streaks.clear()
@@ -3,6 +3,8 @@ Gift Tier System
 Different effects and sizes based on gift value
 """
 
+from bisect import bisect_right
+
 # Gift tier configuration
 GIFT_TIERS = {
     'micro': {
@@ -94,6 +96,28 @@ TIKTOK_GIFT_VALUES = {
 }
 
 
+# Tier names ordered by min_value - get_tier_index() bisects their thresholds
+TIER_ORDER = tuple(sorted(GIFT_TIERS, key=lambda name: GIFT_TIERS[name]['min_value']))
+_TIER_MINIMUMS = [GIFT_TIERS[name]['min_value'] for name in TIER_ORDER]
+_DEFAULT_TIER_INDEX = TIER_ORDER.index('small')  # Values outside every tier
+
+
+def get_tier_index(gift_value):
+    """
+    Get the position of a gift value's tier in TIER_ORDER - O(log tiers)
+
+    Args:
+        gift_value: Coin value of the gift
+
+    Returns:
+        int: Index into TIER_ORDER (the 'small' tier if no tier matches)
+    """
+    i = bisect_right(_TIER_MINIMUMS, gift_value) - 1
+    if i >= 0 and gift_value <= GIFT_TIERS[TIER_ORDER[i]]['max_value']:
+        return i
+    return _DEFAULT_TIER_INDEX
+
+
 def get_gift_tier(gift_value):
     """
     Get gift tier based on value
@@ -104,12 +128,7 @@ def get_gift_tier(gift_value):
     Returns:
         dict: Tier configuration
     """
-    for tier_name, tier_config in GIFT_TIERS.items():
-        if tier_config['min_value'] <= gift_value <= tier_config['max_value']:
-            return tier_config
-
-    # Default to small if not found
-    return GIFT_TIERS['small']
+    return GIFT_TIERS[TIER_ORDER[get_tier_index(gift_value)]]
 
 
 def get_gift_value_from_name(gift_name):
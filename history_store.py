@@ -0,0 +1,331 @@
+"""
+History Store
+Persists every PK session and round to a local SQLite database (WAL mode)
+
+Writes are queued and committed by a background writer thread, one
+transaction per batch of queued operations. Reads (history view, top
+supporter queries) use their own connection on the calling thread - WAL
+lets them run while the writer commits.
+"""
+
+from round_recording import RoundRecording
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id          TEXT PRIMARY KEY,
+    creator     TEXT NOT NULL DEFAULT '',
+    started_at  REAL NOT NULL,
+    ended_at    REAL
+);
+
+CREATE TABLE IF NOT EXISTS rounds (
+    id               INTEGER PRIMARY KEY,
+    session_id       TEXT NOT NULL,
+    creator          TEXT NOT NULL DEFAULT '',
+    started_at       REAL,
+    ended_at         REAL NOT NULL,
+    duration_seconds INTEGER,
+    team_names       TEXT NOT NULL,   -- JSON list
+    points           TEXT NOT NULL,   -- JSON list, per team
+    scores           TEXT NOT NULL,   -- JSON list, rounds won after this round
+    winner           TEXT NOT NULL,
+    top_user         TEXT,
+    top_points       INTEGER
+);
+
+-- Per-round totals per (user, team, source)
+CREATE TABLE IF NOT EXISTS contributions (
+    round_id  INTEGER NOT NULL REFERENCES rounds(id),
+    creator   TEXT NOT NULL DEFAULT '',
+    ended_at  REAL NOT NULL,          -- Copied from the round for date-range queries
+    user_id   TEXT NOT NULL,
+    team      TEXT NOT NULL,
+    source    TEXT NOT NULL,
+    points    INTEGER NOT NULL
+);
+
+-- Scoring inputs of a round, for replay (round_recording.RoundRecording.to_bytes())
+CREATE TABLE IF NOT EXISTS round_recordings (
+    round_id  INTEGER PRIMARY KEY REFERENCES rounds(id),
+    data      BLOB NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_rounds_creator_date ON rounds(creator, ended_at);
+CREATE INDEX IF NOT EXISTS idx_rounds_date ON rounds(ended_at);
+-- Covers date-range rankings without touching the table
+CREATE INDEX IF NOT EXISTS idx_contrib_date ON contributions(ended_at, source, user_id, points);
+CREATE INDEX IF NOT EXISTS idx_contrib_creator_date ON contributions(creator, ended_at);
+CREATE INDEX IF NOT EXISTS idx_contrib_user ON contributions(user_id, ended_at);
+CREATE INDEX IF NOT EXISTS idx_contrib_round ON contributions(round_id);
+"""
+
+
+class HistoryStore:
+    """
+    Session and round history in SQLite
+
+    A session starts when the store is opened and ends on close(). Rounds
+    are recorded with record_round() when they end; the contribution ledger
+    is aggregated into per-user totals on the writer thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.session_id = uuid.uuid4().hex
+        self.creator = ''
+
+        # Reader connection (calling thread) - also creates the schema up front
+        self._db = self._connect()
+        self._db.executescript(SCHEMA)
+
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._writer_loop, name='HistoryWriter', daemon=True)
+        self._thread.start()
+
+        self._queue.put(('session', self.session_id, self.creator, time.time()))
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        return db
+
+    # ---- Writes (non-blocking) -----------------------------------------
+
+    def set_creator(self, creator):
+        """
+        Set the TikTok creator the current session and its next rounds belong to
+
+        Args:
+            creator: TikTok username (without @)
+        """
+        self.creator = creator or ''
+        self._queue.put(('creator', self.session_id, self.creator))
+
+    def record_round(self, round_info, ledger, recording=None):
+        """
+        Queue a finished round
+
+        Args:
+            round_info: Dict from PKBattleSystem (started_at, ended_at,
+                duration_seconds, team_names, points, scores, winner)
+            ledger: ContributionLedger for the round - must not be modified
+                afterwards (pass ledger.copy())
+            recording: Optional RoundRecording, same rule as the ledger
+        """
+        self._queue.put(('round', self.session_id, self.creator, dict(round_info), ledger, recording))
+
+    def close(self):
+        """End the session, flush pending writes and stop the writer thread"""
+        self._queue.put(('session_end', self.session_id, time.time()))
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._db.close()
+
+    # ---- Writer thread -------------------------------------------------
+
+    def _writer_loop(self):
+        db = self._connect()
+        running = True
+
+        while running:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Shutdown sentinel is honoured even if a write below fails
+            if None in batch:
+                running = False
+                batch = [op for op in batch if op is not None]
+
+            try:
+                with db:  # One transaction per batch
+                    for op in batch:
+                        self._write(db, op)
+            except Exception as e:
+                # Keep draining - one bad batch must not lose every later round
+                print(f"[WARNING] History write failed: {e}")
+                self._write_each(db, batch)
+
+        db.close()
+
+    def _write_each(self, db, batch):
+        """Retry a failed batch one op per transaction, skipping the ops that fail"""
+        for op in batch:
+            try:
+                with db:
+                    self._write(db, op)
+            except Exception as e:
+                print(f"[WARNING] History write skipped ({op[0]}): {e}")
+
+    def _write(self, db, op):
+        kind = op[0]
+        if kind == 'session':
+            _, session_id, creator, started_at = op
+            db.execute('INSERT OR IGNORE INTO sessions (id, creator, started_at) VALUES (?, ?, ?)',
+                       (session_id, creator, started_at))
+        elif kind == 'creator':
+            _, session_id, creator = op
+            db.execute('UPDATE sessions SET creator = ? WHERE id = ?', (creator, session_id))
+        elif kind == 'session_end':
+            _, session_id, ended_at = op
+            db.execute('UPDATE sessions SET ended_at = ? WHERE id = ?', (ended_at, session_id))
+        elif kind == 'round':
+            self._write_round(db, *op[1:])
+
+    def _write_round(self, db, session_id, creator, info, ledger, recording):
+        # Aggregate the ledger into one row per (user, team, source)
+        totals = {}
+        for _, user_id, team, source, points in ledger.rows():
+            if user_id:
+                key = (user_id, team, source)
+                totals[key] = totals.get(key, 0) + points
+
+        # Anonymous contributions ('') are never the top supporter
+        top = [entry for entry in ledger.top_users(limit=2) if entry[0]]
+        top_user, top_points = top[0] if top else (None, None)
+
+        ended_at = info['ended_at']
+        cursor = db.execute(
+            'INSERT INTO rounds (session_id, creator, started_at, ended_at, duration_seconds, '
+            'team_names, points, scores, winner, top_user, top_points) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (session_id, creator, info.get('started_at'), ended_at, info.get('duration_seconds'),
+             json.dumps(list(info['team_names'])), json.dumps(list(info['points'])),
+             json.dumps(list(info['scores'])), info['winner'], top_user, top_points))
+        round_id = cursor.lastrowid
+
+        db.executemany(
+            'INSERT INTO contributions (round_id, creator, ended_at, user_id, team, source, points) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(round_id, creator, ended_at, user_id, team, source, points)
+             for (user_id, team, source), points in totals.items()])
+
+        if recording is not None:
+            db.execute('INSERT INTO round_recordings (round_id, data) VALUES (?, ?)',
+                       (round_id, recording.to_bytes()))
+
+    # ---- Reads (calling thread) ----------------------------------------
+
+    def count_rounds(self, creator=None):
+        """
+        Count stored rounds
+
+        Args:
+            creator: Only this creator's rounds (None for all)
+
+        Returns:
+            int: Number of rounds
+        """
+        if creator is None:
+            return self._db.execute('SELECT COUNT(*) FROM rounds').fetchone()[0]
+        return self._db.execute('SELECT COUNT(*) FROM rounds WHERE creator = ?', (creator,)).fetchone()[0]
+
+    def fetch_rounds(self, before_id=None, limit=50, creator=None):
+        """
+        Get a page of rounds, newest first (keyset paging - cost doesn't grow with depth)
+
+        Args:
+            before_id: Only rounds with a smaller id (the last id of the previous page)
+            limit: Page size
+            creator: Only this creator's rounds (None for all)
+
+        Returns:
+            list: Round dicts
+        """
+        where = []
+        params = []
+        if before_id is not None:
+            where.append('id < ?')
+            params.append(before_id)
+        if creator is not None:
+            where.append('creator = ?')
+            params.append(creator)
+
+        sql = ('SELECT id, creator, started_at, ended_at, duration_seconds, team_names, points, '
+               'scores, winner, top_user, top_points FROM rounds')
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY id DESC LIMIT ?'
+        params.append(limit)
+
+        rounds = []
+        for row in self._db.execute(sql, params):
+            rounds.append({
+                'id': row[0],
+                'creator': row[1],
+                'started_at': row[2],
+                'ended_at': row[3],
+                'duration_seconds': row[4],
+                'team_names': json.loads(row[5]),
+                'points': json.loads(row[6]),
+                'scores': json.loads(row[7]),
+                'winner': row[8],
+                'top_user': row[9],
+                'top_points': row[10],
+            })
+        return rounds
+
+    def top_contributors(self, since=None, until=None, source=None, creator=None, limit=10):
+        """
+        Biggest contributors over a date range (e.g. "who gifted most this month")
+
+        Args:
+            since: Unix time, inclusive (None for no lower bound)
+            until: Unix time, exclusive (None for no upper bound)
+            source: Only this source ('gift', 'like', ...), None for all
+            creator: Only this creator's rounds (None for all)
+            limit: Max entries
+
+        Returns:
+            list: [(user_id, points), ...] highest first
+        """
+        where = ['ended_at >= ?', 'ended_at < ?']
+        params = [since if since is not None else 0, until if until is not None else float('inf')]
+        if source is not None:
+            where.append('source = ?')
+            params.append(source)
+        if creator is not None:
+            where.append('creator = ?')
+            params.append(creator)
+        params.append(limit)
+
+        sql = ('SELECT user_id, SUM(points) AS total FROM contributions WHERE '
+               + ' AND '.join(where)
+               + ' GROUP BY user_id ORDER BY total DESC LIMIT ?')
+        return self._db.execute(sql, params).fetchall()
+
+    def load_recording(self, round_id):
+        """
+        Get a round's scoring recording
+
+        Returns:
+            RoundRecording: Recording, or None if the round has none
+
+        Raises:
+            ValueError: Stored recording is corrupt
+        """
+        row = self._db.execute('SELECT data FROM round_recordings WHERE round_id = ?',
+                               (round_id,)).fetchone()
+        return RoundRecording.from_bytes(row[0]) if row else None
+
+    def round_contributions(self, round_id):
+        """
+        Get a round's per-user totals
+
+        Returns:
+            list: [(user_id, team, source, points), ...] highest first
+        """
+        return self._db.execute(
+            'SELECT user_id, team, source, points FROM contributions WHERE round_id = ? '
+            'ORDER BY points DESC', (round_id,)).fetchall()
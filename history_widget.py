@@ -0,0 +1,157 @@
+"""
+History Widget
+Past rounds from the history database, loaded page by page while scrolling
+"""
+
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                             QPushButton, QTableView, QAbstractItemView, QHeaderView)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+import config
+import datetime
+import time
+
+
+class RoundHistoryModel(QAbstractTableModel):
+    """
+    Table model over HistoryStore rounds, newest first
+    Qt calls fetchMore() when the view scrolls near the end, so only the
+    pages actually looked at are ever queried
+    """
+
+    COLUMNS = ("Selesai", "Creator", "Poin", "Pemenang", "Skor", "Top Supporter")
+
+    def __init__(self, store, page_size=None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.page_size = page_size or config.HISTORY_PAGE_SIZE
+        self._rounds = []
+        self._exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rounds)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+
+        entry = self._rounds[index.row()]
+        column = index.column()
+        if column == 0:
+            return datetime.datetime.fromtimestamp(entry['ended_at']).strftime('%Y-%m-%d %H:%M')
+        if column == 1:
+            return f"@{entry['creator']}" if entry['creator'] else "-"
+        if column == 2:
+            return " - ".join(f"{points:,}" for points in entry['points'])
+        if column == 3:
+            return entry['winner'] if entry['winner'] == 'DRAW' else f"Team {entry['winner']}"
+        if column == 4:
+            return " - ".join(str(score) for score in entry['scores'])
+        if column == 5:
+            if not entry['top_user']:
+                return "-"
+            return f"@{entry['top_user']} ({entry['top_points']:,})"
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+
+        before_id = self._rounds[-1]['id'] if self._rounds else None
+        page = self.store.fetch_rounds(before_id=before_id, limit=self.page_size)
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if not page:
+            return
+
+        first = len(self._rounds)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rounds.extend(page)
+        self.endInsertRows()
+
+    def reload(self):
+        """Drop loaded pages and start again from the newest round"""
+        self.beginResetModel()
+        self._rounds = []
+        self._exhausted = False
+        self.endResetModel()
+
+
+class HistoryWidget(QWidget):
+    """
+    History tab: round list plus this month's top gifters
+    """
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Setup the history UI"""
+        layout = QVBoxLayout(self)
+
+        # Title
+        title_layout = QHBoxLayout()
+        title = QLabel("📜 Riwayat Ronde")
+        title.setStyleSheet("font-size: 16px; font-weight: bold; color: white;")
+        title_layout.addWidget(title)
+        title_layout.addStretch()
+
+        refresh_btn = QPushButton("🔄 Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        title_layout.addWidget(refresh_btn)
+        layout.addLayout(title_layout)
+
+        # Top gifters this month
+        self.top_label = QLabel("-")
+        self.top_label.setStyleSheet("color: #FFD700; font-size: 12px;")
+        self.top_label.setWordWrap(True)
+        layout.addWidget(self.top_label)
+
+        # Rounds (lazily paged)
+        self.model = RoundHistoryModel(self.store, parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        self._refresh_top()
+
+    def refresh(self):
+        """Reload rounds and the monthly ranking"""
+        self.model.reload()
+        self._refresh_top()
+
+    def _refresh_top(self):
+        """Top gifters since the start of this month"""
+        now = datetime.datetime.now()
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        top = self.store.top_contributors(since=time.mktime(month_start.timetuple()),
+                                          source='gift', limit=5)
+        if not top:
+            self.top_label.setText("🎁 Top gifter bulan ini: -")
+            return
+
+        entries = "  ".join(f"{rank}. @{user_id} ({points:,})"
+                            for rank, (user_id, points) in enumerate(top, start=1))
+        self.top_label.setText(f"🎁 Top gifter bulan ini: {entries}")
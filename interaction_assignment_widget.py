@@ -1,6 +1,6 @@
 """
 Interaction Assignment Widget
-Allows user to assign Like and Comment to Team A or Team B
+Allows user to assign Like, Comment, Share and Follow to Team A or Team B
 """
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
@@ -20,12 +20,17 @@ class InteractionAssignmentWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        # Assignments: {'like': 'A', 'comment': 'B'}
+        # Assignments: {'like': 'A', 'comment': 'B', ...}
         self.assignments = {
             'like': 'A',  # Default
-            'comment': 'A'  # Default
+            'comment': 'A',  # Default
+            'share': 'A',  # Default
+            'follow': 'A'  # Default
         }
 
+        # Radio buttons for share/follow: {interaction: (radio_a, radio_b)}
+        self.extra_radios = {}
+
         self._setup_ui()
         self._load_assignments()
 
@@ -116,6 +121,11 @@ class InteractionAssignmentWidget(QWidget):
 
         layout.addSpacing(10)
 
+        # Share / Follow Assignment (only score when they're worth points - see Custom Points)
+        for interaction, caption in (('share', "🔁 SHARE"), ('follow', "➕ FOLLOW")):
+            layout.addWidget(self._create_team_group(interaction, caption))
+            layout.addSpacing(10)
+
         # Quick buttons
         quick_layout = QHBoxLayout()
 
@@ -167,6 +177,45 @@ class InteractionAssignmentWidget(QWidget):
 
         layout.addStretch()
 
+    def _create_team_group(self, interaction, caption):
+        """Create a Team A/B radio group for an interaction"""
+        group = QGroupBox(caption)
+        group.setStyleSheet("""
+            QGroupBox {
+                font-size: 14px;
+                font-weight: bold;
+                color: white;
+                border: 2px solid #555;
+                border-radius: 8px;
+                margin-top: 10px;
+                padding: 15px;
+            }
+        """)
+        group_layout = QVBoxLayout()
+        button_group = QButtonGroup(group)
+
+        radio_a = QRadioButton("Team A (Merah)")
+        radio_a.setStyleSheet("color: #FF6B6B; font-size: 13px;")
+        radio_a.setChecked(True)
+        radio_a.toggled.connect(lambda checked: self._on_interaction_changed(interaction, 'A', checked))
+        button_group.addButton(radio_a)
+        group_layout.addWidget(radio_a)
+
+        radio_b = QRadioButton("Team B (Teal)")
+        radio_b.setStyleSheet("color: #4ECDC4; font-size: 13px;")
+        radio_b.toggled.connect(lambda checked: self._on_interaction_changed(interaction, 'B', checked))
+        button_group.addButton(radio_b)
+        group_layout.addWidget(radio_b)
+
+        group.setLayout(group_layout)
+        self.extra_radios[interaction] = (radio_a, radio_b)
+        return group
+
+    def _on_interaction_changed(self, interaction, team, checked):
+        """Handle share/follow assignment change"""
+        if checked:
+            self.assignments[interaction] = team
+
     def _on_like_changed(self, team, checked):
         """Handle like assignment change"""
         if checked:
@@ -186,6 +235,9 @@ class InteractionAssignmentWidget(QWidget):
             self.like_b_radio.setChecked(True)
             self.comment_b_radio.setChecked(True)
 
+        for radio_a, radio_b in self.extra_radios.values():
+            (radio_a if team == 'A' else radio_b).setChecked(True)
+
     def _save_assignments(self):
         """Save assignments to file"""
         try:
@@ -224,7 +276,12 @@ class InteractionAssignmentWidget(QWidget):
                     else:
                         self.comment_b_radio.setChecked(True)
 
-                self.assignments = saved_assignments
+                for interaction, (radio_a, radio_b) in self.extra_radios.items():
+                    if interaction in saved_assignments:
+                        (radio_a if saved_assignments[interaction] == 'A' else radio_b).setChecked(True)
+
+                # Older files only have like/comment - keep defaults for the rest
+                self.assignments.update(saved_assignments)
                 print(f"[OK] Loaded interaction assignments")
                 print(f"  Like -> Team {self.assignments['like']}")
                 print(f"  Comment -> Team {self.assignments['comment']}")
@@ -240,7 +297,7 @@ class InteractionAssignmentWidget(QWidget):
         Get which team an interaction is assigned to
 
         Args:
-            interaction_type: 'like' or 'comment'
+            interaction_type: 'like', 'comment', 'share' or 'follow'
 
         Returns:
             str: 'A' or 'B', defaults to 'A' if not found
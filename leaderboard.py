@@ -0,0 +1,169 @@
+"""
+Top Supporters Leaderboard
+Incremental top-N ranking of contributors per team and overall
+"""
+
+from operator import itemgetter
+import heapq
+
+
+class TopNBoard:
+    """
+    Keeps the top N contributors of a stream of point updates
+
+    All totals live in a dict; the current top N sit in an indexed min-heap
+    (heap + key->position map), so an update is O(log N) and the weakest
+    member of the board is always at the root. The sorted ranking is cached
+    and only rebuilt after a change, so repeated reads are O(1).
+    """
+
+    def __init__(self, size=10):
+        self.size = size
+        self.totals = {}      # key -> total points (everyone)
+        self._heap = []       # [total, key] entries of the current top N
+        self._pos = {}        # key -> index in _heap
+        self._ranking = ()    # Cached [(key, total), ...] highest first
+        self._stale = False
+
+    def add(self, key, points):
+        """
+        Add points to a contributor
+
+        Args:
+            key: Contributor id
+            points: Points to add (negative for corrections)
+        """
+        total = self.totals.get(key, 0) + points
+        self.totals[key] = total
+
+        pos = self._pos.get(key)
+        if pos is not None:
+            old_total = self._heap[pos][0]
+            self._heap[pos][0] = total
+            if total >= old_total:
+                self._sift_down(pos)
+            elif len(self.totals) > len(self._heap):
+                # Dropped while others wait outside - one of them may now rank higher
+                self._rebuild()
+            else:
+                self._sift_up(pos)
+        elif len(self._heap) < self.size:
+            self._heap.append([total, key])
+            self._pos[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+        elif self._heap and total > self._heap[0][0]:
+            # Replace the weakest member of the board
+            del self._pos[self._heap[0][1]]
+            self._heap[0] = [total, key]
+            self._pos[key] = 0
+            self._sift_down(0)
+        else:
+            return
+
+        self._stale = True
+
+    def top(self):
+        """
+        Get the ranking
+
+        Returns:
+            tuple: ((key, total), ...) highest first
+        """
+        if self._stale:
+            entries = sorted(self._heap, key=itemgetter(0), reverse=True)
+            self._ranking = tuple((key, total) for total, key in entries if total > 0)
+            self._stale = False
+        return self._ranking
+
+    def clear(self):
+        """Remove everyone"""
+        self.totals.clear()
+        self._heap.clear()
+        self._pos.clear()
+        self._ranking = ()
+        self._stale = False
+
+    def _rebuild(self):
+        """Rebuild the heap from all totals - only needed after a decrease"""
+        best = heapq.nlargest(self.size, self.totals.items(), key=itemgetter(1))
+        self._heap = [[total, key] for key, total in best]
+        heapq.heapify(self._heap)
+        self._pos = {entry[1]: i for i, entry in enumerate(self._heap)}
+
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i][1]] = i
+        self._pos[heap[j][1]] = j
+
+    def _sift_up(self, i):
+        heap = self._heap
+        while i > 0:
+            parent = (i - 1) // 2
+            if heap[i] < heap[parent]:
+                self._swap(i, parent)
+                i = parent
+            else:
+                break
+
+    def _sift_down(self, i):
+        heap = self._heap
+        n = len(heap)
+        while True:
+            smallest = i
+            left = 2 * i + 1
+            right = left + 1
+            if left < n and heap[left] < heap[smallest]:
+                smallest = left
+            if right < n and heap[right] < heap[smallest]:
+                smallest = right
+            if smallest == i:
+                break
+            self._swap(i, smallest)
+            i = smallest
+
+
+class Leaderboard:
+    """
+    Top-N boards per team plus an overall board
+    """
+
+    def __init__(self, teams=('A', 'B'), size=10):
+        self.size = size
+        self.team_boards = {team: TopNBoard(size) for team in teams}
+        self.overall = TopNBoard(size)
+        self.version = 0  # Bumped on every change - lets readers skip unchanged snapshots
+
+    def add(self, user_id, team, points):
+        """
+        Credit a user's contribution
+
+        Args:
+            user_id: TikTok unique id (anonymous contributions are not ranked)
+            team: Team the points went to
+            points: Points awarded
+        """
+        if not user_id or team not in self.team_boards:
+            return
+
+        self.team_boards[team].add(user_id, points)
+        self.overall.add(user_id, points)
+        self.version += 1
+
+    def snapshot(self):
+        """
+        Get all rankings
+
+        Returns:
+            dict: {'overall': ((user_id, points), ...), 'A': (...), 'B': (...), ...}
+        """
+        snapshot = {team: board.top() for team, board in self.team_boards.items()}
+        snapshot['overall'] = self.overall.top()
+        return snapshot
+
+    def clear(self):
+        """Reset all boards"""
+        for board in self.team_boards.values():
+            board.clear()
+        self.overall.clear()
+        self.version += 1
@@ -0,0 +1,164 @@
+"""
+Event Log Panel
+Fixed-capacity ring-buffer log shown through a virtualized list view
+Lines are batched and appended once per frame; full history goes to the app log file
+"""
+
+from PyQt6.QtWidgets import QListView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+import app_logging
+import config
+import time
+
+
+class LogRingModel(QAbstractListModel):
+    """
+    List model backed by a fixed-size ring buffer
+    Oldest lines drop off the top once capacity is reached
+    """
+
+    def __init__(self, capacity=1000, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self._buffer = [None] * capacity
+        self._start = 0   # Index of the oldest line in _buffer
+        self._count = 0   # Number of lines currently stored
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._count
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+
+        row = index.row()
+        if row >= self._count:
+            return None
+        return self._buffer[(self._start + row) % self.capacity]
+
+    def append_lines(self, lines):
+        """
+        Append a batch of lines with one remove + one insert notification
+
+        Args:
+            lines: List of strings
+        """
+        if not lines:
+            return
+
+        # A batch bigger than the buffer only keeps its tail
+        if len(lines) > self.capacity:
+            lines = lines[-self.capacity:]
+
+        # Drop the oldest rows to make room
+        overflow = self._count + len(lines) - self.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            self._start = (self._start + overflow) % self.capacity
+            self._count -= overflow
+            self.endRemoveRows()
+
+        first = self._count
+        self.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+        for line in lines:
+            self._buffer[(self._start + self._count) % self.capacity] = line
+            self._count += 1
+        self.endInsertRows()
+
+    def clear(self):
+        """Remove all lines"""
+        self.beginResetModel()
+        self._buffer = [None] * self.capacity
+        self._start = 0
+        self._count = 0
+        self.endResetModel()
+
+
+class LogPanel(QListView):
+    """
+    Virtualized, rate-limited event log
+
+    post() is cheap: it only queues the line (and writes it to the history
+    file). flush() moves the queued lines into the view and is meant to be
+    called once per display frame.
+    """
+
+    def __init__(self, parent=None, capacity=None, sample_intervals=None):
+        super().__init__(parent)
+
+        self.log_model = LogRingModel(capacity or config.LOG_PANEL_CAPACITY, self)
+        self.setModel(self.log_model)
+
+        # All rows are one line high - lets the view skip measuring every row
+        self.setUniformItemSizes(True)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setWordWrap(False)
+
+        # Lines waiting for the next flush()
+        self._pending = []
+
+        # Per-category sampling: {category: seconds between shown lines}
+        self.sample_intervals = dict(sample_intervals if sample_intervals is not None
+                                     else config.LOG_SAMPLE_INTERVALS)
+        self._last_shown = {}   # category -> monotonic time of last shown line
+        self._suppressed = {}   # category -> lines hidden since then
+
+        # Full history is written by the background log writer ('ui' category)
+        app_logging.start_logging()
+        self._history = app_logging.get_logger('ui')
+
+    def post(self, message, category=None):
+        """
+        Queue a log line
+
+        Args:
+            message: Text to show
+            category: Optional category for sampling (e.g. 'like')
+        """
+        # Full, unsampled history
+        self._history.info(message)
+
+        interval = self.sample_intervals.get(category) if category else None
+        if not interval:
+            self._pending.append(message)
+            return
+
+        now = time.monotonic()
+        if now - self._last_shown.get(category, 0.0) >= interval:
+            suppressed = self._suppressed.pop(category, 0)
+            if suppressed:
+                message = f"{message}  (+{suppressed} more)"
+            self._pending.append(message)
+            self._last_shown[category] = now
+        else:
+            self._suppressed[category] = self._suppressed.get(category, 0) + 1
+
+    def flush(self):
+        """Append queued lines to the view (call once per frame)"""
+        # Surface counters for categories that went quiet mid-burst
+        if self._suppressed:
+            now = time.monotonic()
+            for category, count in list(self._suppressed.items()):
+                if now - self._last_shown.get(category, 0.0) >= self.sample_intervals[category]:
+                    self._pending.append(f"[{category.upper()}] +{count} more")
+                    self._last_shown[category] = now
+                    del self._suppressed[category]
+
+        if not self._pending:
+            return
+
+        lines = self._pending
+        self._pending = []
+
+        # Only follow the tail if the user hasn't scrolled up to read
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+
+        self.log_model.append_lines(lines)
+
+        if at_bottom:
+            self.scrollToBottom()
+
@@ -13,7 +13,8 @@ import config
 from bubble_widget import BubbleWidget
 from tiktok_handler import TikTokHandler, TikTokThread
 from persistent_bubbles import PersistentViewerManager
-from gift_tiers import get_gift_tier, get_gift_value_from_name, TIKTOK_GIFT_VALUES
+from gift_tiers import get_gift_value_from_name, TIKTOK_GIFT_VALUES
+from bubble_styles import DEFAULT_STYLES
 import random
 
 
@@ -500,33 +501,24 @@ class MainWindow(QMainWindow):
 
     def _create_bubble(self, event_data):
         """Create and display a bubble widget"""
-        # Apply gift tier system for gifts
-        if event_data.get('type') == 'gift':
-            gift_name = event_data.get('gift_name', '')
-            gift_value = get_gift_value_from_name(gift_name)
-            tier = get_gift_tier(gift_value)
-
-            # Apply tier settings to event_data (override defaults)
-            event_data['tier_effect'] = tier['effect']
-            event_data['tier_size'] = tier['size']
-            event_data['tier_duration'] = tier['duration']
-            event_data['tier_color'] = tier['color']
-            event_data['tier_border_width'] = tier['border_width']
-            event_data['tier_glow_intensity'] = tier['glow_intensity']
-            event_data['tier_name'] = tier['name']
+        # Resolved style (gift tier by coin value for gifts)
+        event_type = event_data.get('type', 'join')
+        if event_type == 'gift':
+            gift_value = get_gift_value_from_name(event_data.get('gift_name', ''))
             event_data['gift_value'] = gift_value
+            style = DEFAULT_STYLES.resolve('gift', gift_value)
+            self._add_log(f"🎁 {style.tier_name} ({gift_value} coins) - {style.description}")
+        else:
+            style = DEFAULT_STYLES.resolve(event_type)
 
-            self._add_log(f"🎁 {tier['name']} ({gift_value} coins) - {tier['description']}")
-
-        bubble = BubbleWidget(self.bubble_container, event_data)
+        bubble = BubbleWidget(self.bubble_container, event_data, style=style)
         bubble.show()
 
         # Track active bubbles
         self.active_bubbles.append(bubble)
 
-        # Clean up after animation (use tier duration if available)
-        duration = event_data.get('tier_duration') or event_data.get('duration', 3000)
-        QTimer.singleShot(duration + 1000,
+        # Clean up after animation
+        QTimer.singleShot(style.duration + 1000,
                          lambda: self._cleanup_bubble(bubble))
 
     def _cleanup_bubble(self, bubble):
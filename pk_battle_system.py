@@ -3,171 +3,587 @@ PK Battle System - TikTok Style Battle Mode
 Handles scoring, timer, rounds, and win detection
 """
 
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
-from datetime import datetime, timedelta
+from PyQt6.QtCore import QObject, pyqtSignal
+from clock import REAL_CLOCK
+from contribution_ledger import ContributionLedger
+from leaderboard import Leaderboard
+from scoring_rules import ScoringState, compile_rules, rules_from_settings
+from points_timeline import PointsTimeline
+from round_recording import RoundRecording
+from array import array
+import app_logging
+import config
+import math
+
+
+scoring_log = app_logging.get_logger('scoring')
 
 
 class PKBattleSystem(QObject):
     """
-    PK Battle System - Soccer-style round scoring
+    PK Battle System - Soccer-style round scoring for 2-8 teams
+
+    Teams are addressed by index (0 = Team A, 1 = Team B, ...); the scoring
+    API also accepts team names. Points, round wins and per-team stats live in
+    typed arrays indexed by team, so scoring is a single indexed increment.
     """
 
     # Signals
-    points_updated = pyqtSignal(str, int)  # team ('A' or 'B'), new_points
-    score_updated = pyqtSignal(int, int)  # team_a_score, team_b_score
+    # NOTE: Points are NOT signalled per event - a like storm would repaint the
+    # score bar hundreds of times per second. Poll take_points_snapshot() once
+    # per display frame instead.
+    score_updated = pyqtSignal(tuple)  # round wins per team
     timer_updated = pyqtSignal(int)  # seconds_remaining
-    round_won = pyqtSignal(str)  # winning_team ('A' or 'B')
+    round_won = pyqtSignal(str)  # winning team name ('A', 'B', ...)
     round_reset = pyqtSignal()
+    round_warning = pyqtSignal(int)  # seconds_remaining (once per round)
 
-    def __init__(self, round_duration_minutes=60):
+    TICK_INTERVAL_MS = 100  # Display resolution only - not used to count time
+    WARNING_SECONDS = 10
+    POST_ROUND_DELAY_SECONDS = 5  # Show win effects before the next round
+    SNAPSHOT_INTERVAL_SECONDS = 30  # Bounds crash-recovery replay (see battle_journal)
+    MIN_TEAMS = 2
+    MAX_TEAMS = 8
+
+    def __init__(self, round_duration_minutes=60, journal=None, team_count=2, history=None,
+                 clock=None):
         super().__init__()
 
-        # Score tracking (like soccer score: 2-1)
-        self.team_a_score = 0  # How many rounds Team A won
-        self.team_b_score = 0  # How many rounds Team B won
+        # Time source and timers (clock.RealClock, or a VirtualClock for simulations)
+        self.clock = clock or REAL_CLOCK
+
+        if not self.MIN_TEAMS <= team_count <= min(self.MAX_TEAMS, len(config.TEAM_NAMES)):
+            raise ValueError(f"team_count must be {self.MIN_TEAMS}-{self.MAX_TEAMS}, got {team_count}")
+
+        # Teams: index -> name, and name/index -> index for the scoring API
+        self.team_count = team_count
+        self.team_names = tuple(config.TEAM_NAMES[:team_count])
+        self._team_lookup = {name: i for i, name in enumerate(self.team_names)}
+        self._team_lookup.update({i: i for i in range(team_count)})
+
+        # Crash-safe persistence (BattleJournal) - optional
+        self.journal = journal
+        self._next_snapshot_at = 0.0
+
+        # Finished rounds are recorded here (HistoryStore) - optional
+        self.history = history
+        self.round_started_at = None  # Unix time the current round first started
+
+        # Score tracking (like soccer score: 2-1) - rounds won per team
+        self.scores = array('i', [0] * team_count)
 
         # Points tracking (current round)
-        self.team_a_points = 0
-        self.team_b_points = 0
+        self.points = array('q', [0] * team_count)
+        self.contribution_counts = array('q', [0] * team_count)  # Scoring events this round
+        self._points_dirty = True  # Snapshot changed since last UI frame
+        # Scored contributions waiting for the next flush: (team, points, user_id, source)
+        self._pending_contributions = []
 
         # Timer settings
         self.round_duration_minutes = round_duration_minutes
         self.round_duration_seconds = round_duration_minutes * 60
         self.seconds_remaining = self.round_duration_seconds
 
+        # Round clock: while running, time left is deadline - monotonic now
+        self._deadline = None
+        self._time_left = float(self.round_duration_seconds)  # While stopped/paused
+        self._reset_at = None     # Deadline of the post-round delay
+        self._reset_left = None   # Post-round delay left when paused during it
+        self._warning_sent = False
+
+        # Pause accounting
+        self.is_paused = False
+        self._paused_at = None
+        self.pause_count = 0
+        self.total_paused_seconds = 0.0
+
         # Timer
-        self.timer = QTimer()
-        self.timer.timeout.connect(self._on_timer_tick)
+        self.timer = self.clock.timer(self._on_timer_tick, precise=True)
         self.is_running = False
 
-        # Point multiplier (1 coin = 5 points)
-        self.point_multiplier = 5
+        # Scoring rules (gift coins x 5, 1 point per like/comment by default),
+        # compiled into {event_type: scorer}
+        self.scoring_state = ScoringState()
+        self.scoring_rules = rules_from_settings(None)
+        self._scorers = compile_rules(self.scoring_rules, self.scoring_state)
+
+        # Who contributed what this round (append-only, for audits/corrections)
+        self.ledger = ContributionLedger(teams=self.team_names)
+
+        # Top supporters - this round, and across the whole session
+        self.round_leaderboard = Leaderboard(teams=self.team_names, size=10)
+        self.session_leaderboard = Leaderboard(teams=self.team_names, size=10)
+
+        # Points per second over time (momentum chart, end-of-stream report)
+        self.timeline = PointsTimeline(team_count, clock=self.clock.monotonic)
+
+        # Scoring inputs of this round, for replay (see battle_replay) - None disables
+        self.recording = RoundRecording(self.team_names)
+        self._clear_recording()
+
+    def team_index(self, team):
+        """
+        Resolve a team name or index
+
+        Args:
+            team: Team index (0-based) or name ('A', 'B', ...)
+
+        Returns:
+            int: Team index, or None if there's no such team
+        """
+        return self._team_lookup.get(team)
+
+    def round_leader(self):
+        """
+        Get the team with the most points
+
+        Returns:
+            int: Team index, or None when the lead is tied (a draw)
+        """
+        best = max(self.points)
+        leaders = [i for i, points in enumerate(self.points) if points == best]
+        return leaders[0] if len(leaders) == 1 else None
+
+    def _clear_recording(self):
+        """Start a fresh round recording with the current rules"""
+        if self.recording is not None:
+            self.recording.duration_seconds = self.round_duration_seconds
+            self.recording.clear(self.scoring_rules, origin=self.clock.monotonic())
+
+    def _clear_round_points(self):
+        """Zero every team's points and per-round stats"""
+        for i in range(self.team_count):
+            self.points[i] = 0
+            self.contribution_counts[i] = 0
+        self._points_dirty = True
 
     def start_battle(self):
         """Start the PK battle timer"""
-        if not self.is_running:
-            self.is_running = True
-            self.timer.start(1000)  # Tick every second
+        if self.is_paused:
+            self.resume_battle()
+            return
+        if self.is_running or self._reset_at is not None:
+            return
+
+        self.is_running = True
+        self._deadline = self.clock.monotonic() + self._time_left
+        self.timer.start(self.TICK_INTERVAL_MS)
+        if self.round_started_at is None:
+            self.round_started_at = self.clock.time()
 
     def pause_battle(self):
-        """Pause the battle timer"""
+        """
+        Pause the battle timer (also freezes the post-round delay)
+
+        Returns:
+            bool: True if this call paused the battle (False if it was already
+                paused or there is no running round or delay to pause)
+        """
+        if self.is_paused:
+            return False
+
+        now = self.clock.monotonic()
         if self.is_running:
+            self._time_left = max(0.0, self._deadline - now)
+            self._deadline = None
             self.is_running = False
-            self.timer.stop()
+        elif self._reset_at is not None:
+            self._reset_left = max(0.0, self._reset_at - now)
+            self._reset_at = None
+        else:
+            return False
+
+        self.timer.stop()
+        self.is_paused = True
+        self._paused_at = now
+        self.pause_count += 1
+        self.save_snapshot()
+        return True
 
     def resume_battle(self):
         """Resume the battle timer"""
-        if not self.is_running:
+        if not self.is_paused:
+            return
+
+        now = self.clock.monotonic()
+        self._end_pause(now)
+
+        if self._reset_left is not None:
+            self._reset_at = now + self._reset_left
+            self._reset_left = None
+        else:
             self.is_running = True
-            self.timer.start(1000)
+            self._deadline = now + self._time_left
+
+        self.timer.start(self.TICK_INTERVAL_MS)
+
+    def _end_pause(self, now):
+        """Close the current pause and add it to the paused-time total"""
+        self.total_paused_seconds += now - self._paused_at
+        self._paused_at = None
+        self.is_paused = False
+
+    def _seconds_left(self, now=None):
+        """Exact seconds left in the round (float)"""
+        if self._deadline is None:
+            return self._time_left
+        if now is None:
+            now = self.clock.monotonic()
+        return max(0.0, self._deadline - now)
 
     def _on_timer_tick(self):
-        """Called every second"""
-        if self.seconds_remaining > 0:
-            self.seconds_remaining -= 1
-            self.timer_updated.emit(self.seconds_remaining)
+        """
+        Called several times a second
+        Time is read from the monotonic clock, never counted in ticks, so late
+        or coalesced ticks under UI load can't stretch the round
+        """
+        now = self.clock.monotonic()
 
-            # Warning at 10 seconds
-            if self.seconds_remaining == 10:
-                # Could emit a warning signal here for sound effect
-                pass
-        else:
+        # Post-round delay runs on the same clock
+        if self._reset_at is not None:
+            if now >= self._reset_at:
+                self._reset_at = None
+                self._reset_round()
+            return
+
+        if self._deadline is None:
+            return
+
+        if self.journal is not None and now >= self._next_snapshot_at:
+            self.save_snapshot()
+
+        # Whole seconds, rounded up: shows 00:01 until the last second is over
+        remaining = math.ceil(self._seconds_left(now))
+        if remaining != self.seconds_remaining:
+            self.seconds_remaining = remaining
+            self.timer_updated.emit(remaining)
+
+        # Warning fires once even if the tick for exactly 10s was skipped
+        if not self._warning_sent and 0 < remaining <= self.WARNING_SECONDS:
+            self._warning_sent = True
+            self.round_warning.emit(remaining)
+
+        if now >= self._deadline:
             # Time's up! Determine winner
             self._round_ended()
 
     def _round_ended(self):
         """Called when round timer reaches 0"""
-        self.timer.stop()
+        # Points scored before the deadline belong to this round, not the next frame
+        self.flush_contributions()
         self.is_running = False
+        self._deadline = None
+        self._time_left = 0.0
+        if self.seconds_remaining != 0:
+            self.seconds_remaining = 0
+            self.timer_updated.emit(0)
 
         # Determine winner based on points
-        if self.team_a_points > self.team_b_points:
-            winner = 'A'
-            self.team_a_score += 1
-        elif self.team_b_points > self.team_a_points:
-            winner = 'B'
-            self.team_b_score += 1
+        leader = self.round_leader()
+        if leader is not None:
+            winner = self.team_names[leader]
+            self.scores[leader] += 1
         else:
             # Draw - no score change
             winner = 'DRAW'
 
+        scoring_log.info("Round ended: %s points, winner %s (score %s)",
+                         ' - '.join(map(str, self.points)), winner,
+                         ' - '.join(map(str, self.scores)))
+
+        if self.history is not None:
+            self.history.record_round({
+                'started_at': self.round_started_at,
+                'ended_at': self.clock.time(),
+                'duration_seconds': self.round_duration_seconds,
+                'team_names': self.team_names,
+                'points': list(self.points),
+                'scores': list(self.scores),
+                'winner': winner,
+            }, self.ledger.copy(), self.recording.copy() if self.recording is not None else None)
+
         # Emit signals
         if winner != 'DRAW':
             self.round_won.emit(winner)
-            self.score_updated.emit(self.team_a_score, self.team_b_score)
+            self.score_updated.emit(tuple(self.scores))
 
-        # Wait 5 seconds before auto-reset (show win effects)
-        QTimer.singleShot(5000, self._reset_round)
+        # Wait before auto-reset (show win effects) - the tick timer keeps
+        # running and fires the reset off the same monotonic clock
+        self._reset_at = self.clock.monotonic() + self.POST_ROUND_DELAY_SECONDS
+        self.save_snapshot()
 
     def _reset_round(self):
         """Reset points and timer for next round"""
+        # Scored during the post-round delay - lands before the reset, as live events did
+        self.flush_contributions()
+
         # Reset points to 0
-        self.team_a_points = 0
-        self.team_b_points = 0
-        self.points_updated.emit('A', 0)
-        self.points_updated.emit('B', 0)
+        self._clear_round_points()
+        self.scoring_state.clear()
+        self.ledger.clear()
+        self.round_leaderboard.clear()
+        self.timeline.start_round()
+        self.round_started_at = None
+        self._clear_recording()
 
         # Reset timer
+        self._time_left = float(self.round_duration_seconds)
+        self._warning_sent = False
         self.seconds_remaining = self.round_duration_seconds
         self.timer_updated.emit(self.seconds_remaining)
 
         # Emit reset signal
         self.round_reset.emit()
+        self.save_snapshot()
 
         # Auto-start next round
         self.start_battle()
 
-    def add_gift_points(self, team, gift_coins):
+    def set_scoring_rules(self, rules):
+        """
+        Compile and apply a scoring rule set (takes effect immediately,
+        streak and cap progress for the current round are kept)
+
+        Args:
+            rules: List of rule dicts (see scoring_rules)
+
+        Raises:
+            ValueError: Invalid rule set - the current rules stay active
+        """
+        self._scorers = compile_rules(rules, self.scoring_state)
+        self.scoring_rules = rules
+        if self.recording is not None:
+            self.recording.rules_changed(rules)
+
+    def evaluate_event(self, team, event_type, units=1, user_id='', detail='',
+                       seconds_left=None, now=None):
+        """
+        Score an event through the compiled rules without adding the points
+        (streak/cap progress is updated). Pair with apply_contributions().
+
+        Args:
+            team: Team index or name
+            event_type: 'gift', 'like', 'comment', 'share' or 'follow'
+            units: Coins for gifts, count for everything else
+            user_id: Sender's TikTok unique id
+            detail: Gift name, kept in the round recording
+            seconds_left: Round clock to score at (replay; default: live clock)
+            now: Monotonic time to score at (replay; default: now)
+
+        Returns:
+            int: Points the event is worth (0 if nothing)
+        """
+        index = self._team_lookup.get(team)
+        if index is None:
+            return 0
+
+        if now is None:
+            now = self.clock.monotonic()
+        if seconds_left is None:
+            seconds_left = self._seconds_left(now)
+
+        scorer = self._scorers.get(event_type)
+        points = scorer(units, user_id, seconds_left, now) if scorer is not None else 0
+
+        if self.recording is not None:
+            self.recording.record(now, seconds_left, index, event_type, units, user_id, detail, points)
+        return points
+
+    def score_event(self, team, event_type, units=1, user_id='', detail='',
+                    seconds_left=None, now=None):
+        """
+        Score an event through the compiled rules and add the points
+
+        Args:
+            team: Team index or name
+            event_type: 'gift', 'like', 'comment', 'share' or 'follow'
+            units: Coins for gifts, count for everything else
+            user_id: Sender's TikTok unique id
+            detail: Gift name, kept in the round recording
+            seconds_left: Round clock to score at (replay; default: live clock)
+            now: Monotonic time to score at (replay; default: now)
+
+        Returns:
+            int: Points awarded (0 if the event isn't worth anything)
+        """
+        points = self.evaluate_event(team, event_type, units, user_id, detail, seconds_left, now)
+        if points:
+            self._apply_points(team, points, user_id, event_type)
+        return points
+
+    def add_gift_points(self, team, gift_coins, user_id='', gift_name=''):
         """
         Add points to a team based on gift value
 
         Args:
-            team: 'A' or 'B'
+            team: Team index or name
             gift_coins: Coin value of the gift
+            user_id: Sender's TikTok unique id (for the ledger)
+            gift_name: Gift name (for the round recording)
+
+        Returns:
+            int: Points awarded
+        """
+        return self.score_event(team, 'gift', gift_coins, user_id, gift_name)
+
+    def add_interaction_points(self, team, count=1, user_id='', source='like'):
         """
-        points = gift_coins * self.point_multiplier
+        Add points for like/comment/share/follow interactions
 
-        if team == 'A':
-            self.team_a_points += points
-            self.points_updated.emit('A', self.team_a_points)
-        elif team == 'B':
-            self.team_b_points += points
-            self.points_updated.emit('B', self.team_b_points)
+        Args:
+            team: Team index or name
+            count: Number of interactions (default 1)
+            user_id: Sender's TikTok unique id (for the ledger)
+            source: 'like', 'comment', 'share' or 'follow'
+
+        Returns:
+            int: Points awarded
+        """
+        return self.score_event(team, source, count, user_id)
+
+    def adjust_points(self, team, points, user_id=''):
+        """
+        Correct a team's points after the fact
+        Recorded as an 'adjust' ledger row, so the history stays auditable
+
+        Args:
+            team: Team index or name
+            points: Points to add (negative to remove)
+            user_id: User the correction applies to ('' for team-level)
+        """
+        self._apply_points(team, points, user_id, 'adjust')
+
+    def _apply_points(self, team, points, user_id, source):
+        """Add points to a team and record the contribution - O(1)"""
+        index = self._team_lookup.get(team)
+        if index is None:
+            return
+
+        self.points[index] += points
+        self.contribution_counts[index] += 1
+        self._points_dirty = True
+        self.timeline.add(index, points)
+
+        name = self.team_names[index]
+        self.ledger.record(user_id, name, source, points, self.clock.time())
+        if self.journal is not None:
+            self.journal.log_delta(index, points, self._seconds_left())
+        self.round_leaderboard.add(user_id, name, points)
+        self.session_leaderboard.add(user_id, name, points)
+
+    def apply_contributions(self, batch):
+        """
+        Apply a batch of already-scored contributions in one pass
+
+        Rows for the same (team, user, source) are merged first, so the
+        ledger, leaderboards, timeline and journal see one update per distinct
+        contributor rather than one per event, and team totals are written once
+        per batch. Like single events, this only marks the points dirty - the UI
+        picks up the aggregate on its next frame.
+
+        Args:
+            batch: Iterable of (team, points, user_id, source) tuples;
+                team is an index or name, unknown teams are skipped
 
-    def add_interaction_points(self, team, count=1, points_per_interaction=1):
+        Returns:
+            tuple: Points added per team by this batch
         """
-        Add points for like/comment interactions
+        lookup = self._team_lookup
+        merged = {}
+        for team, points, user_id, source in batch:
+            index = lookup.get(team)
+            if index is None or not points:
+                continue
+            key = (index, user_id, source)
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = [points, 1]
+            else:
+                entry[0] += points
+                entry[1] += 1
+
+        deltas = [0] * self.team_count
+        if not merged:
+            return tuple(deltas)
+
+        counts = [0] * self.team_count
+        names = self.team_names
+        timestamp = self.clock.time()
+        for (index, user_id, source), (points, count) in merged.items():
+            deltas[index] += points
+            counts[index] += count
+            name = names[index]
+            self.ledger.record(user_id, name, source, points, timestamp)
+            self.round_leaderboard.add(user_id, name, points)
+            self.session_leaderboard.add(user_id, name, points)
+
+        seconds_left = self._seconds_left()
+        for index, delta in enumerate(deltas):
+            if counts[index]:
+                self.points[index] += delta
+                self.contribution_counts[index] += counts[index]
+                self.timeline.add(index, delta)
+                if self.journal is not None and delta:
+                    self.journal.log_delta(index, delta, seconds_left)
+
+        self._points_dirty = True
+        return tuple(deltas)
+
+    def queue_contribution(self, team, points, user_id, source):
+        """
+        Queue an already-scored contribution (see evaluate_event) for the next flush
+
+        The UI flushes once per frame; the round end flushes first, so points
+        scored before the deadline are always counted in their own round.
 
         Args:
-            team: 'A' or 'B'
-            count: Number of likes/comments (default 1)
-            points_per_interaction: How many points per interaction (default 1)
+            team: Team index or name
+            points: Points awarded
+            user_id: Sender's TikTok unique id
+            source: Event type
         """
-        points = count * points_per_interaction
+        self._pending_contributions.append((team, points, user_id, source))
 
-        if team == 'A':
-            self.team_a_points += points
-            self.points_updated.emit('A', self.team_a_points)
-        elif team == 'B':
-            self.team_b_points += points
-            self.points_updated.emit('B', self.team_b_points)
+    def flush_contributions(self):
+        """
+        Apply every queued contribution as one batch
+
+        Returns:
+            tuple: Points added per team (all zeros if nothing was queued)
+        """
+        if not self._pending_contributions:
+            return (0,) * self.team_count
+        batch = self._pending_contributions
+        self._pending_contributions = []
+        return self.apply_contributions(batch)
+
+    def take_points_snapshot(self):
+        """
+        Consume the latest points if they changed since the last call
+        Meant to be called once per display frame by the UI
+
+        Returns:
+            tuple: Points per team, or None if nothing changed
+        """
+        if not self._points_dirty:
+            return None
+
+        self._points_dirty = False
+        return tuple(self.points)
 
     def get_points_percentage(self):
         """
         Get percentage for bar visualization
 
         Returns:
-            tuple: (team_a_percentage, team_b_percentage)
+            tuple: Percentage per team
         """
-        total = self.team_a_points + self.team_b_points
+        total = sum(self.points)
 
         if total == 0:
-            return (50, 50)  # Equal when no points
+            return (100 / self.team_count,) * self.team_count  # Equal when no points
 
-        team_a_pct = (self.team_a_points / total) * 100
-        team_b_pct = (self.team_b_points / total) * 100
-
-        return (team_a_pct, team_b_pct)
+        return tuple((points / total) * 100 for points in self.points)
 
     def get_timer_display(self):
         """
@@ -191,30 +607,117 @@ class PKBattleSystem(QObject):
         self.round_duration_seconds = minutes * 60
 
         # Reset timer if not running
-        if not self.is_running:
+        if not self.is_running and self._reset_at is None:
+            self._time_left = float(self.round_duration_seconds)
             self.seconds_remaining = self.round_duration_seconds
             self.timer_updated.emit(self.seconds_remaining)
 
+        self.save_snapshot()
+
     def reset_all(self):
         """Reset everything (scores, points, timer)"""
         self.timer.stop()
         self.is_running = False
+        self._deadline = None
+        self._reset_at = None
+        self._reset_left = None
+        self._warning_sent = False
+        self.is_paused = False
+        self._paused_at = None
+        self.pause_count = 0
+        self.total_paused_seconds = 0.0
 
         # Reset scores
-        self.team_a_score = 0
-        self.team_b_score = 0
-        self.score_updated.emit(0, 0)
-
-        # Reset points
-        self.team_a_points = 0
-        self.team_b_points = 0
-        self.points_updated.emit('A', 0)
-        self.points_updated.emit('B', 0)
+        for i in range(self.team_count):
+            self.scores[i] = 0
+        self.score_updated.emit(tuple(self.scores))
+
+        # Reset points (queued contributions were scored against the old state)
+        self._pending_contributions = []
+        self._clear_round_points()
+        self.scoring_state.clear()
+        self.ledger.clear()
+        self.round_leaderboard.clear()
+        self.session_leaderboard.clear()
+        self.timeline.clear()
+        self.round_started_at = None
+        self._clear_recording()
 
         # Reset timer
+        self._time_left = float(self.round_duration_seconds)
         self.seconds_remaining = self.round_duration_seconds
         self.timer_updated.emit(self.seconds_remaining)
 
+        self.save_snapshot()
+
+    def get_persistent_state(self):
+        """
+        Get the state needed to resume this battle after a crash
+
+        Returns:
+            dict: JSON-serializable state
+        """
+        return {
+            'scores': list(self.scores),
+            'points': list(self.points),
+            'seconds_left': self._seconds_left(),
+            'round_duration_seconds': self.round_duration_seconds,
+            # Round finished and scored, waiting for the next round to start
+            'round_over': self._reset_at is not None or self._reset_left is not None,
+        }
+
+    def save_snapshot(self):
+        """Write a full snapshot to the journal (no-op without one)"""
+        if self.journal is None:
+            return
+        self.journal.snapshot(self.get_persistent_state())
+        self._next_snapshot_at = self.clock.monotonic() + self.SNAPSHOT_INTERVAL_SECONDS
+
+    def restore_state(self, state):
+        """
+        Restore a battle recovered from the journal
+        The battle comes back paused - start/resume continues it
+
+        Args:
+            state: Dict from BattleJournal.load()
+        """
+        self.timer.stop()
+        self.is_running = False
+        self._deadline = None
+        self._reset_at = None
+        self._reset_left = None
+
+        duration = state.get('round_duration_seconds') or self.round_duration_seconds
+        self.round_duration_seconds = duration
+        self.round_duration_minutes = duration // 60
+
+        # Teams beyond this battle's team count are dropped
+        scores = state.get('scores', [])
+        for i in range(self.team_count):
+            self.scores[i] = scores[i] if i < len(scores) else 0
+
+        self._clear_round_points()
+        if state.get('round_over'):
+            # Crashed during the post-round delay - the win is already counted
+            self._time_left = float(duration)
+        else:
+            points = state.get('points', [])
+            for i in range(min(self.team_count, len(points))):
+                self.points[i] = points[i]
+            seconds_left = state.get('seconds_left')
+            self._time_left = float(duration if seconds_left is None else seconds_left)
+
+        self._warning_sent = self._time_left <= self.WARNING_SECONDS
+        self.is_paused = True
+        self._paused_at = self.clock.monotonic()
+
+        self.seconds_remaining = math.ceil(self._time_left)
+        self.score_updated.emit(tuple(self.scores))
+        self.timer_updated.emit(self.seconds_remaining)
+
+        # Fold the replayed WAL into a fresh snapshot
+        self.save_snapshot()
+
     def get_current_state(self):
         """
         Get current battle state
@@ -223,12 +726,15 @@ class PKBattleSystem(QObject):
             dict: Current state info
         """
         return {
-            'team_a_score': self.team_a_score,
-            'team_b_score': self.team_b_score,
-            'team_a_points': self.team_a_points,
-            'team_b_points': self.team_b_points,
+            'team_names': self.team_names,
+            'scores': tuple(self.scores),
+            'points': tuple(self.points),
+            'contribution_counts': tuple(self.contribution_counts),
             'seconds_remaining': self.seconds_remaining,
             'is_running': self.is_running,
+            'is_paused': self.is_paused,
+            'pause_count': self.pause_count,
+            'total_paused_seconds': self.total_paused_seconds,
             'timer_display': self.get_timer_display(),
             'percentages': self.get_points_percentage()
         }
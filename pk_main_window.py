@@ -5,7 +5,7 @@ Vertical layout for PK battle with bubble zones
 
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QPushButton, QFrame, QSplitter, QGroupBox,
-                             QTextEdit, QLineEdit, QSpinBox, QSlider, QCheckBox,
+                             QLineEdit, QSpinBox, QSlider, QCheckBox,
                              QTabWidget, QComboBox, QMessageBox)
 import requests
 import subprocess
@@ -16,14 +16,24 @@ from PyQt6.QtNetwork import QNetworkAccessManager
 import config
 from bubble_widget import BubbleWidget
 from pk_battle_system import PKBattleSystem
+from battle_journal import BattleJournal
+from history_store import HistoryStore
+from clock import REAL_CLOCK
+from gift_catalog import GiftCatalog
+from gift_streaks import GiftStreakTracker
+from gift_icons import GiftIconCache
+from bubble_styles import StyleTable
+from history_widget import HistoryWidget
 from photo_manager import DraggablePhoto, PhotoUploadWidget
 from gift_assignment_widget import GiftAssignmentWidget
 from interaction_assignment_widget import InteractionAssignmentWidget
 from bubble_position_widget import BubblePositionWidget
 from event_sound_widget import EventSoundWidget
 from point_settings_widget import PointSettingsWidget
+from scoring_rules import DEFAULT_SETTINGS, rules_from_settings
 from draggable_label import DraggableLabel, DraggableMultiLineLabel
 from sound_manager import SoundManager
+from log_panel import LogPanel
 from tiktok_handler import TikTokHandler, TikTokThread
 import random
 import math
@@ -37,11 +47,24 @@ class PKMainWindow(QMainWindow):
     Vertical layout: TOP bubbles | CENTER battle | BOTTOM bubbles
     """
 
-    def __init__(self):
+    def __init__(self, clock=None):
         super().__init__()
 
+        # Time source for the battle, frame loop and bubbles (VirtualClock in simulations)
+        self.clock = clock or REAL_CLOCK
+
         # Initialize systems
-        self.pk_system = PKBattleSystem(round_duration_minutes=60)
+        # Crash-safe battle state - read what the last run left behind first
+        self.battle_journal = BattleJournal(config.BATTLE_STATE_DIR)
+        recovered_state = self.battle_journal.load()
+        self.history_store = HistoryStore(config.HISTORY_DB)
+        self.pk_system = PKBattleSystem(round_duration_minutes=60, journal=self.battle_journal,
+                                        team_count=config.TEAM_COUNT, history=self.history_store,
+                                        clock=self.clock)
+        # Known gifts by id (values/images learned from live gift events)
+        self.gift_catalog = GiftCatalog()
+        self.gift_streaks = GiftStreakTracker()
+        self._gift_catalog_save_pending = False
         self.sound_manager = SoundManager()
         self.tiktok_handler = TikTokHandler()
         self.tiktok_thread = None
@@ -55,7 +78,9 @@ class PKMainWindow(QMainWindow):
         # Interaction assignment (like/comment)
         self.interaction_assignments = {
             'like': 'A',     # Default: Like goes to Team A
-            'comment': 'A'   # Default: Comment goes to Team A
+            'comment': 'A',  # Default: Comment goes to Team A
+            'share': 'A',
+            'follow': 'A'
         }
 
         # Bubble positions (like/comment bubble placement) - OBSOLETE but kept for compatibility
@@ -66,6 +91,8 @@ class PKMainWindow(QMainWindow):
         
         # Initialize shared network manager for avatar downloads
         self.network_manager = QNetworkAccessManager()
+        # Gift artwork, decoded once per gift and scaled for the gift bubbles
+        self.gift_icons = GiftIconCache(self.network_manager, parent=self)
         
         # Custom Bubble Settings (Duration & Size)
         self.bubble_settings = {
@@ -74,15 +101,13 @@ class PKMainWindow(QMainWindow):
             'gift_size': 150,  # Default 150px (Gifts - Larger)
             'max_bubbles': 100 # Default max bubbles
         }
+        self._rebuild_bubble_styles()
 
         # Event sound settings
         self.event_sound_settings = {}
 
-        # Point settings (custom points per like/comment)
-        self.point_values = {
-            'like': 1,      # Default: 1 point per like
-            'comment': 1    # Default: 1 point per comment
-        }
+        # Point settings (custom points per event, multipliers, combo, cap)
+        self.point_values = dict(DEFAULT_SETTINGS)
 
         # Win sound file paths (customizable by user)
         self.win_sound_files = {
@@ -99,12 +124,75 @@ class PKMainWindow(QMainWindow):
 
         self._show_welcome_message()
 
+        # Gifts seen in earlier sessions get their icons before the first event
+        self.gift_icons.warmup(self.gift_catalog)
+
+        # Display frame loop - consumes battle snapshots at most once per frame
+        self.frame_timer = self.clock.timer(self._on_frame, parent=self, precise=True)
+        self.frame_timer.start(config.FRAME_INTERVAL_MS)
+
+        # Leaderboard is read through a throttled snapshot, not per event
+        self._leaderboard_versions = None
+        self.leaderboard_timer = self.clock.timer(self._refresh_leaderboard, parent=self)
+        self.leaderboard_timer.start(config.LEADERBOARD_REFRESH_MS)
+
         # Create placeholder sounds
         self.sound_manager.create_placeholder_sounds()
 
+        # Offer to resume a battle interrupted by a crash/reboot
+        QTimer.singleShot(0, lambda: self._offer_battle_resume(recovered_state))
+
         # Auto Update Check
         QTimer.singleShot(1000, self.check_for_updates)
 
+    def _offer_battle_resume(self, state):
+        """
+        Ask whether to continue a battle recovered from the journal
+
+        Args:
+            state: Dict from BattleJournal.load(), or None
+        """
+        has_progress = state and (any(state.get('scores', [])) or any(state.get('points', [])))
+        if not has_progress:
+            self.pk_system.save_snapshot()
+            return
+
+        seconds_left = int(state.get('seconds_left') or 0)
+        reply = QMessageBox.question(
+            self,
+            'Resume Battle?',
+            "The previous PK battle was not finished.\n\n"
+            f"Score: {' - '.join(str(score) for score in state.get('scores', []))}\n"
+            f"Points: {' - '.join(f'{points:,}' for points in state['points'])}\n"
+            f"Time left: {seconds_left // 60:02d}:{seconds_left % 60:02d}\n\n"
+            "Resume this battle?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+
+        if reply == QMessageBox.StandardButton.Yes:
+            self.pk_system.restore_state(state)
+            self.pause_btn.setEnabled(True)
+            self.pause_btn.setText("▶️ Resume")
+            self._add_log(f"♻️ Battle restored ({state.get('replayed_deltas', 0):,} logged deltas replayed)")
+        else:
+            # Start clean - the snapshot replaces the old state
+            self.pk_system.save_snapshot()
+
+    def closeEvent(self, event):
+        """Flush battle state to disk before exit"""
+        self.pk_system.flush_contributions()
+        self.battle_journal.close(self.pk_system.get_persistent_state())
+        self.history_store.close()
+        self.gift_catalog.save()
+        latency = self.sound_manager.latency_summary()
+        if latency['count']:
+            print(f"[OK] Sound latency over {latency['count']} plays: "
+                  f"mean {latency['mean_ms']:.1f} ms, p95 {latency['p95_ms']:.1f} ms, "
+                  f"max {latency['max_ms']:.1f} ms")
+        self.sound_manager.shutdown()
+        super().closeEvent(event)
+
     def check_for_updates(self):
         """Check for updates from remote version file"""
         try:
@@ -188,9 +276,11 @@ class PKMainWindow(QMainWindow):
             # Update settings if they exist
             if 'bubble_settings' in settings:
                 self.bubble_settings.update(settings['bubble_settings'])
+                self._rebuild_bubble_styles()
                 
             if 'point_values' in settings:
                 self.point_values.update(settings['point_values'])
+                self.gift_assignment_widget.set_points_per_coin(self.point_values['gift'])
                 
             if 'interaction_assignments' in settings:
                 self.interaction_assignments.update(settings['interaction_assignments'])
@@ -360,7 +450,7 @@ class PKMainWindow(QMainWindow):
         self.photo_b.move(900, 170)
 
         # Progress Bar (show real points, not percentage!)
-        self.progress_bar = PKProgressBar(self.center_pk_view)
+        self.progress_bar = PKProgressBar(self.center_pk_view, team_count=self.pk_system.team_count)
         self.progress_bar.setGeometry(400, 680, 900, 80)
 
     def _create_control_panel(self):
@@ -390,7 +480,8 @@ class PKMainWindow(QMainWindow):
         tabs.addTab(photos_tab, "📸 Photos")
 
         # Tab 4: Gift Assignment
-        self.gift_assignment_widget = GiftAssignmentWidget()
+        self.gift_assignment_widget = GiftAssignmentWidget(catalog=self.gift_catalog,
+                                                           points_per_coin=self.point_values['gift'])
         self.gift_assignment_widget.assignment_changed.connect(self._on_gift_assignment_changed)
         tabs.addTab(self.gift_assignment_widget, "🎁 Gifts")
 
@@ -413,11 +504,19 @@ class PKMainWindow(QMainWindow):
         self.point_settings_widget.point_settings_changed.connect(self._on_point_settings_changed)
         tabs.addTab(self.point_settings_widget, "🎯 Custom Points")
 
-        # Tab 9: Developer Info
+        # Tab 9: Top Supporters
+        leaderboard_tab = self._create_leaderboard_tab()
+        tabs.addTab(leaderboard_tab, "🏅 Top")
+
+        # Tab 10: Round History
+        self.history_widget = HistoryWidget(self.history_store)
+        tabs.addTab(self.history_widget, "📜 History")
+
+        # Tab 11: Developer Info
         developer_tab = self._create_developer_tab()
         tabs.addTab(developer_tab, "👨‍💻 Developer")
 
-        # Tab 9: Simulation
+        # Tab 12: Simulation
         simulation_tab = self._create_simulation_controls()
         tabs.addTab(simulation_tab, "🧪 Test")
 
@@ -426,10 +525,9 @@ class PKMainWindow(QMainWindow):
         # Log
         log_group = QGroupBox("Event Log")
         log_layout = QVBoxLayout()
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setMaximumHeight(200)
-        log_layout.addWidget(self.log_text)
+        self.log_panel = LogPanel()
+        self.log_panel.setMaximumHeight(200)
+        log_layout.addWidget(self.log_panel)
         log_group.setLayout(log_layout)
         layout.addWidget(log_group)
 
@@ -874,23 +972,77 @@ class PKMainWindow(QMainWindow):
     def _on_bubble_duration_changed(self, value):
         """Update bubble duration setting"""
         self.bubble_settings['duration'] = value * 1000 # Convert to ms
+        self._rebuild_bubble_styles()
         self._add_log(f"⏱️ Bubble duration set to {value} seconds")
 
     def _on_bubble_size_changed(self, value):
         """Update bubble size setting"""
         self.bubble_settings['size'] = value
+        self._rebuild_bubble_styles()
         self._add_log(f"📏 Bubble size set to {value} px")
 
     def _on_bubble_gift_size_changed(self, value):
         """Update gift bubble size setting"""
         self.bubble_settings['gift_size'] = value
+        self._rebuild_bubble_styles()
         self._add_log(f"🎁 Gift bubble size set to {value} px")
 
+    def _rebuild_bubble_styles(self):
+        """Resolve every bubble style for the current bubble settings"""
+        self.bubble_styles = StyleTable(self.bubble_settings)
+        self.gift_icons.set_bubble_sizes(self.bubble_styles.gift_sizes())
+
     def _on_max_bubbles_changed(self, value):
         """Update max bubbles setting"""
         self.bubble_settings['max_bubbles'] = value
         self._add_log(f"🔢 Max bubbles limit set to {value}")
 
+    def _create_leaderboard_tab(self):
+        """Create top supporters tab (round per team + whole session)"""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        title = QLabel("🏅 Top Supporters")
+        title.setStyleSheet("font-size: 16px; font-weight: bold; color: white;")
+        layout.addWidget(title)
+
+        self.leaderboard_labels = {}
+        boards = [(name, f"Team {name} - This Round", config.TEAM_COLORS[i])
+                  for i, name in enumerate(self.pk_system.team_names)]
+        boards.append(('session', "Whole Session", "#FFD700"))
+        for key, caption, color in boards:
+            group = QGroupBox(caption)
+            group_layout = QVBoxLayout()
+            label = QLabel("-")
+            label.setStyleSheet(f"color: {color}; font-size: 12px;")
+            label.setWordWrap(True)
+            group_layout.addWidget(label)
+            group.setLayout(group_layout)
+            layout.addWidget(group)
+            self.leaderboard_labels[key] = label
+
+        layout.addStretch()
+        return widget
+
+    def _refresh_leaderboard(self):
+        """Refresh top supporter lists (throttled; skipped when nothing changed)"""
+        round_board = self.pk_system.round_leaderboard
+        session_board = self.pk_system.session_leaderboard
+        versions = (round_board.version, session_board.version)
+        if versions == self._leaderboard_versions:
+            return
+        self._leaderboard_versions = versions
+
+        round_top = round_board.snapshot()
+        session_top = session_board.snapshot()
+        lists = {name: round_top[name] for name in self.pk_system.team_names}
+        lists['session'] = session_top['overall']
+
+        for key, entries in lists.items():
+            lines = [f"{rank}. @{user_id}  {points:,} poin"
+                     for rank, (user_id, points) in enumerate(entries[:5], start=1)]
+            self.leaderboard_labels[key].setText("\n".join(lines) if lines else "-")
+
     def _create_developer_tab(self):
         """Create developer info tab with social media links"""
         widget = QWidget()
@@ -969,16 +1121,17 @@ class PKMainWindow(QMainWindow):
 
     def _connect_signals(self):
         """Connect PK system signals"""
-        self.pk_system.points_updated.connect(self._on_points_updated)
         self.pk_system.score_updated.connect(self._on_score_updated)
         self.pk_system.timer_updated.connect(self._on_timer_updated)
         self.pk_system.round_won.connect(self._on_round_won)
         self.pk_system.round_reset.connect(self._on_round_reset)
+        self.pk_system.round_warning.connect(self._on_round_warning)
 
         self.tiktok_handler.event_received.connect(self._on_tiktok_event)
         self.tiktok_handler.connection_status.connect(self._on_connection_status)
         self.tiktok_handler.error_occurred.connect(self._on_error)
         self.tiktok_handler.log_message.connect(self._add_log)  # Connect log messages
+        self.gift_icons.icon_ready.connect(self._on_gift_icon_ready)
 
     def _apply_theme(self):
         """Apply dark theme"""
@@ -1017,7 +1170,7 @@ class PKMainWindow(QMainWindow):
                 background-color: #333333;
                 color: #888888;
             }
-            QLineEdit, QTextEdit, QSpinBox {
+            QLineEdit, QListView, QSpinBox {
                 background-color: #333333;
                 color: white;
                 border: 1px solid #555555;
@@ -1043,21 +1196,38 @@ class PKMainWindow(QMainWindow):
         """)
 
     # Event Handlers
-    @pyqtSlot(str, int)
-    def _on_points_updated(self, team, points):
-        """Update points display"""
-        if team == 'A':
-            self.points_a_label.setText(f"{points:,} poin")
-        else:
-            self.points_b_label.setText(f"{points:,} poin")
+    def _on_frame(self):
+        """
+        Per-frame UI update
+        Scoring only marks the battle state dirty; labels and the progress bar
+        are refreshed here, so a like storm costs one repaint per frame
+        """
+        # Apply everything scored since the last frame as one batch
+        self.pk_system.flush_contributions()
+
+        snapshot = self.pk_system.take_points_snapshot()
+        if snapshot is not None:
+            # Team A/B have their own labels; every team is on the bar
+            self.points_a_label.setText(f"{snapshot[0]:,} poin")
+            self.points_b_label.setText(f"{snapshot[1]:,} poin")
+
+            # Update progress bar with REAL POINTS (not percentage!)
+            self.progress_bar.set_points(snapshot)
 
-        # Update progress bar with REAL POINTS (not percentage!)
-        self.progress_bar.set_points(self.pk_system.team_a_points, self.pk_system.team_b_points)
+        # Glide the bar toward the latest totals
+        self.progress_bar.advance_frame()
 
-    @pyqtSlot(int, int)
-    def _on_score_updated(self, score_a, score_b):
+        # Append the log lines queued since the last frame
+        self.log_panel.flush()
+
+    @pyqtSlot(tuple)
+    def _on_score_updated(self, scores):
         """Update score display"""
-        self.score_label.setText(f"TEAM A  [{score_a}] - [{score_b}]  TEAM B")
+        names = self.pk_system.team_names
+        if len(scores) == 2:
+            self.score_label.setText(f"TEAM {names[0]}  [{scores[0]}] - [{scores[1]}]  TEAM {names[1]}")
+        else:
+            self.score_label.setText("  ".join(f"{name} [{score}]" for name, score in zip(names, scores)))
 
     @pyqtSlot(int)
     def _on_timer_updated(self, seconds):
@@ -1066,9 +1236,10 @@ class PKMainWindow(QMainWindow):
         secs = seconds % 60
         self.timer_label.setText(f"Time: {minutes:02d}:{secs:02d}")
 
-        # Warning at 10 seconds
-        if seconds == 10:
-            self.sound_manager.play_round_end_warning()
+    @pyqtSlot(int)
+    def _on_round_warning(self, seconds):
+        """Round is about to end"""
+        self.sound_manager.play_round_end_warning()
 
     @pyqtSlot(str)
     def _on_round_won(self, winner):
@@ -1089,7 +1260,7 @@ class PKMainWindow(QMainWindow):
         self._add_log(f"")
         self._add_log(f"[NEW ROUND] Starting fresh round!")
         self._add_log(f"[RESET] Points: 0 - 0")
-        self._add_log(f"[SCORE] Total Score: {self.pk_system.team_a_score} - {self.pk_system.team_b_score} (Accumulated)")
+        self._add_log(f"[SCORE] Total Score: {' - '.join(map(str, self.pk_system.scores))} (Accumulated)")
         self._add_log(f"{'='*50}")
         self._add_log(f"")
 
@@ -1098,12 +1269,15 @@ class PKMainWindow(QMainWindow):
         self.pk_system.start_battle()
         # self.start_btn.setEnabled(False) # Button removed
         self.pause_btn.setEnabled(True)
+        self.pause_btn.setText("⏸️ Pause")
         self._add_log("▶️ PK Battle started!")
 
     def _on_pause_battle(self):
         """Pause/Resume battle"""
-        if self.pk_system.is_running:
-            self.pk_system.pause_battle()
+        if not self.pk_system.is_paused:
+            if not self.pk_system.pause_battle():
+                self._add_log("⏸️ Nothing to pause - battle is not running")
+                return
             self.pause_btn.setText("▶️ Resume")
             self._add_log("⏸️ Battle paused")
         else:
@@ -1237,12 +1411,21 @@ class PKMainWindow(QMainWindow):
     def _on_sound_settings_changed(self, settings):
         """Event sound settings changed"""
         self.event_sound_settings = settings
+        self.sound_manager.preload_event_sounds(settings)
+        self.sound_manager.set_schedule_policies(settings)
         enabled_count = sum(1 for s in settings.values() if s['enabled'])
         self._add_log(f"🔊 Sound settings updated ({enabled_count}/{len(settings)} enabled)")
 
     def _on_point_settings_changed(self, settings):
-        """Point settings changed"""
+        """Point settings changed - recompiled and applied to the running round"""
+        try:
+            self.pk_system.set_scoring_rules(rules_from_settings(settings))
+        except ValueError as e:
+            self._add_log(f"❌ Invalid point settings: {e}")
+            return
+
         self.point_values = settings
+        self.gift_assignment_widget.set_points_per_coin(settings['gift'])
         self._add_log(f"🎯 Custom points updated")
         self._add_log(f"  1 Like = {settings['like']} poin")
         self._add_log(f"  1 Comment = {settings['comment']} poin")
@@ -1257,31 +1440,88 @@ class PKMainWindow(QMainWindow):
         else:
             self._handle_bubble_event(event_data)
 
+    def _score_event(self, team, event_type, units, event_data, detail=''):
+        """
+        Score an event now and queue its points for the next frame's batch
+
+        Returns:
+            int: Points awarded
+        """
+        team_index = self.pk_system.team_index(team)
+        user_id = event_data.get('user_id', '')
+        points = self.pk_system.evaluate_event(team_index, event_type, units, user_id, detail)
+        if points:
+            self.pk_system.queue_contribution(team_index, points, user_id, event_type)
+        return points
+
     def _handle_gift_event(self, event_data):
         """Handle gift event - add points and create bubble"""
         gift_name = event_data.get('gift_name', '')
         gift_count = event_data.get('gift_count', 1)
-
-        # Get gift value
-        from gift_tiers import get_gift_value_from_name
-        gift_value = get_gift_value_from_name(gift_name)
-        total_coins = gift_value * gift_count
+        gift_id = event_data.get('gift_id')
+
+        # Get gift value - learned from the event itself, else the catalog by id/name
+        if self.gift_catalog.observe(gift_id, gift_name, event_data.get('diamond_count'),
+                                     event_data.get('gift_image_url')) is not None:
+            self._schedule_gift_catalog_save()
+        gift_value = self.gift_catalog.coins(gift_id, gift_name)
+        event_data['gift_value'] = gift_value
+        self.gift_icons.request(gift_id, event_data.get('gift_image_url'))
+
+        # Combo events carry the running count - only the increment is new
+        now = self.clock.monotonic()
+        for ended in self.gift_streaks.expire(now):
+            ended.bubble = None  # Quiet streaks let their bubble go (a late update shows a new one)
+        streak, added = self.gift_streaks.update(event_data.get('user_id', ''), gift_id or gift_name,
+                                                 gift_name, gift_count,
+                                                 event_data.get('streak_end', True), now)
 
         # Determine team
         team = self.gift_assignment_widget.get_team_for_gift(gift_name)
 
-        # Add points
-        self.pk_system.add_gift_points(team, total_coins)
+        # Add points (applied with the next frame's batch)
+        points = 0
+        if added > 0:
+            points = self._score_event(team, 'gift', gift_value * added, event_data, detail=gift_name)
 
-        # Play gift sound if enabled
-        if 'gift' in self.event_sound_settings and self.event_sound_settings['gift']['enabled']:
+        # Play gift sound once per streak, not on every combo update
+        if added == streak.count and 'gift' in self.event_sound_settings and self.event_sound_settings['gift']['enabled']:
             sound_file = self.event_sound_settings['gift']['file']
             self.sound_manager.play_event_sound('gift', sound_file)
 
-        # Create bubble in bottom zone (directional)
-        self._create_bubble(event_data, zone='bottom', team=team)
-
-        self._add_log(f"🎁 {gift_name} x{gift_count} → Team {team} (+{total_coins * 5} pts)")
+        # One bubble per streak - later updates tick its counter up
+        bubble = streak.bubble
+        if (bubble is not None and not bubble.is_finished and bubble in self.active_bubbles
+                and bubble.extend_lifetime()):
+            bubble.set_gift_count(streak.count)
+            self.clock.call_later(bubble.duration + 1000, lambda: self._cleanup_bubble(bubble))
+        else:
+            # Create bubble in bottom zone (directional)
+            streak.bubble = self._create_bubble(event_data, zone='bottom', team=team)
+
+        if added > 0:
+            self._add_log(f"🎁 {gift_name} x{streak.count} → Team {team} (+{points} pts)")
+
+    def _schedule_gift_catalog_save(self):
+        """Write new/changed catalog gifts shortly, batching bursts of new gifts"""
+        if self.gift_catalog.dirty and not self._gift_catalog_save_pending:
+            self._gift_catalog_save_pending = True
+            self.clock.call_later(config.GIFT_CATALOG_SAVE_DELAY_MS, self._save_gift_catalog)
+
+    def _save_gift_catalog(self):
+        """Write the gift catalog (no-op if unchanged)"""
+        self._gift_catalog_save_pending = False
+        self.gift_catalog.save()
+        self.gift_assignment_widget.reload_gifts()
+
+    def _on_gift_icon_ready(self, gift_id):
+        """A gift's artwork finished loading - show it on bubbles created before that"""
+        for bubble in self.active_bubbles:
+            try:
+                if bubble.gift_icon is None and bubble.event_data.get('gift_id') == gift_id:
+                    bubble.set_gift_icon(self.gift_icons.pixmap(gift_id, bubble.bubble_style.size))
+            except RuntimeError:
+                pass  # Bubble already deleted
 
     def _handle_bubble_event(self, event_data):
         """Handle non-gift events - create bubble and add points for like/comment"""
@@ -1292,11 +1532,8 @@ class PKMainWindow(QMainWindow):
             team = self.interaction_assignments.get('like', 'A')
             # Use like_count if available (handles spam/rapid likes from same user)
             like_count = event_data.get('like_count', 1)
-            # Get custom points per like
-            points_per_like = self.point_values.get('like', 1)
-            total_points = like_count * points_per_like
-            self.pk_system.add_interaction_points(team, like_count, points_per_like)
-            self._add_log(f"[LIKE] Team {team} (+{total_points} poin) [{like_count} x {points_per_like}]")
+            total_points = self._score_event(team, 'like', like_count, event_data)
+            self._add_log(f"[LIKE] Team {team} (+{total_points} poin) [{like_count} like]", 'like')
 
             # Play sound if enabled
             if event_type in self.event_sound_settings and self.event_sound_settings[event_type]['enabled']:
@@ -1305,17 +1542,21 @@ class PKMainWindow(QMainWindow):
 
         elif event_type == 'comment':
             team = self.interaction_assignments.get('comment', 'A')
-            # Get custom points per comment
-            points_per_comment = self.point_values.get('comment', 1)
-            self.pk_system.add_interaction_points(team, 1, points_per_comment)
+            points = self._score_event(team, 'comment', 1, event_data)
             comment_text = event_data.get('comment', '')[:20]
-            self._add_log(f"[COMMENT] Team {team} (+{points_per_comment} poin): {comment_text}")
+            self._add_log(f"[COMMENT] Team {team} (+{points} poin): {comment_text}")
 
             # Play sound if enabled
             if event_type in self.event_sound_settings and self.event_sound_settings[event_type]['enabled']:
                 sound_file = self.event_sound_settings[event_type]['file']
                 self.sound_manager.play_event_sound(event_type, sound_file)
 
+        elif event_type in ('share', 'follow'):
+            team = self.interaction_assignments.get(event_type, 'A')
+            points = self._score_event(team, event_type, 1, event_data)
+            if points:
+                self._add_log(f"[{event_type.upper()}] Team {team} (+{points} poin)")
+
         # Play sound for other events (join, follow, share)
         if event_type in ['join', 'follow', 'share']:
             if event_type in self.event_sound_settings and self.event_sound_settings[event_type]['enabled']:
@@ -1342,13 +1583,10 @@ class PKMainWindow(QMainWindow):
         # Enforce limit before creating new bubble
         self._enforce_bubble_limit()
         
-        # Inject custom settings
-        event_data['custom_duration'] = self.bubble_settings['duration']
-        event_data['custom_size'] = self.bubble_settings['size']
-
         # Always use center_pk_view for like/comment bubbles
         parent = self.center_pk_view
-        bubble = BubbleWidget(parent, event_data, self.network_manager)
+        style = self.bubble_styles.resolve(event_data.get('type', 'join'))
+        bubble = BubbleWidget(parent, event_data, self.network_manager, clock=self.clock, style=style)
 
         # Check layout mode
         is_rotated = "Rotated" in self.layout_combo.currentText()
@@ -1418,15 +1656,10 @@ class PKMainWindow(QMainWindow):
         bubble.lower()
 
         self.active_bubbles.append(bubble)
+        bubble.lifetime_finished.connect(self._on_bubble_finished)
 
         # Auto cleanup
-        # Prioritize custom_duration if set
-        if 'custom_duration' in event_data:
-            duration = event_data['custom_duration']
-        else:
-            duration = event_data.get('duration', 3000)
-            
-        QTimer.singleShot(duration + 1000, lambda: self._cleanup_bubble(bubble))
+        self.clock.call_later(bubble.bubble_style.duration + 1000, lambda: self._cleanup_bubble(bubble))
 
     def _create_bubble(self, event_data, zone='top', team=None):
         """Create bubble in specified zone (for gifts)"""
@@ -1436,12 +1669,11 @@ class PKMainWindow(QMainWindow):
         # ALWAYS use overlay zone for gifts to ensure they are on top
         parent = self.gift_overlay_zone
             
-        # Inject custom settings
-        event_data['custom_duration'] = self.bubble_settings['duration']
-        event_data['custom_size'] = self.bubble_settings['size']
-        event_data['custom_gift_size'] = self.bubble_settings['gift_size']
-
-        bubble = BubbleWidget(parent, event_data, self.network_manager)
+        # Style for the gift's tier (size/duration from the bubble settings)
+        style = self.bubble_styles.resolve('gift', event_data.get('gift_value'))
+        gift_icon = self.gift_icons.pixmap(event_data.get('gift_id'), style.size)
+        bubble = BubbleWidget(parent, event_data, self.network_manager, clock=self.clock, style=style,
+                              gift_icon=gift_icon)
         
         # Check layout mode
         is_rotated = "Rotated" in self.layout_combo.currentText()
@@ -1503,21 +1735,27 @@ class PKMainWindow(QMainWindow):
         bubble.raise_()
 
         self.active_bubbles.append(bubble)
+        bubble.lifetime_finished.connect(self._on_bubble_finished)
 
         # Auto cleanup
-        # Prioritize custom_duration if set
-        if 'custom_duration' in event_data:
-            duration = event_data['custom_duration']
-        else:
-            duration = event_data.get('duration', 3000)
-            
-        QTimer.singleShot(duration + 1000, lambda: self._cleanup_bubble(bubble))
+        self.clock.call_later(bubble.bubble_style.duration + 1000, lambda: self._cleanup_bubble(bubble))
+        return bubble
+
+    def _on_bubble_finished(self, bubble):
+        """A bubble's lifetime animation ended - forget it before it is deleted"""
+        if bubble in self.active_bubbles:
+            self.active_bubbles.remove(bubble)
+        self.gift_streaks.release_bubble(bubble)
 
     def _cleanup_bubble(self, bubble):
         """Cleanup finished bubble"""
         try:
+            if bubble.expires_at > self.clock.monotonic():
+                return  # Lifetime was extended (gift streak) - a later cleanup is scheduled
             if bubble in self.active_bubbles:
                 self.active_bubbles.remove(bubble)
+            bubble.is_finished = True
+            self.gift_streaks.release_bubble(bubble)
             # Check if bubble still exists before deleting
             if bubble and not bubble.isHidden():
                 bubble.deleteLater()
@@ -1534,7 +1772,9 @@ class PKMainWindow(QMainWindow):
             # Remove oldest bubble
             oldest_bubble = self.active_bubbles.pop(0)
             if oldest_bubble:
+                self.gift_streaks.release_bubble(oldest_bubble)
                 try:
+                    oldest_bubble.is_finished = True
                     oldest_bubble.deleteLater()
                 except RuntimeError:
                     pass
@@ -1582,11 +1822,11 @@ class PKMainWindow(QMainWindow):
         """Simulate rapid events"""
         for i in range(10):
             if i % 3 == 0:
-                team = random.choice(['A', 'B'])
-                QTimer.singleShot(i * 300, lambda t=team: self._simulate_gift(t))
+                team = random.choice(self.pk_system.team_names)
+                self.clock.call_later(i * 300, lambda t=team: self._simulate_gift(t))
             else:
                 event_type = random.choice(['like', 'comment'])
-                QTimer.singleShot(i * 300, lambda et=event_type: self._simulate_event(et))
+                self.clock.call_later(i * 300, lambda et=event_type: self._simulate_event(et))
 
         self._add_log("🚀 Rapid test started!")
 
@@ -1598,6 +1838,7 @@ class PKMainWindow(QMainWindow):
             return
 
         self._add_log(f"Connecting to @{username}...")
+        self.history_store.set_creator(username)
         self.tiktok_thread = TikTokThread(self.tiktok_handler, username)
         self.tiktok_thread.start()
 
@@ -1651,13 +1892,16 @@ class PKMainWindow(QMainWindow):
             
         self._add_log(f"❌ ERROR: {friendly_msg}")
 
-    def _add_log(self, message):
-        """Add message to log"""
-        print(f"[LOG] {message}")  # Print to terminal for debugging
-        self.log_text.append(message)
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+    def _add_log(self, message, category=None):
+        """
+        Add message to log
+        Queued and shown on the next frame; full history goes to the log file
+
+        Args:
+            message: Text to log
+            category: Optional sampling category (e.g. 'like')
+        """
+        self.log_panel.post(message, category)
 
     def _initialize_assignments_from_widgets(self):
         """
@@ -1706,12 +1950,22 @@ class PKMainWindow(QMainWindow):
 
 
 class PKProgressBar(QWidget):
-    """Custom progress bar for PK battle - Shows REAL POINTS - DRAGGABLE, ROTATABLE, RESIZABLE!"""
+    """Custom progress bar for PK battle - Shows REAL POINTS - DRAGGABLE, ROTATABLE, RESIZABLE!
+    One segment per team, left to right in team order"""
+
+    # Fraction of the remaining distance covered per frame when animating
+    INTERPOLATION_FACTOR = 0.25
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, team_count=2):
         super().__init__(parent)
-        self.team_a_points = 0
-        self.team_b_points = 0
+        self.team_count = team_count
+        self.team_colors = [QColor(color) for color in config.TEAM_COLORS[:team_count]]
+
+        # Displayed (interpolated) points, per team
+        self.points = [0] * team_count
+
+        # Latest real points - display glides toward these
+        self.target_points = [0] * team_count
 
         # Drag state
         self.dragging = False
@@ -1731,11 +1985,39 @@ class PKProgressBar(QWidget):
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
 
-    def set_points(self, team_a_points, team_b_points):
-        """Set real points for both teams"""
-        self.team_a_points = team_a_points
-        self.team_b_points = team_b_points
-        self.update()
+    def set_points(self, points):
+        """
+        Set real points for every team
+        The bar animates toward them in advance_frame()
+
+        Args:
+            points: Sequence of points, one per team
+        """
+        self.target_points = list(points)
+
+        # Resets snap immediately instead of sliding down from the old totals
+        if not any(self.target_points):
+            self.points = list(self.target_points)
+            self.update()
+
+    def advance_frame(self):
+        """
+        Move displayed points one step toward the targets
+        Only repaints when the displayed value actually changed
+        """
+        new_points = [self._step_toward(current, target)
+                      for current, target in zip(self.points, self.target_points)]
+
+        if new_points != self.points:
+            self.points = new_points
+            self.update()
+
+    def _step_toward(self, current, target):
+        """Ease current toward target, snapping once within half a point"""
+        delta = target - current
+        if abs(delta) < 0.5:
+            return target
+        return current + delta * self.INTERPOLATION_FACTOR
 
     def wheelEvent(self, event):
         """Rotate with mouse wheel"""
@@ -1868,28 +2150,27 @@ class PKProgressBar(QWidget):
         # Background
         painter.fillRect(target_rect, QColor(50, 50, 50))
 
-        # Calculate percentage for bar visual
-        total = self.team_a_points + self.team_b_points
+        # Segment widths from each team's share (equal when no points yet)
+        total = sum(self.points)
         if total > 0:
-            team_a_pct = (self.team_a_points / total) * 100
-            team_b_pct = (self.team_b_points / total) * 100
+            shares = [points / total for points in self.points]
         else:
-            team_a_pct = 50
-            team_b_pct = 50
-
-        # Team A bar (from left of target_rect)
-        a_width = int(tw * (team_a_pct / 100))
-        gradient_a = QLinearGradient(tx, ty, tx + a_width, ty)
-        gradient_a.setColorAt(0, QColor(255, 107, 107))
-        gradient_a.setColorAt(1, QColor(255, 82, 82))
-        painter.fillRect(tx, ty, a_width, th, gradient_a)
-
-        # Team B bar (from right of target_rect)
-        b_width = int(tw * (team_b_pct / 100))
-        gradient_b = QLinearGradient(tx + tw - b_width, ty, tx + tw, ty)
-        gradient_b.setColorAt(0, QColor(78, 205, 196))
-        gradient_b.setColorAt(1, QColor(61, 189, 179))
-        painter.fillRect(tx + tw - b_width, ty, b_width, th, gradient_b)
+            shares = [1 / self.team_count] * self.team_count
+
+        # Segment edges; the last one ends exactly at the right border
+        edges = [tx]
+        for share in shares[:-1]:
+            edges.append(edges[-1] + int(tw * share))
+        edges.append(tx + tw)
+
+        for i, color in enumerate(self.team_colors):
+            left, right = edges[i], edges[i + 1]
+            if right <= left:
+                continue
+            gradient = QLinearGradient(left, ty, right, ty)
+            gradient.setColorAt(0, color)
+            gradient.setColorAt(1, color.darker(110))
+            painter.fillRect(left, ty, right - left, th, gradient)
 
         # Border
         painter.setPen(QPen(QColor(255, 255, 255), 3))
@@ -1902,15 +2183,23 @@ class PKProgressBar(QWidget):
         painter.setFont(font)
         painter.setPen(QColor(255, 255, 255))
 
-        # Team A points (left)
+        # First team's points (left)
         painter.drawText(QRect(tx + 10, ty, 250, th),
                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-                        f"{self.team_a_points:,}")
+                        f"{round(self.points[0]):,}")
 
-        # Team B points (right)
+        # Last team's points (right)
         painter.drawText(QRect(tx + tw - 260, ty, 250, th),
                         Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
-                        f"{self.team_b_points:,}")
+                        f"{round(self.points[-1]):,}")
+
+        # Middle teams' points, centered in their segments (when there's room)
+        for i in range(1, self.team_count - 1):
+            left, right = edges[i], edges[i + 1]
+            if right - left >= 60:
+                painter.drawText(QRect(left, ty, right - left, th),
+                                Qt.AlignmentFlag.AlignCenter,
+                                f"{round(self.points[i]):,}")
 
         # Draw resize handles at corners (always)
         painter.setPen(QPen(QColor(255, 255, 255, 100), 1))
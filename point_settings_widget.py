@@ -1,11 +1,14 @@
 """
 Point Settings Widget
-Allows user to customize points for Like and Comment
+Allows user to customize points for Like, Comment, Share, Follow and Gifts,
+plus last-minute multiplier, gift combo bonus and per-user cap
 """
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QPushButton, QSpinBox, QGroupBox)
+                             QPushButton, QSpinBox, QDoubleSpinBox, QGroupBox,
+                             QFormLayout)
 from PyQt6.QtCore import pyqtSignal
+from scoring_rules import DEFAULT_SETTINGS
 import json
 import os
 
@@ -15,16 +18,16 @@ class PointSettingsWidget(QWidget):
     UI for configuring custom points for interactions
     """
 
-    point_settings_changed = pyqtSignal(dict)  # {interaction: points}
+    point_settings_changed = pyqtSignal(dict)  # {setting: value} (see scoring_rules.DEFAULT_SETTINGS)
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        # Point settings: {'like': 1, 'comment': 1}
-        self.point_values = {
-            'like': 1,      # Default
-            'comment': 1    # Default
-        }
+        # Point settings: {'like': 1, 'comment': 1, 'gift': 5, ...}
+        self.point_values = dict(DEFAULT_SETTINGS)
+
+        # Spinboxes for the extra rule settings: {setting: spinbox}
+        self.rule_spinboxes = {}
 
         self._setup_ui()
         self._load_settings()
@@ -39,7 +42,8 @@ class PointSettingsWidget(QWidget):
         layout.addWidget(title)
 
         # Info
-        info = QLabel("Atur berapa poin untuk setiap Like dan Comment.\nDefault: 1 Like = 1 poin, 1 Comment = 1 poin")
+        info = QLabel("Atur berapa poin untuk setiap Like, Comment, Share, Follow dan Gift.\n"
+                      "Default: 1 Like = 1 poin, 1 Comment = 1 poin, 1 Coin = 5 poin")
         info.setStyleSheet("color: #aaa; font-size: 11px;")
         info.setWordWrap(True)
         layout.addWidget(info)
@@ -142,6 +146,36 @@ class PointSettingsWidget(QWidget):
 
         layout.addSpacing(10)
 
+        # More scoring rules
+        rules_group = QGroupBox("⚙️ Scoring Rules")
+        rules_group.setStyleSheet("""
+            QGroupBox {
+                font-size: 14px;
+                font-weight: bold;
+                color: white;
+                border: 2px solid #555;
+                border-radius: 8px;
+                margin-top: 10px;
+                padding: 15px;
+            }
+            QLabel { color: white; font-size: 12px; font-weight: normal; }
+        """)
+        rules_layout = QFormLayout()
+        self._add_rule_spinbox(rules_layout, "1 Coin gift =", 'gift', 0, 1000, " poin")
+        self._add_rule_spinbox(rules_layout, "1 Share =", 'share', 0, 1000, " poin")
+        self._add_rule_spinbox(rules_layout, "1 Follow =", 'follow', 0, 1000, " poin")
+        self._add_rule_spinbox(rules_layout, "Last minute multiplier:", 'last_minute_multiplier', 1, 10, "x",
+                               decimals=1)
+        self._add_rule_spinbox(rules_layout, "Last minute length:", 'last_minute_seconds', 0, 3600, " detik")
+        self._add_rule_spinbox(rules_layout, "Gift combo bonus:", 'combo_step_percent', 0, 100, "% per gift")
+        self._add_rule_spinbox(rules_layout, "Combo bonus max:", 'combo_max_percent', 0, 1000, "%")
+        self._add_rule_spinbox(rules_layout, "Combo window:", 'combo_window', 1, 300, " detik")
+        self._add_rule_spinbox(rules_layout, "Max poin per user/round:", 'user_cap', 0, 10000000, " poin (0 = off)")
+        rules_group.setLayout(rules_layout)
+        layout.addWidget(rules_group)
+
+        layout.addSpacing(10)
+
         # Quick presets
         preset_label = QLabel("⚡ Quick Presets:")
         preset_label.setStyleSheet("color: white; font-size: 12px; font-weight: bold;")
@@ -214,6 +248,30 @@ class PointSettingsWidget(QWidget):
 
         layout.addStretch()
 
+    def _add_rule_spinbox(self, form, label, key, minimum, maximum, suffix, decimals=0):
+        """Add a spinbox row bound to point_values[key]"""
+        spinbox = QDoubleSpinBox() if decimals else QSpinBox()
+        if decimals:
+            spinbox.setDecimals(decimals)
+            spinbox.setSingleStep(0.5)
+        spinbox.setMinimum(minimum)
+        spinbox.setMaximum(maximum)
+        spinbox.setValue(self.point_values[key])
+        spinbox.setSuffix(suffix)
+        spinbox.setStyleSheet("""
+            QSpinBox, QDoubleSpinBox {
+                background-color: #2b2b2b;
+                color: white;
+                border: 1px solid #555;
+                border-radius: 5px;
+                padding: 4px;
+                font-size: 12px;
+            }
+        """)
+        spinbox.valueChanged.connect(lambda val, k=key: self.point_values.__setitem__(k, val))
+        form.addRow(label, spinbox)
+        self.rule_spinboxes[key] = spinbox
+
     def _on_like_changed(self, value):
         """Handle like points change"""
         self.point_values['like'] = value
@@ -259,7 +317,12 @@ class PointSettingsWidget(QWidget):
                 if 'comment' in saved_settings:
                     self.comment_spinbox.setValue(saved_settings['comment'])
 
-                self.point_values = saved_settings
+                for key, spinbox in self.rule_spinboxes.items():
+                    if key in saved_settings:
+                        spinbox.setValue(saved_settings[key])
+
+                # Older files only have like/comment - keep defaults for the rest
+                self.point_values.update(saved_settings)
                 print(f"[OK] Loaded point settings")
                 print(f"  1 Like = {self.point_values['like']} poin")
                 print(f"  1 Comment = {self.point_values['comment']} poin")
@@ -274,7 +337,7 @@ class PointSettingsWidget(QWidget):
         Get point value for an interaction
 
         Args:
-            interaction_type: 'like' or 'comment'
+            interaction_type: 'like', 'comment', 'share' or 'follow'
 
         Returns:
             int: Point value (default 1)
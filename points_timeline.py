@@ -0,0 +1,234 @@
+"""
+Points Timeline
+Per-team points-per-second history in fixed-size NumPy ring buffers
+
+The current round is kept at 1-second resolution; the whole session is
+downsampled into 10-second and 1-minute buckets. Every buffer is allocated
+once, so memory stays flat no matter how long the stream runs
+(see config.TIMELINE_* for the sizes).
+"""
+
+import numpy as np
+import config
+import time
+
+
+class RingSeries:
+    """
+    Fixed number of time buckets x teams, oldest overwritten first
+
+    Buckets are addressed by absolute index (seconds since the session
+    started // resolution); bucket i lives in row i % slots.
+    """
+
+    def __init__(self, slots, resolution, team_count):
+        self.slots = slots
+        self.resolution = resolution
+        self.data = np.zeros((slots, team_count), dtype=np.int64)
+        self.head = -1  # Absolute index of the newest bucket
+
+    def advance(self, index):
+        """Move the head to bucket `index`, zeroing the buckets in between"""
+        if index <= self.head:
+            return
+
+        # Only the last `slots` buckets survive - no need to zero more than that
+        start = max(self.head + 1, index + 1 - self.slots)
+        first = start % self.slots
+        count = index + 1 - start
+        if first + count <= self.slots:
+            self.data[first:first + count] = 0
+        else:
+            self.data[first:] = 0
+            self.data[:first + count - self.slots] = 0
+        self.head = index
+
+    def add(self, index, row):
+        """Add a per-team row to bucket `index` (ignored if already overwritten)"""
+        self.advance(index)
+        if index > self.head - self.slots:
+            self.data[index % self.slots] += row
+
+    def last(self, count, since=0):
+        """
+        Get the newest buckets, oldest first
+
+        Args:
+            count: Number of buckets
+            since: Buckets older than this absolute index read as zero
+
+        Returns:
+            np.ndarray: (count, team_count) array (a copy)
+        """
+        count = min(count, self.slots)
+        indices = np.arange(self.head - count + 1, self.head + 1)
+        rows = self.data[indices % self.slots]
+        rows[indices < max(since, 0)] = 0
+        return rows
+
+    def clear(self):
+        """Zero all buckets"""
+        self.data[:] = 0
+        self.head = -1
+
+    def memory_bytes(self):
+        return self.data.nbytes
+
+
+class PointsTimeline:
+    """
+    Points gained per team over time
+
+    add() is called on every scoring event and only bumps a per-team counter
+    for the current second; NumPy is touched once per elapsed second, when
+    that counter is folded into the 1 s, 10 s and 1 min rings.
+    """
+
+    def __init__(self, team_count, clock=time.monotonic):
+        self.team_count = team_count
+        self._clock = clock
+
+        self.seconds = RingSeries(config.TIMELINE_SECOND_SLOTS, 1, team_count)
+        self.history = {
+            10: RingSeries(config.TIMELINE_10S_SLOTS, 10, team_count),
+            60: RingSeries(config.TIMELINE_MINUTE_SLOTS, 60, team_count),
+        }
+
+        self._origin = clock()      # Session start
+        self._round_start = 0       # Absolute second the current round started
+        self._second = 0            # Absolute second being accumulated
+        self._pending = [0] * team_count
+        self._has_pending = False
+
+    def _now_second(self, now=None):
+        if now is None:
+            now = self._clock()
+        return int(now - self._origin)
+
+    def add(self, team_index, points, now=None):
+        """
+        Record points gained by a team
+
+        Args:
+            team_index: Team index
+            points: Points gained (negative for corrections)
+            now: Monotonic time (default: now)
+        """
+        second = self._now_second(now)
+        if second != self._second:
+            self._flush()
+            self._second = second
+        self._pending[team_index] += points
+        self._has_pending = True
+
+    def _flush(self):
+        """Fold the pending second into every ring"""
+        if not self._has_pending:
+            return
+
+        row = np.array(self._pending, dtype=np.int64)
+        second = self._second
+        self.seconds.add(second, row)
+        for resolution, series in self.history.items():
+            series.add(second // resolution, row)
+
+        self._pending = [0] * self.team_count
+        self._has_pending = False
+
+    def sync(self, now=None):
+        """Bring every ring up to the current second (flushes pending points)"""
+        second = self._now_second(now)
+        if second != self._second:
+            self._flush()
+            self._second = second
+        # The current second is still filling up - rings end at the last full one
+        self.seconds.advance(second - 1)
+        for resolution, series in self.history.items():
+            series.advance((second - 1) // resolution)
+
+    def start_round(self, now=None):
+        """Begin a new round - per-second series restarts, session history continues"""
+        self.sync(now)
+        self._round_start = self._now_second(now)
+
+    def clear(self):
+        """Forget everything and restart the session clock"""
+        self.seconds.clear()
+        for series in self.history.values():
+            series.clear()
+        self._origin = self._clock()
+        self._round_start = 0
+        self._second = 0
+        self._pending = [0] * self.team_count
+        self._has_pending = False
+
+    def rates(self, window=10, now=None):
+        """
+        Rolling points per second over the last `window` full seconds of the round
+
+        Returns:
+            np.ndarray: Points per second per team (float)
+        """
+        self.sync(now)
+        window = max(1, min(window, self.seconds.slots))
+        return self.seconds.last(window, since=self._round_start).sum(axis=0) / window
+
+    def momentum(self, window=10, now=None):
+        """
+        Each team's share of the points scored in the last `window` seconds
+
+        Returns:
+            np.ndarray: Shares per team (sums to 1; equal shares when nothing was scored)
+        """
+        rates = np.clip(self.rates(window, now), 0, None)
+        total = rates.sum()
+        if total <= 0:
+            return np.full(self.team_count, 1 / self.team_count)
+        return rates / total
+
+    def round_series(self, now=None):
+        """
+        Points per second for the current round (capped at the ring size)
+
+        Returns:
+            np.ndarray: (seconds, team_count) array, oldest first
+        """
+        self.sync(now)
+        length = self.seconds.head + 1 - self._round_start
+        return self.seconds.last(max(length, 0), since=self._round_start)
+
+    def session_series(self, resolution=60, now=None):
+        """
+        Downsampled session history
+
+        Args:
+            resolution: 10 or 60 (seconds per bucket)
+
+        Returns:
+            np.ndarray: (buckets, team_count) array of points per bucket, oldest first
+        """
+        self.sync(now)
+        series = self.history[resolution]
+        return series.last(series.head + 1)
+
+    def report(self, now=None):
+        """
+        End-of-stream summary from the minute history
+
+        Returns:
+            dict: Totals and the busiest minute per team
+        """
+        minutes = self.session_series(60, now)
+        if not len(minutes):
+            minutes = np.zeros((1, self.team_count), dtype=np.int64)
+        peaks = minutes.argmax(axis=0)
+        return {
+            'minutes': len(minutes),
+            'totals': minutes.sum(axis=0).tolist(),
+            'peak_minute': peaks.tolist(),
+            'peak_points_per_minute': minutes[peaks, np.arange(self.team_count)].tolist(),
+        }
+
+    def memory_bytes(self):
+        """Memory held by the ring buffers"""
+        return self.seconds.memory_bytes() + sum(s.memory_bytes() for s in self.history.values())
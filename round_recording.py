@@ -0,0 +1,195 @@
+"""
+Round Recording
+Every scoring input of a round, in order, for deterministic replay
+
+Where the contribution ledger keeps the resulting points (coalesced per
+user per second), the recording keeps what the scoring rules were given:
+team, event type, units (coins/count), user, gift name, and the round
+clock at that moment - plus every rule set that was active. That is enough
+to re-score the round exactly, or under different settings (battle_replay.py).
+"""
+
+from array import array
+from scoring_rules import EVENT_TYPES
+import json
+import sys
+import zlib
+
+
+EVENT_INDEX = {name: i for i, name in enumerate(EVENT_TYPES)}
+
+# Column name -> typecode, in serialization order
+COLUMNS = (
+    ('offsets', 'd'),       # Monotonic seconds since the recording started
+    ('seconds_left', 'd'),  # Round clock when the event was scored
+    ('teams', 'b'),
+    ('events', 'b'),        # Index into EVENT_TYPES
+    ('units', 'q'),
+    ('user_indices', 'i'),
+    ('detail_indices', 'i'),
+    ('points', 'q'),        # Points the live rules awarded
+)
+
+
+class RoundRecording:
+    """
+    Append-only columns of scoring inputs (about 42 bytes per event)
+    User ids and details (gift names) are interned
+    """
+
+    def __init__(self, team_names=('A', 'B'), duration_seconds=0, rules=None):
+        self.team_names = tuple(team_names)
+        self.duration_seconds = duration_seconds
+        self.clear(rules)
+
+    def clear(self, rules=None, origin=0.0):
+        """
+        Drop all events (start of a new round)
+
+        Args:
+            rules: Rule set active from the first event
+            origin: Monotonic time offsets are measured from
+        """
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+        self.users = []
+        self._user_index = {}
+        self.details = []
+        self._detail_index = {}
+        self.rule_changes = [] if rules is None else [(0, rules)]  # [(first event index, rules)]
+        self.origin = origin
+
+    def __len__(self):
+        return len(self.points)
+
+    def _intern(self, value, values, index):
+        i = index.get(value)
+        if i is None:
+            i = len(values)
+            values.append(value)
+            index[value] = i
+        return i
+
+    def record(self, now, seconds_left, team_index, event_type, units, user_id, detail, points):
+        """
+        Append one scored event
+
+        Args:
+            now: Monotonic time the event was scored
+            seconds_left: Round clock at that moment
+            team_index: Team index
+            event_type: One of EVENT_TYPES (others are not recorded)
+            units: Coins for gifts, count otherwise
+            user_id: Sender's TikTok unique id
+            detail: Gift name ('' if none)
+            points: Points the rules awarded
+        """
+        event = EVENT_INDEX.get(event_type)
+        if event is None:
+            return
+
+        self.offsets.append(now - self.origin)
+        self.seconds_left.append(seconds_left)
+        self.teams.append(team_index)
+        self.events.append(event)
+        self.units.append(units)
+        self.user_indices.append(self._intern(user_id or '', self.users, self._user_index))
+        self.detail_indices.append(self._intern(detail or '', self.details, self._detail_index))
+        self.points.append(points)
+
+    def rules_changed(self, rules):
+        """Note a new rule set, effective from the next event"""
+        self.rule_changes.append((len(self.points), rules))
+
+    def copy(self):
+        """Independent copy (columns copied as raw memory)"""
+        other = RoundRecording(self.team_names, self.duration_seconds)
+        for name, _ in COLUMNS:
+            setattr(other, name, getattr(self, name)[:])
+        other.users = list(self.users)
+        other._user_index = dict(self._user_index)
+        other.details = list(self.details)
+        other._detail_index = dict(self._detail_index)
+        other.rule_changes = list(self.rule_changes)
+        other.origin = self.origin
+        return other
+
+    def event(self, i):
+        """
+        Get one event
+
+        Returns:
+            tuple: (offset, seconds_left, team_index, event_type, units, user_id, detail, points)
+        """
+        return (self.offsets[i], self.seconds_left[i], self.teams[i],
+                EVENT_TYPES[self.events[i]], self.units[i],
+                self.users[self.user_indices[i]], self.details[self.detail_indices[i]],
+                self.points[i])
+
+    def events_iter(self):
+        """Iterate events in order (tuples as returned by event())"""
+        for i in range(len(self.points)):
+            yield self.event(i)
+
+    # ---- Serialization -------------------------------------------------
+
+    def to_bytes(self):
+        """
+        Serialize (JSON header + little-endian columns, zlib-compressed)
+
+        Returns:
+            bytes: Serialized recording
+        """
+        header = {
+            'version': 1,
+            'team_names': list(self.team_names),
+            'duration_seconds': self.duration_seconds,
+            'rows': len(self.points),
+            'users': self.users,
+            'details': self.details,
+            'rule_changes': self.rule_changes,
+        }
+        parts = [json.dumps(header).encode('utf-8'), b'\n']
+        for name, _ in COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder != 'little':
+                column = column[:]
+                column.byteswap()
+            parts.append(column.tobytes())
+        return zlib.compress(b''.join(parts))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Rebuild a recording from to_bytes() output
+
+        Raises:
+            ValueError: Corrupt or unknown data
+        """
+        try:
+            raw = zlib.decompress(data)
+            newline = raw.index(b'\n')
+            header = json.loads(raw[:newline])
+        except (zlib.error, ValueError) as e:
+            raise ValueError(f"Invalid round recording: {e}") from None
+
+        recording = cls(header['team_names'], header['duration_seconds'])
+        recording.users = header['users']
+        recording._user_index = {user: i for i, user in enumerate(recording.users)}
+        recording.details = header['details']
+        recording._detail_index = {detail: i for i, detail in enumerate(recording.details)}
+        recording.rule_changes = [(index, rules) for index, rules in header['rule_changes']]
+
+        rows = header['rows']
+        position = newline + 1
+        for name, typecode in COLUMNS:
+            column = array(typecode)
+            size = rows * column.itemsize
+            column.frombytes(raw[position:position + size])
+            if len(column) != rows:
+                raise ValueError("Invalid round recording: truncated column")
+            if sys.byteorder != 'little':
+                column.byteswap()
+            setattr(recording, name, column)
+            position += size
+        return recording
@@ -0,0 +1,190 @@
+"""
+Scoring Rules
+Small declarative rule language for PK points, compiled into a dispatch table
+
+A rule set is a list of rule dicts, applied in order:
+
+    {'rule': 'points', 'event': 'gift', 'per_unit': 5}
+        Base points: units x per_unit (gift units are coins, others are counts)
+    {'rule': 'multiplier', 'events': [...], 'last_seconds': 60, 'factor': 2.0}
+        Multiply points scored in the last N seconds of the round
+    {'rule': 'combo', 'events': [...], 'window': 10, 'step_percent': 10, 'max_percent': 100}
+        Streak bonus: each repeat by the same user within `window` seconds
+        adds step_percent, up to max_percent
+    {'rule': 'user_cap', 'points': 10000}
+        Max points one user can earn per round (anonymous users are not capped)
+
+compile_rules() turns a rule set into {event_type: scorer}, where each scorer
+is a chain of closures with every setting bound at compile time. Scoring an
+event is one table lookup plus the closure calls - settings are never looked
+up per event. Streak and cap progress live in a ScoringState that outlives
+recompiles, so rules can change mid-round.
+"""
+
+
+EVENT_TYPES = ('gift', 'like', 'comment', 'share', 'follow')
+
+# Flat settings edited in PointSettingsWidget (point_settings.json)
+DEFAULT_SETTINGS = {
+    'gift': 5,       # Points per coin
+    'like': 1,
+    'comment': 1,
+    'share': 0,
+    'follow': 0,
+    'last_minute_seconds': 60,
+    'last_minute_multiplier': 1.0,   # 1.0 = off
+    'combo_window': 10,              # seconds between gifts to keep a streak
+    'combo_step_percent': 0,         # 0 = off
+    'combo_max_percent': 100,
+    'user_cap': 0,                   # 0 = no cap
+}
+
+
+class ScoringState:
+    """
+    Per-round progress the rules depend on (streaks, capped totals)
+    Kept apart from the compiled rules so recompiling doesn't reset it
+    """
+
+    def __init__(self):
+        self.streaks = {}       # (event, user_id) -> [last_time, streak_length]
+        self.user_points = {}   # user_id -> points earned this round
+
+    def clear(self):
+        """Forget all progress (start of a new round)"""
+        self.streaks.clear()
+        self.user_points.clear()
+
+
+def rules_from_settings(settings):
+    """
+    Build a rule set from flat point settings
+
+    Args:
+        settings: Dict like DEFAULT_SETTINGS (missing keys use the defaults)
+
+    Returns:
+        list: Rule dicts for compile_rules()
+    """
+    values = dict(DEFAULT_SETTINGS)
+    values.update(settings or {})
+
+    rules = [{'rule': 'points', 'event': event, 'per_unit': values[event]}
+             for event in EVENT_TYPES]
+
+    if values['last_minute_multiplier'] != 1 and values['last_minute_seconds'] > 0:
+        rules.append({'rule': 'multiplier', 'events': EVENT_TYPES,
+                      'last_seconds': values['last_minute_seconds'],
+                      'factor': values['last_minute_multiplier']})
+
+    if values['combo_step_percent'] > 0:
+        rules.append({'rule': 'combo', 'events': ('gift',),
+                      'window': values['combo_window'],
+                      'step_percent': values['combo_step_percent'],
+                      'max_percent': values['combo_max_percent']})
+
+    if values['user_cap'] > 0:
+        rules.append({'rule': 'user_cap', 'points': values['user_cap']})
+
+    return rules
+
+
+def compile_rules(rules, state):
+    """
+    Compile a rule set into a per-event-type dispatch table
+
+    Args:
+        rules: List of rule dicts (see module docstring)
+        state: ScoringState shared by every compiled scorer
+
+    Returns:
+        dict: {event_type: scorer(units, user_id, seconds_left, now) -> int}
+
+    Raises:
+        ValueError: Unknown rule or missing setting
+    """
+    table = {}
+    for rule in rules:
+        kind = rule.get('rule')
+        try:
+            if kind == 'points':
+                table[rule['event']] = _base_scorer(rule['per_unit'])
+            elif kind == 'multiplier':
+                for event in _events(rule, table):
+                    table[event] = _last_seconds_scorer(table[event], rule['last_seconds'], rule['factor'])
+            elif kind == 'combo':
+                for event in _events(rule, table):
+                    table[event] = _combo_scorer(table[event], event, state, rule['window'],
+                                                 rule['step_percent'], rule['max_percent'])
+            elif kind == 'user_cap':
+                for event in _events(rule, table):
+                    table[event] = _cap_scorer(table[event], state, rule['points'])
+            else:
+                raise ValueError(f"Unknown scoring rule: {kind!r}")
+        except KeyError as e:
+            raise ValueError(f"Scoring rule {kind!r} is missing {e}") from None
+
+    # Events worth nothing are left out - callers can skip them entirely
+    return {event: scorer for event, scorer in table.items() if scorer is not None}
+
+
+def _events(rule, table):
+    """Events a modifier applies to (default: every scored event)"""
+    events = rule.get('events')
+    if events is None:
+        events = list(table)
+    return [event for event in events if table.get(event) is not None]
+
+
+def _base_scorer(per_unit):
+    if per_unit <= 0:
+        return None
+
+    def score(units, user_id, seconds_left, now):
+        return units * per_unit
+    return score
+
+
+def _last_seconds_scorer(inner, last_seconds, factor):
+    def score(units, user_id, seconds_left, now):
+        points = inner(units, user_id, seconds_left, now)
+        if seconds_left <= last_seconds:
+            points = int(points * factor)
+        return points
+    return score
+
+
+def _combo_scorer(inner, event, state, window, step_percent, max_percent):
+    streaks = state.streaks
+
+    def score(units, user_id, seconds_left, now):
+        points = inner(units, user_id, seconds_left, now)
+        if not user_id:
+            return points
+
+        key = (event, user_id)
+        streak = streaks.get(key)
+        if streak is not None and now - streak[0] <= window:
+            streak[0] = now
+            streak[1] += 1
+            bonus = min(max_percent, (streak[1] - 1) * step_percent)
+            points += points * bonus // 100
+        else:
+            streaks[key] = [now, 1]
+        return points
+    return score
+
+
+def _cap_scorer(inner, state, cap):
+    user_points = state.user_points
+
+    def score(units, user_id, seconds_left, now):
+        points = inner(units, user_id, seconds_left, now)
+        if not user_id:
+            return points
+
+        earned = user_points.get(user_id, 0)
+        points = max(0, min(points, cap - earned))
+        user_points[user_id] = earned + points
+        return points
+    return score
@@ -0,0 +1,299 @@
+"""
+Sound Bank
+Sound files decoded once into in-memory PCM, ready to mix instantly
+
+Playing a sound used to mean QMediaPlayer.setSource() on every trigger -
+reopening and re-decoding the MP3 each time, which is audible as lag on
+like/gift sounds. The bank decodes each file once (QAudioDecoder, when the
+file is configured) into float32 frames at the mixer's rate and channel
+count; a trigger is then a dict hit and the samples go straight to the
+mixer (audio_mixer). A sound is only handed out once its loudness gain is
+known (sound_loudness) - from the cache, or after analysis.
+"""
+
+from PyQt6.QtCore import QObject, QUrl, QTimer, QFileSystemWatcher, pyqtSignal
+from PyQt6.QtMultimedia import QAudioDecoder, QAudioFormat
+from sound_loudness import LoudnessAnalyzer, file_stat
+import config
+import numpy as np
+import os
+
+# Decoded sample format -> (dtype, offset, scale to [-1, 1])
+_SAMPLE_TYPES = {
+    QAudioFormat.SampleFormat.UInt8: (np.uint8, 128.0, 1 / 128.0),
+    QAudioFormat.SampleFormat.Int16: (np.int16, 0.0, 1 / 32768.0),
+    QAudioFormat.SampleFormat.Int32: (np.int32, 0.0, 1 / 2147483648.0),
+    QAudioFormat.SampleFormat.Float: (np.float32, 0.0, 1.0),
+}
+
+
+def output_format():
+    """PCM format sounds are decoded to (and the output stream is opened with)"""
+    audio_format = QAudioFormat()
+    audio_format.setSampleRate(config.AUDIO_SAMPLE_RATE)
+    audio_format.setChannelCount(config.AUDIO_CHANNELS)
+    audio_format.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+    return audio_format
+
+
+def to_mixer_samples(pcm, audio_format):
+    """
+    Convert decoded PCM to the mixer's float32 frames
+
+    Args:
+        pcm: Interleaved sample bytes
+        audio_format: QAudioFormat of pcm
+
+    Returns:
+        np.ndarray: float32 (frames, AUDIO_CHANNELS) at AUDIO_SAMPLE_RATE, or
+            None for an unsupported sample format
+    """
+    sample_type = _SAMPLE_TYPES.get(audio_format.sampleFormat())
+    if sample_type is None:
+        return None
+    dtype, offset, scale = sample_type
+    channels = max(1, audio_format.channelCount())
+    raw = np.frombuffer(pcm, dtype=dtype)
+    raw = raw[:len(raw) - len(raw) % channels].reshape(-1, channels)
+    samples = (raw.astype(np.float32) - offset) * scale
+
+    # Channel layout: mono is duplicated, extra channels are dropped
+    if channels < config.AUDIO_CHANNELS:
+        samples = np.repeat(samples[:, :1], config.AUDIO_CHANNELS, axis=1)
+    elif channels > config.AUDIO_CHANNELS:
+        samples = samples[:, :config.AUDIO_CHANNELS]
+
+    # Backend ignored the requested rate - resample (linear is fine for effects)
+    rate = audio_format.sampleRate()
+    if rate and rate != config.AUDIO_SAMPLE_RATE and len(samples) > 1:
+        frames = int(round(len(samples) * config.AUDIO_SAMPLE_RATE / rate))
+        positions = np.arange(frames) * (rate / config.AUDIO_SAMPLE_RATE)
+        source = np.arange(len(samples))
+        samples = np.stack([np.interp(positions, source, samples[:, channel])
+                            for channel in range(samples.shape[1])], axis=1)
+    return np.ascontiguousarray(samples, dtype=np.float32)
+
+
+class DecodedSound:
+    """One decoded sound file"""
+
+    __slots__ = ('path', 'samples', 'duration_ms', 'gain', 'stat')
+
+    def __init__(self, path, samples, stat=None):
+        self.path = path
+        self.stat = stat  # (size, mtime_ns) of the file when decoding started
+        self.samples = samples  # float32 (frames, channels) - shared, never copied per play
+        self.samples.flags.writeable = False
+        self.duration_ms = len(samples) * 1000 // config.AUDIO_SAMPLE_RATE
+        self.gain = 1.0  # Loudness normalization, set once the file is analyzed
+
+
+class _Decoding:
+    """A decode in progress"""
+
+    __slots__ = ('decoder', 'chunks', 'audio_format', 'stat')
+
+    def __init__(self, decoder, stat):
+        self.decoder = decoder
+        self.chunks = []
+        self.audio_format = None
+        self.stat = stat
+
+
+class SoundBank(QObject):
+    """
+    path -> DecodedSound
+
+    get() never touches the disk. load() validates a file once (one stat)
+    and decodes it in the background (QAudioDecoder works off the UI
+    thread); files that are missing, too small or undecodable are
+    remembered. Every file asked for is watched (the file and its folder):
+    when one is edited, replaced, deleted or appears, it is re-validated
+    and re-decoded - the old sound keeps playing until the new one is ready.
+    """
+
+    sound_loaded = pyqtSignal(str)  # path
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.audio_format = output_format()
+        self._sounds = {}    # path -> DecodedSound
+        self._decoders = {}  # path -> _Decoding
+        self._analyzing = {}  # path -> DecodedSound waiting for its loudness gain
+        self._failed = set()
+        self._stats = {}     # path -> (size, mtime_ns) when last validated
+        self.loudness = LoudnessAnalyzer(parent=self)
+        self.loudness.analyzed.connect(self._on_analyzed)
+
+        # Change notifications -> debounced reload (editors write in pieces)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._paths_by_file = {}  # absolute path -> path as asked for
+        self._paths_by_dir = {}   # absolute folder -> {paths}
+        self._reload_pending = set()
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.timeout.connect(self._reload_pending_paths)
+
+    def get(self, path):
+        """Decoded sound for a file, or None if it isn't (yet) loaded"""
+        return self._sounds.get(path)
+
+    def load(self, path, retry=False):
+        """
+        Decode a sound file in the background (no-op if loaded or loading)
+
+        Args:
+            path: Sound file path
+            retry: Try again even if the file failed before
+        """
+        if not path or path in self._sounds or path in self._decoders or path in self._analyzing:
+            return
+        if path in self._failed:
+            if not retry:
+                return
+            self._failed.discard(path)
+
+        self._watch(path)
+        self._decode(path)
+
+    def _decode(self, path):
+        """Validate and (re)start decoding a file"""
+        decoding = self._decoders.pop(path, None)
+        if decoding is not None:
+            decoding.decoder.stop()
+            decoding.decoder.deleteLater()
+        self._analyzing.pop(path, None)
+
+        # Empty placeholder files make FFmpeg error out - reject them up front
+        stat = self._stat(path)
+        self._stats[path] = stat
+        if stat is None or stat[0] < config.SOUND_MIN_FILE_BYTES:
+            self._sounds.pop(path, None)
+            self._failed.add(path)
+            return
+
+        decoder = QAudioDecoder(self)
+        decoder.setAudioFormat(self.audio_format)
+        decoder.setSource(QUrl.fromLocalFile(os.path.abspath(path)))
+        decoding = _Decoding(decoder, stat)
+        self._decoders[path] = decoding
+        decoder.bufferReady.connect(lambda: self._on_buffer_ready(path, decoding))
+        decoder.finished.connect(lambda: self._on_finished(path, decoding))
+        decoder.error.connect(lambda error: self._on_error(path, decoding))
+        decoder.start()
+
+    def preload(self, paths):
+        """Decode every file in paths (files that failed before are retried)"""
+        for path in paths:
+            self.load(path, retry=True)
+
+    def forget(self, path):
+        """Drop a decoded sound (the file changed)"""
+        self._sounds.pop(path, None)
+        self._analyzing.pop(path, None)
+        self._failed.discard(path)
+
+    @staticmethod
+    def _stat(path):
+        return file_stat(path)
+
+    def _watch(self, path):
+        full = os.path.abspath(path)
+        if full in self._paths_by_file:
+            return
+        self._paths_by_file[full] = path
+        folder = os.path.dirname(full)
+        if folder not in self._paths_by_dir:
+            self._paths_by_dir[folder] = set()
+            if os.path.isdir(folder):
+                self._watcher.addPath(folder)
+        self._paths_by_dir[folder].add(path)
+        if os.path.isfile(full):
+            self._watcher.addPath(full)
+
+    def _on_file_changed(self, full):
+        path = self._paths_by_file.get(full)
+        if path is not None:
+            self._schedule_reload(path)
+
+    def _on_directory_changed(self, folder):
+        # Files created, deleted or replaced by rename (the file watch is lost then)
+        for path in self._paths_by_dir.get(folder, ()):
+            if self._stat(path) != self._stats.get(path):
+                self._schedule_reload(path)
+
+    def _schedule_reload(self, path):
+        self._reload_pending.add(path)
+        self._reload_timer.start(config.SOUND_RELOAD_DELAY_MS)
+
+    def _reload_pending_paths(self):
+        pending, self._reload_pending = self._reload_pending, set()
+        watched = set(self._watcher.files())
+        for path in pending:
+            full = os.path.abspath(path)
+            if full not in watched and os.path.isfile(full):
+                self._watcher.addPath(full)
+            if self._stat(path) == self._stats.get(path) and path in self._sounds:
+                continue  # Touched but unchanged
+            self._failed.discard(path)
+            self._decode(path)
+            print(f"[OK] Sound file changed, reloading: {path}")
+
+    def _on_buffer_ready(self, path, decoding):
+        if self._decoders.get(path) is not decoding:
+            return  # Superseded by a reload
+        buffer = decoding.decoder.read()
+        if not buffer.isValid():
+            return
+        if decoding.audio_format is None:
+            # The backend may ignore the requested format - keep what it delivers
+            decoding.audio_format = buffer.format()
+        decoding.chunks.append(buffer.constData().asstring(buffer.byteCount()))
+
+    def _on_finished(self, path, decoding):
+        if self._decoders.get(path) is not decoding:
+            return
+        del self._decoders[path]
+        decoding.decoder.deleteLater()
+        samples = None
+        if decoding.chunks:
+            samples = to_mixer_samples(b''.join(decoding.chunks), decoding.audio_format)
+        if samples is None or not len(samples):
+            self._sounds.pop(path, None)
+            self._failed.add(path)
+            print(f"[WARNING] Sound has no audio: {path}")
+            return
+        sound = DecodedSound(path, samples, decoding.stat)
+        gain = self.loudness.cached_gain(path, sound.stat)
+        if gain is not None:
+            sound.gain = gain
+            self._publish(path, sound)
+            return
+        # Not measured at this size/mtime - hand it out once the gain is known
+        self._analyzing[path] = sound
+        self.loudness.analyze(path, sound)
+
+    def _on_analyzed(self, path, sound, measured):
+        if self._analyzing.get(path) is not sound:
+            return  # Superseded by a reload
+        del self._analyzing[path]
+        if not measured and self._stat(path) != sound.stat:
+            # Changed since it was decoded - the samples are stale too
+            self._decode(path)
+            return
+        self._publish(path, sound)
+
+    def _publish(self, path, sound):
+        self._sounds[path] = sound
+        self.sound_loaded.emit(path)
+
+    def _on_error(self, path, decoding):
+        if self._decoders.get(path) is not decoding:
+            return
+        del self._decoders[path]
+        print(f"[WARNING] Sound not decoded: {path} ({decoding.decoder.errorString()})")
+        decoding.decoder.deleteLater()
+        self._sounds.pop(path, None)
+        self._failed.add(path)
@@ -0,0 +1,246 @@
+"""
+Sound Loudness
+Per-file loudness and peak, measured once and cached by file hash
+
+User-supplied sounds vary wildly in level. Each decoded sound is analyzed
+on a worker thread: gated RMS loudness over 400 ms blocks (the BS.1770
+gating scheme - absolute gate at -70 dB, relative gate 10 dB below - but
+without the K-weighting filter) and sample peak. The result is cached in
+config.SOUND_LOUDNESS_FILE under the SHA-1 of the file, so a file is only
+analyzed again when its content changes. The gain that brings a sound to
+SOUND_TARGET_LOUDNESS_DB (limited by the peak ceiling) is stored on the
+DecodedSound and applied by the mixer as the voice gain - free at trigger
+time.
+
+The hash is only trusted if the file's size and mtime still match the ones
+it was decoded at; the cache also maps each file's size and mtime to its
+hash, so an unchanged file gets its gain before it is first played.
+"""
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+import config
+import hashlib
+import json
+import numpy as np
+import os
+
+BLOCK_SECONDS = 0.4
+BLOCK_OVERLAP = 0.75
+ABSOLUTE_GATE_DB = -70.0
+RELATIVE_GATE_DB = -10.0
+SILENCE_DB = -120.0
+
+
+def _db(power):
+    return 10.0 * np.log10(max(power, 1e-12))
+
+
+def measure(samples, sample_rate=None):
+    """
+    Gated loudness and peak of a sound
+
+    Args:
+        samples: float32 (frames, channels) in [-1, 1]
+        sample_rate: Frames per second (default config.AUDIO_SAMPLE_RATE)
+
+    Returns:
+        tuple: (loudness_db, peak_db) - dB relative to full scale
+    """
+    sample_rate = sample_rate or config.AUDIO_SAMPLE_RATE
+    if not len(samples):
+        return SILENCE_DB, SILENCE_DB
+    peak = float(np.max(np.abs(samples)))
+
+    # Channel powers summed per frame, then mean power per overlapping block
+    power = np.sum(np.square(samples, dtype=np.float64), axis=1)
+    block = max(1, int(sample_rate * BLOCK_SECONDS))
+    if len(power) <= block:
+        block_powers = np.array([power.mean()])
+    else:
+        step = max(1, int(block * (1 - BLOCK_OVERLAP)))
+        cumulative = np.concatenate(([0.0], np.cumsum(power)))
+        starts = np.arange(0, len(power) - block + 1, step)
+        block_powers = (cumulative[starts + block] - cumulative[starts]) / block
+
+    gated = block_powers[block_powers > 10 ** (ABSOLUTE_GATE_DB / 10)]
+    if not len(gated):
+        return SILENCE_DB, _db(peak * peak)
+    relative_gate = gated.mean() * 10 ** (RELATIVE_GATE_DB / 10)
+    gated = gated[gated > relative_gate]
+    return _db(float(gated.mean())), _db(peak * peak)
+
+
+def normalization_gain(loudness_db, peak_db):
+    """
+    Linear gain bringing a sound to the target loudness
+
+    Args:
+        loudness_db: Measured loudness
+        peak_db: Measured sample peak
+
+    Returns:
+        float: Gain (never pushes the peak past SOUND_PEAK_CEILING_DB)
+    """
+    if loudness_db <= SILENCE_DB:
+        return 1.0
+    gain_db = config.SOUND_TARGET_LOUDNESS_DB - loudness_db
+    gain_db = min(gain_db, config.SOUND_PEAK_CEILING_DB - peak_db)
+    gain_db = max(config.SOUND_MIN_GAIN_DB, min(config.SOUND_MAX_GAIN_DB, gain_db))
+    return 10 ** (gain_db / 20)
+
+
+def file_stat(path):
+    """(size, mtime_ns) of a file, or None if it can't be read"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def file_digest(path):
+    """SHA-1 of a file's content"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _AnalyzeSignals(QObject):
+    done = pyqtSignal(str, object, str, object)  # path, sound, digest, (loudness_db, peak_db) or None
+
+
+class _AnalyzeJob(QRunnable):
+    """
+    Hash a file and measure its sound unless the hash is already cached (worker thread)
+
+    The file must still have the size and mtime it was decoded at, before
+    and after hashing - otherwise the hash may not describe the samples.
+    """
+
+    def __init__(self, path, sound, cache):
+        super().__init__()
+        self.path = path
+        self.sound = sound
+        self.cache = cache
+        self.signals = _AnalyzeSignals()
+
+    def run(self):
+        stat = self.sound.stat
+        try:
+            if stat is None or file_stat(self.path) != stat:
+                raise OSError("file changed since it was decoded")
+            digest = file_digest(self.path)
+            if file_stat(self.path) != stat:
+                raise OSError("file changed while it was hashed")
+        except OSError as e:
+            print(f"[WARNING] Sound not analyzed: {self.path} ({e})")
+            self.signals.done.emit(self.path, self.sound, '', None)
+            return
+        entry = self.cache.get(digest)
+        if entry is not None:
+            result = (entry['loudness_db'], entry['peak_db'])
+        else:
+            result = measure(self.sound.samples)
+        self.signals.done.emit(self.path, self.sound, digest, result)
+
+
+class LoudnessAnalyzer(QObject):
+    """
+    Measures decoded sounds in the background and sets their gain
+
+    The cache maps file SHA-1 -> {'loudness_db', 'peak_db'}, and each
+    analyzed file -> [size, mtime_ns, SHA-1]; new measurements are written
+    in one batch shortly after they arrive.
+    """
+
+    analyzed = pyqtSignal(str, object, bool)  # path, sound, gain measured (False: file changed/unreadable)
+
+    def __init__(self, path=None, parent=None):
+        super().__init__(parent)
+        self.path = path or config.SOUND_LOUDNESS_FILE
+        self._cache = {}
+        self._files = {}  # absolute path -> [size, mtime_ns, digest]
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)  # Background work, never competes with decoding
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self.save)
+        self.load()
+
+    def load(self):
+        """Load the cache file (missing or corrupt file: start empty)"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._cache = data.get('sounds', {})
+            self._files = data.get('files', {})
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"[WARNING] Sound loudness cache not loaded: {e}")
+
+    def save(self):
+        """Write the cache (atomically - temp file + rename)"""
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 2, 'sounds': self._cache, 'files': self._files}, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"[WARNING] Sound loudness cache not saved: {e}")
+
+    def flush(self):
+        """Write pending measurements now (on exit)"""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self.save()
+
+    def cached_gain(self, path, stat):
+        """
+        Gain of a file measured before, if it hasn't changed since
+
+        Args:
+            path: Sound file
+            stat: (size, mtime_ns) the file was decoded at
+
+        Returns:
+            float: Normalization gain, or None if the file must be analyzed
+        """
+        entry = self._files.get(os.path.abspath(path))
+        if entry is None or stat is None or tuple(entry[:2]) != tuple(stat):
+            return None
+        measured = self._cache.get(entry[2])
+        if measured is None:
+            return None
+        return normalization_gain(measured['loudness_db'], measured['peak_db'])
+
+    def analyze(self, path, sound):
+        """
+        Measure a freshly decoded sound, set sound.gain and emit analyzed when done
+
+        Args:
+            path: The sound's file
+            sound: DecodedSound (its samples are read on the worker thread)
+        """
+        job = _AnalyzeJob(path, sound, self._cache)
+        job.signals.done.connect(self._on_analyzed)
+        self._pool.start(job)
+
+    def _on_analyzed(self, path, sound, digest, result):
+        if result is None:
+            self.analyzed.emit(path, sound, False)
+            return
+        loudness_db, peak_db = result
+        if digest not in self._cache:
+            self._cache[digest] = {'loudness_db': round(loudness_db, 2), 'peak_db': round(peak_db, 2)}
+            self._save_timer.start(config.SOUND_LOUDNESS_SAVE_DELAY_MS)
+        measured = self._cache[digest]  # Same (rounded) values cached_gain() will read
+        entry = [sound.stat[0], sound.stat[1], digest]
+        full = os.path.abspath(path)
+        if self._files.get(full) != entry:
+            self._files[full] = entry
+            self._save_timer.start(config.SOUND_LOUDNESS_SAVE_DELAY_MS)
+        sound.gain = normalization_gain(measured['loudness_db'], measured['peak_db'])
+        self.analyzed.emit(path, sound, True)
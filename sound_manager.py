@@ -1,22 +1,31 @@
 """
 Sound Manager - Win Effects and Audio
 Handles sound playback for PK Battle events
-One player per event type - no overlap within same type
+All sounds are mixed into one output stream on the audio thread
 """
 
-from PyQt6.QtCore import QObject, QUrl
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+from PyQt6.QtCore import QObject
+from audio_thread import AudioThread
+from sound_bank import SoundBank
 import os
 
 
 class SoundManager(QObject):
     """
     Manages sound effects for PK Battle
-    One player per event type - plays to completion before accepting new trigger
-    Different event types can play simultaneously
+
+    Sounds are decoded once (SoundBank) and mixed on the audio thread
+    (AudioThread/Mixer): several sounds of the same type can overlap, the
+    voice count is capped and higher-priority sounds (final_win > gift >
+    like) win when it is reached. A trigger never opens or decodes a file.
     """
 
-    def __init__(self):
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: AudioBackend for the mix (default config.AUDIO_BACKEND -
+                'qt' plays it, 'null' only counts triggers, 'record' writes a WAV)
+        """
         super().__init__()
 
         # Sound enabled flag
@@ -25,9 +34,14 @@ class SoundManager(QObject):
         # Volume (0.0 to 1.0)
         self.volume = 0.8
 
-        # Single player per event type
-        self.players = {}
-        self.audio_outputs = {}
+        # Decoded sounds (path -> float32 frames)
+        self.bank = SoundBank(self)
+
+        # Mixer + single output (backend), on their own thread
+        self.audio = AudioThread(backend, self)
+        self.backend = self.audio.backend
+        self.audio.set_volume(self.volume)
+        self.audio.start()
 
         # Sound file paths
         self.sound_files = {
@@ -40,35 +54,8 @@ class SoundManager(QObject):
         # Create sounds directory if it doesn't exist
         os.makedirs('sounds', exist_ok=True)
 
-        # Initialize players for predefined sounds
-        self._init_players()
-
-    def _init_players(self):
-        """Initialize media players for predefined sounds"""
-        for sound_name in self.sound_files.keys():
-            player = QMediaPlayer()
-            audio_output = QAudioOutput()
-            audio_output.setVolume(self.volume)
-            player.setAudioOutput(audio_output)
-
-            self.players[sound_name] = player
-            self.audio_outputs[sound_name] = audio_output
-
-    def _create_player_for_event(self, event_type):
-        """
-        Create player for event type if doesn't exist
-
-        Args:
-            event_type: Event type (like, comment, gift, etc.)
-        """
-        if event_type not in self.players:
-            player = QMediaPlayer()
-            audio_output = QAudioOutput()
-            audio_output.setVolume(self.volume)
-            player.setAudioOutput(audio_output)
-
-            self.players[event_type] = player
-            self.audio_outputs[event_type] = audio_output
+        # Decode predefined sounds up front
+        self.bank.preload(self.sound_files.values())
 
     def set_win_sound_file(self, team, filepath):
         """
@@ -81,10 +68,36 @@ class SoundManager(QObject):
         sound_name = f'team_{team.lower()}_win'
         if os.path.exists(filepath):
             self.sound_files[sound_name] = filepath
+            self.bank.load(filepath, retry=True)
             print(f"[OK] Win sound for Team {team} set to: {os.path.basename(filepath)}")
         else:
             print(f"[WARNING] Sound file not found: {filepath}")
 
+    def preload_event_sounds(self, settings):
+        """
+        Decode the files of all enabled event sounds (call when sound settings change)
+
+        Args:
+            settings: {event_type: {'enabled': bool, 'file': str}}
+        """
+        self.bank.preload(setting['file'] for setting in settings.values()
+                          if setting.get('enabled') and setting.get('file'))
+
+    def set_schedule_policies(self, settings):
+        """
+        Apply the per-event scheduling policies from the sound settings
+
+        Args:
+            settings: {event_type: {'policy', 'max_queue', 'interval_ms', ...}}
+        """
+        for event_type, setting in settings.items():
+            if 'policy' not in setting:
+                continue
+            # The settings call the warning 'round_end'
+            category = 'round_end_warning' if event_type == 'round_end' else event_type
+            self.audio.set_policy(category, setting['policy'],
+                                  setting.get('max_queue', 1), setting.get('interval_ms', 0))
+
     def play_team_win(self, team):
         """
         Play win sound for a team
@@ -115,37 +128,23 @@ class SoundManager(QObject):
     def play_event_sound(self, event_type, sound_file):
         """
         Play sound for a specific event
-        ONLY plays if no sound is currently playing for this event type
+        Mixed with other event types; the event type's scheduling policy
+        decides what happens while the same type is playing
 
         Args:
             event_type: Event type (like, comment, gift, etc.)
             sound_file: Path to sound file
         """
-        if not self.sound_enabled:
-            return
-
-        if not sound_file or not os.path.exists(sound_file):
+        if not self.sound_enabled or not sound_file:
             return
 
-        # Check file size
-        if os.path.getsize(sound_file) < 100:  # Less than 100 bytes = invalid
+        sound = self.bank.get(sound_file)
+        if sound is None:
+            # Not decoded yet - start now, later triggers will play it
+            self.bank.load(sound_file)
             return
 
-        # Create player if doesn't exist
-        self._create_player_for_event(event_type)
-
-        player = self.players[event_type]
-
-        # CRITICAL: Skip if already playing
-        # Sound must finish before accepting new trigger
-        if player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
-            # Skip this sound - wait for current sound to finish
-            return
-
-        # Player is idle - safe to play new sound
-        url = QUrl.fromLocalFile(os.path.abspath(sound_file))
-        player.setSource(url)
-        player.play()
+        self.audio.play(sound, event_type)
 
     def _play_sound(self, sound_name):
         """
@@ -155,29 +154,21 @@ class SoundManager(QObject):
             sound_name: Key in sound_files dict
         """
         filepath = self.sound_files.get(sound_name)
-        if not filepath or not os.path.exists(filepath):
-            # Sound file doesn't exist - skip silently
+        sound = self.bank.get(filepath)
+        if sound is None:
+            # Missing, placeholder or still decoding - skip silently
             return
 
-        # Check if file is empty (placeholder file)
-        if os.path.getsize(filepath) < 100:  # Less than 100 bytes = invalid MP3
-            # Empty placeholder, skip silently
-            return
+        self.audio.play(sound, sound_name)
 
-        if sound_name not in self.players:
-            return
-
-        player = self.players[sound_name]
-
-        # CRITICAL: Skip if already playing
-        # Sound must finish before accepting new trigger
-        if player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
-            return
+    def latency_summary(self):
+        """
+        Trigger-to-audio latency of recent plays
 
-        # Player is idle - safe to play
-        url = QUrl.fromLocalFile(os.path.abspath(filepath))
-        player.setSource(url)
-        player.play()
+        Returns:
+            dict: {'count', 'mean_ms', 'p95_ms', 'max_ms'}
+        """
+        return self.audio.latency.summary()
 
     def set_volume(self, volume):
         """
@@ -187,9 +178,7 @@ class SoundManager(QObject):
             volume: Float 0.0 to 1.0
         """
         self.volume = max(0.0, min(1.0, volume))
-
-        for audio_output in self.audio_outputs.values():
-            audio_output.setVolume(self.volume)
+        self.audio.set_volume(self.volume)
 
     def set_enabled(self, enabled):
         """
@@ -202,9 +191,12 @@ class SoundManager(QObject):
 
     def stop_all(self):
         """Stop all playing sounds"""
-        for player in self.players.values():
-            if player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
-                player.stop()
+        self.audio.stop_sounds()
+
+    def shutdown(self):
+        """Stop the audio thread and write pending loudness measurements (on exit)"""
+        self.audio.shutdown()
+        self.bank.loudness.flush()
 
     def create_placeholder_sounds(self):
         """
@@ -237,8 +229,4 @@ class SoundManager(QObject):
         Returns:
             bool: True if playing, False otherwise
         """
-        if event_type not in self.players:
-            return False
-
-        player = self.players[event_type]
-        return player.playbackState() == QMediaPlayer.PlaybackState.PlayingState
+        return self.audio.playing(event_type) > 0
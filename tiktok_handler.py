@@ -8,12 +8,17 @@ from TikTokLive import TikTokLiveClient
 from TikTokLive.events import (ConnectEvent, DisconnectEvent, CommentEvent,
                                GiftEvent, JoinEvent, ShareEvent,
                                FollowEvent, LikeEvent)
+import app_logging
 import config
-import traceback
 import asyncio
 import httpx
 
 
+connection_log = app_logging.get_logger('connection')
+event_log = app_logging.get_logger('event')
+avatar_log = app_logging.get_logger('avatar')
+
+
 def get_avatar_url(user):
     """
     Get avatar URL from user object with multiple fallbacks
@@ -45,40 +50,74 @@ def get_avatar_url(user):
                         if hasattr(field_value, sub_field):
                             url = getattr(field_value, sub_field)
                             if url and isinstance(url, str) and url.startswith('http'):
-                                print(f"[DEBUG] Found avatar URL for {user.unique_id}: {url}")
+                                avatar_log.debug("Found avatar URL for %s: %s", user.unique_id, url)
                                 return url
                             # For lists (like url_list or m_urls)
                             elif isinstance(url, (list, tuple)) and len(url) > 0:
                                 final_url = url[0]
-                                print(f"[DEBUG] Found avatar URL (from list) for {user.unique_id}: {final_url}")
+                                avatar_log.debug("Found avatar URL (from list) for %s: %s", user.unique_id, final_url)
                                 return final_url
                         # For 'urls' which might be an array
                         elif sub_field == 'urls' and isinstance(field_value, (list, tuple)) and len(field_value) > 0:
                             url = field_value[0]
-                            print(f"[DEBUG] Found avatar URL (from list) for {user.unique_id}: {url}")
+                            avatar_log.debug("Found avatar URL (from list) for %s: %s", user.unique_id, url)
                             return url
                     # No sub-field, direct URL string
                     elif isinstance(field_value, str) and field_value.startswith('http'):
-                        print(f"[DEBUG] Found avatar URL (direct) for {user.unique_id}: {field_value}")
+                        avatar_log.debug("Found avatar URL (direct) for %s: %s", user.unique_id, field_value)
                         return field_value
         except Exception:
             continue
             
-    print(f"[DEBUG] No avatar URL found for user {user.unique_id}")
+    avatar_log.debug("No avatar URL found for user %s", user.unique_id)
     return None
 
 
+def get_gift_details(gift):
+    """
+    Get a gift's diamond value and image URL
+    Field names differ between TikTokLive versions - tries the known ones
+
+    Returns:
+        tuple: (diamond_count, image_url) - 0 / '' when not present
+    """
+    diamonds = 0
+    for holder in (gift, getattr(gift, 'info', None)):
+        value = getattr(holder, 'diamond_count', None) if holder is not None else None
+        if isinstance(value, int) and value > 0:
+            diamonds = value
+            break
+
+    image_url = ''
+    for holder in (gift, getattr(gift, 'info', None)):
+        image = getattr(holder, 'image', None) if holder is not None else None
+        if image is None:
+            continue
+        for field_name in ('m_urls', 'url_list', 'urls'):
+            urls = getattr(image, field_name, None)
+            if isinstance(urls, (list, tuple)) and urls and isinstance(urls[0], str):
+                image_url = urls[0]
+                break
+        if image_url:
+            break
+
+    return diamonds, image_url
+
+
 class TikTokHandler(QObject):
     """
     Handles TikTok Live connection and events
     Emits signals for UI updates
+
+    Log output goes through app_logging; log_message only receives WARN-and-above
+    records plus sampled lower-level ones (see config.LOG_UI_SAMPLE_INTERVALS)
     """
 
     # Signals
     event_received = pyqtSignal(dict)  # Event data
     connection_status = pyqtSignal(str)  # Status message
     error_occurred = pyqtSignal(str)  # Error message
-    log_message = pyqtSignal(str)  # Log message
+    log_message = pyqtSignal(str)  # Forwarded log line (WARN+ or sampled)
 
     def __init__(self):
         super().__init__()
@@ -90,6 +129,10 @@ class TikTokHandler(QObject):
         self.http_client = None
         self.should_reconnect = True  # Flag to control reconnection
 
+        # Forward selected log records to the UI (emitted from the writer thread)
+        app_logging.start_logging()
+        app_logging.add_ui_sink(self.log_message.emit)
+
     def connect_to_live(self, username):
         """Connect to TikTok live stream with auto-retry and reconnect"""
         self.username = username
@@ -99,18 +142,18 @@ class TikTokHandler(QObject):
         # Cleanup old connection if exists
         if self.client:
             try:
-                self.log_message.emit("[CLEANUP] Closing old connection...")
+                connection_log.info("[CLEANUP] Closing old connection...")
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
                 loop.run_until_complete(self._async_cleanup())
                 loop.close()
             except Exception as e:
-                self.log_message.emit(f"[CLEANUP] Old connection cleanup: {str(e)}")
+                connection_log.info("[CLEANUP] Old connection cleanup: %s", e)
             self.client = None
 
         # Create or reuse httpx client with longer timeout
         if not self.http_client:
-            self.log_message.emit("[INIT] Creating HTTP client with extended timeout...")
+            connection_log.info("[INIT] Creating HTTP client with extended timeout...")
             self.http_client = httpx.AsyncClient(
                 timeout=httpx.Timeout(90.0, connect=45.0),  # 90s read, 45s connect
                 follow_redirects=True,
@@ -127,7 +170,7 @@ class TikTokHandler(QObject):
                 attempt += 1
 
                 # Create client with custom settings
-                self.log_message.emit("[INIT] Creating TikTok Live client...")
+                connection_log.info("[INIT] Creating TikTok Live client...")
                 self.client = TikTokLiveClient(
                     unique_id=clean_username,
                     web_proxy=None,
@@ -142,35 +185,35 @@ class TikTokHandler(QObject):
 
                 # Start connection
                 if attempt == 1:
-                    self.log_message.emit(f"Connecting to @{username}...")
-                    self.log_message.emit("[WAIT] This may take 30-90 seconds...")
-                    self.log_message.emit(f"[CONNECTING] Attempting to connect to @{clean_username}'s live stream...")
+                    connection_log.info("Connecting to @%s...", username)
+                    connection_log.info("[WAIT] This may take 30-90 seconds...")
+                    connection_log.info("[CONNECTING] Attempting to connect to @%s's live stream...", clean_username)
                 else:
-                    self.log_message.emit(f"[RECONNECT] Attempt {attempt}...")
+                    connection_log.info("[RECONNECT] Attempt %d...", attempt)
 
                 # Run the client (blocks until disconnected)
                 self.client.run()
 
                 # If we get here, connection ended (disconnected)
-                self.log_message.emit("[INFO] Connection ended")
+                connection_log.info("[INFO] Connection ended")
 
                 # Check if we should reconnect
                 if not self.should_reconnect:
-                    self.log_message.emit("[INFO] Auto-reconnect disabled, stopping")
+                    connection_log.info("[INFO] Auto-reconnect disabled, stopping")
                     break
 
                 # Check reconnect attempts limit
                 if self.reconnect_attempts >= config.MAX_RECONNECT_ATTEMPTS:
-                    self.log_message.emit(f"[ERROR] Max reconnection attempts ({config.MAX_RECONNECT_ATTEMPTS}) reached")
+                    connection_log.error("[ERROR] Max reconnection attempts (%d) reached", config.MAX_RECONNECT_ATTEMPTS)
                     self.connection_status.emit("Connection Failed - Max Retries")
                     break
 
                 # Wait before reconnecting with exponential backoff
                 self.reconnect_attempts += 1
                 wait_seconds = min(5 * self.reconnect_attempts, 30)
-                self.log_message.emit(
-                    f"[RECONNECT] Attempt {self.reconnect_attempts}/"
-                    f"{config.MAX_RECONNECT_ATTEMPTS} in {wait_seconds}s..."
+                connection_log.warning(
+                    "[RECONNECT] Attempt %d/%d in %ds...",
+                    self.reconnect_attempts, config.MAX_RECONNECT_ATTEMPTS, wait_seconds
                 )
                 self.connection_status.emit(f"Reconnecting ({self.reconnect_attempts}/{config.MAX_RECONNECT_ATTEMPTS})...")
 
@@ -180,20 +223,20 @@ class TikTokHandler(QObject):
             except (TimeoutError, httpx.ReadTimeout, httpx.ConnectTimeout) as e:
                 error_msg = f"[WARNING] Connection timeout (attempt {attempt}): User '@{username}' might not be live or internet is slow"
                 self.error_occurred.emit(error_msg)
-                self.log_message.emit(error_msg)
+                connection_log.warning(error_msg)
 
                 # Retry initial connection failures
                 if attempt < max_initial_retries:
                     wait_seconds = 5 * attempt
-                    self.log_message.emit(f"[RETRY] Retrying in {wait_seconds}s... ({attempt}/{max_initial_retries})")
+                    connection_log.info("[RETRY] Retrying in %ds... (%d/%d)", wait_seconds, attempt, max_initial_retries)
                     import time
                     time.sleep(wait_seconds)
                     continue
                 else:
-                    self.log_message.emit("[TIP] Troubleshooting:")
-                    self.log_message.emit("   1. Make sure the user is LIVE right now")
-                    self.log_message.emit("   2. Check your internet connection")
-                    self.log_message.emit("   3. Try again later")
+                    connection_log.warning("[TIP] Troubleshooting:")
+                    connection_log.warning("   1. Make sure the user is LIVE right now")
+                    connection_log.warning("   2. Check your internet connection")
+                    connection_log.warning("   3. Try again later")
                     self.connection_status.emit("Timeout - User Not Live?")
                     break
 
@@ -201,24 +244,23 @@ class TikTokHandler(QObject):
                 # Handle UserOfflineError specifically if possible (string check as fallback)
                 error_str = str(e)
                 if "UserOfflineError" in error_str or "offline" in error_str.lower():
-                     self.log_message.emit(f"[WARNING] User @{username} appears offline.")
+                     connection_log.warning("[WARNING] User @%s appears offline.", username)
                      
                      # If user wants "always reconnect", we should keep trying
                      if attempt < max_initial_retries:
                         wait_seconds = 5 * attempt
-                        self.log_message.emit(f"[RETRY] User offline. Retrying in {wait_seconds}s... ({attempt}/{max_initial_retries})")
+                        connection_log.info("[RETRY] User offline. Retrying in %ds... (%d/%d)", wait_seconds, attempt, max_initial_retries)
                         import time
                         time.sleep(wait_seconds)
                         continue
                 
-                self.log_message.emit(f"❌ ERROR: {error_str}")
-                self.log_message.emit(f"[ERROR] Connection error: {error_str}")
+                connection_log.error("[ERROR] Connection error: %s", error_str)
                 self.error_occurred.emit(str(e))
                 
                 # For other errors, also retry a few times
                 if attempt < max_initial_retries:
                     wait_seconds = 5 * attempt
-                    self.log_message.emit(f"[RETRY] Error occurred. Retrying in {wait_seconds}s... ({attempt}/{max_initial_retries})")
+                    connection_log.info("[RETRY] Error occurred. Retrying in %ds... (%d/%d)", wait_seconds, attempt, max_initial_retries)
                     import time
                     time.sleep(wait_seconds)
                     continue
@@ -239,14 +281,13 @@ class TikTokHandler(QObject):
                     error_msg = f"[ERROR] Connection error: {error_str}"
 
                 self.error_occurred.emit(error_msg)
-                self.log_message.emit(error_msg)
+                connection_log.exception(error_msg)
                 self.connection_status.emit("Connection Failed")
-                traceback.print_exc()
 
                 # Retry initial connection failures
                 if attempt < max_initial_retries and "not live" not in error_str.lower():
                     wait_seconds = 5 * attempt
-                    self.log_message.emit(f"[RETRY] Retrying in {wait_seconds}s... ({attempt}/{max_initial_retries})")
+                    connection_log.info("[RETRY] Retrying in %ds... (%d/%d)", wait_seconds, attempt, max_initial_retries)
                     import time
                     time.sleep(wait_seconds)
                     continue
@@ -269,7 +310,7 @@ class TikTokHandler(QObject):
             self.reconnect_attempts = 0
 
             if self.client:
-                self.log_message.emit("Stopping connection...")
+                connection_log.info("Stopping connection...")
 
                 # Stop the client properly with async handling
                 try:
@@ -278,12 +319,12 @@ class TikTokHandler(QObject):
                     loop.run_until_complete(self._async_cleanup())
                     loop.close()
                 except Exception as e:
-                    self.log_message.emit(f"[CLEANUP] Disconnect: {str(e)}")
+                    connection_log.info("[CLEANUP] Disconnect: %s", e)
 
                 self.client = None
                 self.is_connected = False
                 self.connection_status.emit("Disconnected")
-                self.log_message.emit("[OK] Disconnected successfully")
+                connection_log.info("[OK] Disconnected successfully")
 
             # Cleanup HTTP client on manual disconnect
             if self.http_client:
@@ -293,14 +334,14 @@ class TikTokHandler(QObject):
                     loop.run_until_complete(self.http_client.aclose())
                     loop.close()
                     self.http_client = None
-                    self.log_message.emit("[CLEANUP] HTTP client closed")
+                    connection_log.info("[CLEANUP] HTTP client closed")
                 except Exception as e:
-                    self.log_message.emit(f"[CLEANUP] HTTP client: {str(e)}")
+                    connection_log.info("[CLEANUP] HTTP client: %s", e)
 
         except Exception as e:
             error_msg = f"Disconnect error: {str(e)}"
             self.error_occurred.emit(error_msg)
-            self.log_message.emit(error_msg)
+            connection_log.error(error_msg)
 
     def _register_events(self):
         """Register TikTok event handlers"""
@@ -312,14 +353,14 @@ class TikTokHandler(QObject):
             self.reconnect_attempts = 0
             status_msg = f"Connected to @{self.username}'s live!"
             self.connection_status.emit(status_msg)
-            self.log_message.emit(status_msg)
+            connection_log.info(status_msg)
 
         @self.client.on(DisconnectEvent)
         async def on_disconnect(event: DisconnectEvent):
             """Handle disconnection - reconnection is handled by outer loop"""
             self.is_connected = False
             self.connection_status.emit("Disconnected")
-            self.log_message.emit("[DISCONNECT] Connection lost")
+            connection_log.warning("[DISCONNECT] Connection lost")
             # Note: Reconnection logic is now in connect_to_live() main loop
 
         @self.client.on(JoinEvent)
@@ -336,10 +377,10 @@ class TikTokHandler(QObject):
                 }
 
                 self.event_received.emit(event_data)
-                self.log_message.emit(f"👋 {event_data['username']} joined")
+                event_log.info("👋 %s joined", event_data['username'])
 
             except Exception as e:
-                self.log_message.emit(f"Error processing join event: {str(e)}")
+                event_log.warning("Error processing join event: %s", e)
 
         @self.client.on(CommentEvent)
         async def on_comment(event: CommentEvent):
@@ -356,10 +397,10 @@ class TikTokHandler(QObject):
                 }
 
                 self.event_received.emit(event_data)
-                self.log_message.emit(f"💬 {event_data['username']}: {event.comment}")
+                event_log.info("💬 %s: %s", event_data['username'], event.comment)
 
             except Exception as e:
-                self.log_message.emit(f"Error processing comment event: {str(e)}")
+                event_log.warning("Error processing comment event: %s", e)
 
         @self.client.on(GiftEvent)
         async def on_gift(event: GiftEvent):
@@ -367,6 +408,13 @@ class TikTokHandler(QObject):
             try:
                 user = event.user
                 gift = event.gift
+                diamonds, image_url = get_gift_details(gift)
+
+                # Combo gifts repeat the event with a growing repeat_count
+                # until the streak ends; other gifts are complete at once
+                streaking = getattr(event, 'streaking', None)
+                if streaking is None:
+                    streaking = bool(getattr(gift, 'streakable', False)) and not getattr(event, 'repeat_end', True)
 
                 event_data = {
                     'type': 'gift',
@@ -375,18 +423,21 @@ class TikTokHandler(QObject):
                     'avatar_url': get_avatar_url(user) or '',
                     'gift_name': gift.name if hasattr(gift, 'name') else 'Gift',
                     'gift_id': gift.id if hasattr(gift, 'id') else 0,
+                    'diamond_count': diamonds,
+                    'gift_image_url': image_url,
+                    'streak_end': not streaking,
                     'gift_count': event.repeat_count if hasattr(event, 'repeat_count') else 1,
                     'timestamp': event.timestamp if hasattr(event, 'timestamp') else None
                 }
 
                 self.event_received.emit(event_data)
-                self.log_message.emit(
-                    f"🎁 {event_data['username']} sent {event_data['gift_name']} "
-                    f"x{event_data['gift_count']}"
+                event_log.info(
+                    "🎁 %s sent %s x%s",
+                    event_data['username'], event_data['gift_name'], event_data['gift_count']
                 )
 
             except Exception as e:
-                self.log_message.emit(f"Error processing gift event: {str(e)}")
+                event_log.warning("Error processing gift event: %s", e)
 
         @self.client.on(ShareEvent)
         async def on_share(event: ShareEvent):
@@ -402,10 +453,10 @@ class TikTokHandler(QObject):
                 }
 
                 self.event_received.emit(event_data)
-                self.log_message.emit(f"🔗 {event_data['username']} shared the live")
+                event_log.info("🔗 %s shared the live", event_data['username'])
 
             except Exception as e:
-                self.log_message.emit(f"Error processing share event: {str(e)}")
+                event_log.warning("Error processing share event: %s", e)
 
         @self.client.on(FollowEvent)
         async def on_follow(event: FollowEvent):
@@ -421,10 +472,10 @@ class TikTokHandler(QObject):
                 }
 
                 self.event_received.emit(event_data)
-                self.log_message.emit(f"❤️ {event_data['username']} followed")
+                event_log.info("❤️ %s followed", event_data['username'])
 
             except Exception as e:
-                self.log_message.emit(f"Error processing follow event: {str(e)}")
+                event_log.warning("Error processing follow event: %s", e)
 
         @self.client.on(LikeEvent)
         async def on_like(event: LikeEvent):
@@ -444,12 +495,11 @@ class TikTokHandler(QObject):
 
                 # Emit ALL likes - user wants every like to count for points
                 self.event_received.emit(event_data)
-                # Log only every 5 likes to avoid log spam
-                if like_count % 5 == 0:
-                    self.log_message.emit(f"[LIKE] {event_data['username']} sent {like_count} likes")
+                # Likes are DEBUG - skipped before any formatting at the default level
+                event_log.debug("[LIKE] %s sent %d likes", event_data['username'], like_count)
 
             except Exception as e:
-                self.log_message.emit(f"Error processing like event: {str(e)}")
+                event_log.warning("Error processing like event: %s", e)
 
 
 class TikTokThread(QThread):
@@ -468,4 +518,4 @@ class TikTokThread(QThread):
             self.handler.connect_to_live(self.username)
         except Exception as e:
             self.handler.error_occurred.emit(f"Thread error: {str(e)}")
-            traceback.print_exc()
+            connection_log.exception("Thread error: %s", e)